@@ -1,19 +1,127 @@
-from datetime import datetime
-from collections import defaultdict
-
-# A list to store employee data, each employee stored as a dictionary
-employees = []
+import math
+import sys
+from itertools import islice
+
+from employee_analytics import DepartmentAggregates, department_summary, salary_histogram, top_k
+from employee_batch import batch_main
+from employee_categories import Categories
+from employee_columns import ColumnIndex
+from employee_dates import format_date, parse_date
+from employee_ids import NUMBERS, IdIndex
+from employee_metrics import instrument, metrics, metrics_command, metrics_menu
+from employee_query import Query
+from employee_reports import ReportCache, format_for, render, save, show
+from employee_search import TrigramIndex, split_term
+from employee_store import EmployeeStore
+
+# Every department name is stored once; records hold its small integer
+# code, and renaming a department changes only this table
+department_names = Categories()
+
+# A compact employee record: __slots__ instead of a five-key dictionary per employee
+class EmployeeRecord:
+    __slots__ = ("emp_id", "name", "joining_ordinal", "salary", "department_code")
+    FIELDS = ("emp_id", "name", "joining_date", "salary", "department")
+
+    def __init__(self, emp_id, name, joining_date, salary, department):
+        self.emp_id = emp_id
+        self.name = name
+        self.joining_date = joining_date
+        self.salary = salary
+        self.department = department
+
+    # Grouping, filtering and sorting on department use the code
+    @property
+    def department(self):
+        return department_names.names[self.department_code]
+
+    @department.setter
+    def department(self, value):
+        self.department_code = department_names.code(value)
+
+    @property
+    def department_rank(self):
+        return department_names.rank(self.department_code)
+
+    # The joining date is parsed once into a day ordinal; sorting and
+    # comparing use the ordinal, the dd/mm/yyyy text is only for display
+    @property
+    def joining_date(self):
+        return format_date(self.joining_ordinal)
+
+    @joining_date.setter
+    def joining_date(self, value):
+        self.joining_ordinal = parse_date(value)
+
+    # Keep the emp['field'] style used by the functions below
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        setattr(self, key, value)
+
+    def __repr__(self):
+        return repr({field: getattr(self, field) for field in self.FIELDS})
+
+# An indexed store of employee data, each employee stored as an EmployeeRecord
+employees = EmployeeStore(sorted_fields=("name", "salary", "joining_ordinal", "department_code"))
+# emp_ids are numbers kept as text: sort them as numbers, so 10 comes after 9
+employees.add_sorted_index("emp_id", key=int)
+
+# Salary, joining date and department code columns mirrored from the store for the reports
+columns = employees.add_index(ColumnIndex(prefix="", width=1, date_field="joining_ordinal",
+                                          department_field="department_code", categories=department_names))
+
+# Per-department count, salary total and extremes, updated on every change
+departments = employees.add_index(DepartmentAggregates(date_field="joining_ordinal", department_field="department_code",
+                                                       categories=department_names))
+
+# Trigram index over names and emp_ids for substring and fuzzy search
+search_index = employees.add_index(TrigramIndex())
+
+# Hands out emp_ids above every one the store has held, in O(1); a
+# deleted employee's number is never given to a new one
+emp_ids = employees.add_index(IdIndex(NUMBERS))
+
+def next_emp_id():
+    return emp_ids.next_emp_id()
+
+# float() also takes "nan" and "inf", which cannot be ordered and would
+# break the sorted salary index
+def parse_salary(value):
+    salary = float(value)
+    if not math.isfinite(salary):
+        raise ValueError(f"Salary must be a finite number, got {value!r}")
+    return salary
+
+# Listings are rendered once per version of the data and written a page at
+# a time (see employee_reports); a department rename is a change too
+reports = ReportCache(lambda: (employees.generation, department_names.version))
+
+REPORT_FIELDS = ("emp_id", "name", "joining_date", "department", "salary")
+LIST_LINE = "{}, {}, {}, {}, {}"
+TABLE_LINE = "{:<10} {:<15} {:<15} {:<12} {:>10.2f}"
+TABLE_HEADER = ["", "="*70, "{:<10} {:<15} {:<15} {:<12} {:>10}".format(
+    "Emp ID", "Name", "Joining Date", "Department", "Salary"), "-"*70]
+
+# The lines of the employee list ("list") or report ("table"), as text,
+# csv or json; cached until the next change
+def employee_lines(layout="list", format="text"):
+    def build():
+        metrics.add_rows(len(employees))
+        rows = ((emp.emp_id, emp.name, emp.joining_date, emp.department, emp.salary) for emp in employees)
+        if format != "text":
+            return render(rows, REPORT_FIELDS, format)
+        if layout == "list":
+            return render(rows, REPORT_FIELDS, line=LIST_LINE, header=["", "--- Employee List ---"])
+        return render(rows, REPORT_FIELDS, line=TABLE_LINE, header=TABLE_HEADER, footer=["="*70])
+    return reports.get((layout if format == "text" else None, format), build)
 
 # Function to add a new employee
+@instrument("add_employee")
 def add_employee(): 
 
-    # Automatically generate emp_id based on the largest number currently existing
-    if employees:
-        max_id = max(int(emp['emp_id']) for emp in employees)
-        emp_id = str(max_id +1 )
-    else :
-        emp_id = '1'
-
+    emp_id = next_emp_id()
     print(f"The employee number is : {emp_id}")      
 
     name = input("Enter the employee's name :")   
@@ -22,7 +130,7 @@ def add_employee():
     while True:
         joining_date = input("Enter the joining date (dd/mm/yyyy): ")
         try:
-            date_obj = datetime.strptime(joining_date, "%d/%m/%Y")
+            parse_date(joining_date)
             break
         except ValueError:
             print("Date format is incorrect. Please enter date as dd/mm/yyyy.")   
@@ -30,116 +138,183 @@ def add_employee():
     # Enter the salary and verify the number
     while True:
         try:
-            salary = float(input("Enter the salary: "))
+            salary = parse_salary(input("Enter the salary: "))
             break
         except ValueError:
             print("Please enter a valid number for salary.")
 
     department = input("Enter the department name :").strip()
 
-    # Create an employee dictionary and add it to the list
-    employee = {
-        "emp_id" : emp_id,
-        "name" : name,
-        "joining_date" : joining_date,
-        "salary" : salary,
-        "department" : department
-    }
-    employees.append(employee)
+    # Create an employee record and add it to the store
+    employee = EmployeeRecord(emp_id, name, joining_date, salary, department)
+    employees.add(employee)
+    metrics.add_rows(1)
     print("The employee was added successfully!")
     print(f"{employee['emp_id']}, {employee['name']}, {employee['joining_date']}, {employee['department']}, {employee['salary']}")
 
 # Function to display all employees in the list
+@instrument("show_employees")
 def show_employees():
-    print("\n--- Employee List ---")
-    for emp in employees:
-        print(f"{emp['emp_id']}, {emp['name']}, {emp['joining_date']}, {emp['department']}, {emp['salary']}")
+    show(employee_lines("list"))
 
 # Function to display data of a specific employee based on their ID number (emp_id)
+@instrument("show_employee_by_id")
 def  show_employee_by_id():
     emp_id = input("Enter the employee ID number")
-    for emp in employees:
-        if emp['emp_id'] == emp_id :
-            print(f"{emp['emp_id']}, {emp['name']}, {emp['joining_date']}, {emp['department']}, {emp['salary']}")
-            return
+    emp = employees.find(emp_id)
+    if emp:
+        metrics.add_rows(1)
+        print(f"{emp['emp_id']}, {emp['name']}, {emp['joining_date']}, {emp['department']}, {emp['salary']}")
+        return
     print("The employee was not found !") 
 
 # Function to modify a specific employee's data based on emp_id
+@instrument("modify_employee")
 def modify_employee():
     emp_id = input("Enter the employee ID number to modify it:")
-    for emp in employees:
-        if emp['emp_id'] == emp_id :
-            name = input("Enter the new name :")   
-            while True:
-                joining_date = input("Enter the new joining date (dd/mm/yyyy): ")
-                try:
-                    date_obj = datetime.strptime(joining_date, "%d/%m/%Y")
-                    break
-                except ValueError:
-                   print("Date format is incorrect. Please enter date as dd/mm/yyyy.")  
-     
-
-            while True:
-                try:
-                  salary = float(input("Enter the new salary: "))
-                  break
-                except ValueError:
-                   print("Please enter a valid number for salary.")
-
-            department = input("Enter the new department name :").strip()
-
-            # Update employee data in the dictionary
-            emp['name'] = name
-            emp['joining_date'] = joining_date
-            emp['salary'] = salary
-            emp['department'] = department
-
-            print("Employee updated successfully:")
-            print(f"{emp['emp_id']}, {emp['name']}, {emp['joining_date']}, {emp['department']}, {emp['salary']}")
-            return
-    print("The employee was not found !")
+    emp = employees.find(emp_id)
+    if not emp:
+        print("The employee was not found !")
+        return
+
+    name = input("Enter the new name :")   
+    while True:
+        joining_date = input("Enter the new joining date (dd/mm/yyyy): ")
+        try:
+            parse_date(joining_date)
+            break
+        except ValueError:
+           print("Date format is incorrect. Please enter date as dd/mm/yyyy.")  
+
+    while True:
+        try:
+          salary = parse_salary(input("Enter the new salary: "))
+          break
+        except ValueError:
+           print("Please enter a valid number for salary.")
+
+    department = input("Enter the new department name :").strip()
+
+    # Update employee data in the store so its indexes stay in sync
+    employees.update(emp_id, {
+        "name" : name,
+        "joining_date" : joining_date,
+        "salary" : salary,
+        "department" : department
+    })
+
+    metrics.add_rows(1)
+    print("Employee updated successfully:")
+    print(f"{emp['emp_id']}, {emp['name']}, {emp['joining_date']}, {emp['department']}, {emp['salary']}")
 
 # دالة لحذف موظف معين بناءً على emp_id
+@instrument("delete_employee")
 def delete_employee():
     emp_id = input("Enter the employee ID number to delete it:")
-    for emp in employees:
-        if emp['emp_id'] == emp_id :
-            employees.remove(emp)
-            print("The employee has been deleted successfully.")
-            return
+    if employees.remove(emp_id):
+        metrics.add_rows(1)
+        print("The employee has been deleted successfully.")
+        return
     print("The employee was not found !")
 
-# A function to search for an employee based on emp_id or name (case-insensitive)
+# A function to search for employees by emp_id or name (case-insensitive, substring match;
+# a query ending in * matches the start of a word instead)
+@instrument("search_employee")
 def search_employee():
     query = input("Enter the employee ID number or name")
-    for emp in employees: 
-        if emp['emp_id'] == query or emp['name'].lower() == query.lower(): 
-            print(f"""
-                  Employee ID number : {emp['emp_id']},
-                  Employee name : {emp['name']},
-                  Employment History : {emp['joining_date']},
-                  department : {emp['department']},
-                  salary : {emp['salary']},
-                  """)
-            return
+    emp = employees.find(query)
+    matches = [emp] if emp else [employees.find(emp_id) for emp_id in sorted(search_index.search(query), key=int)]
+    metrics.add_rows(len(matches))
+    for emp in matches:
+        print(f"""
+              Employee ID number : {emp['emp_id']},
+              Employee name : {emp['name']},
+              Employment History : {emp['joining_date']},
+              department : {emp['department']},
+              salary : {emp['salary']},
+              """)
+    if matches:
+        return
+
     print("The employee was not found !")
+    suggestions = search_index.fuzzy(split_term(query)[0])
+    if suggestions:
+        print("Did you mean: " + ", ".join(f"{employees.find(emp_id)['name']} ({emp_id})" for emp_id, _ in suggestions))
+
+# Build a query from optional filters. Joining dates are dd/mm/yyyy text,
+# compared as day ordinals; the planner in employee_query picks the
+# narrowest sorted index to scan
+def employee_query(min_salary=None, max_salary=None, joined_from=None, joined_to=None,
+                   department=None, name=None, limit=None, offset=0):
+    query = Query()
+    if min_salary is not None or max_salary is not None:
+        query = query.between("salary", None if min_salary is None else float(min_salary),
+                              None if max_salary is None else float(max_salary))
+    if joined_from or joined_to:
+        query = query.between("joining_ordinal", parse_date(joined_from) if joined_from else None,
+                              parse_date(joined_to) if joined_to else None)
+    if department is not None:
+        # A department no employee has ever had matches nothing (no code is -1)
+        code = department_names.lookup(department.strip())
+        query = query.equals("department_code", -1 if code is None else code)
+    if name is not None:
+        query = query.equals("name", name.strip())
+    return query.offset(offset).limit(limit)
+
+# Ask for a filter value, leaving it out when the answer is empty
+def input_filter(prompt, convert):
+    while True:
+        answer = input(prompt).strip()
+        if not answer:
+            return None
+        try:
+            convert(answer)
+            return answer
+        except ValueError:
+            print("The input is invalid, leave it empty to skip this filter.")
+
+# Function to list the employees matching salary, date, department and name filters
+@instrument("filter_employees")
+def filter_employees():
+    query = employee_query(
+        min_salary=input_filter("Lowest salary (empty for any): ", float),
+        max_salary=input_filter("Highest salary (empty for any): ", float),
+        joined_from=input_filter("Joined on or after (dd/mm/yyyy, empty for any): ", parse_date),
+        joined_to=input_filter("Joined on or before (dd/mm/yyyy, empty for any): ", parse_date),
+        department=input_filter("Department (empty for any): ", str),
+        name=input_filter("Name (empty for any): ", str),
+        limit=input_filter("How many at most (empty for all): ", int))
+    count = 0
+    print("\n--- Matching Employees ---")
+    for emp in query.run(employees):
+        print(f"{emp['emp_id']}, {emp['name']}, {emp['joining_date']}, {emp['department']}, {emp['salary']}")
+        count += 1
+    metrics.add_rows(count)
+    if not count:
+        print("No employees match these filters.")
 
 # Employee Report in a Coordinated Format (Table)
+@instrument("employee_report")
 def employee_report():
-    print("\n" + "="*70)
-    print("{:<10} {:<15} {:<15} {:<12} {:>10}".format("Emp ID", "Name", "Joining Date", "Department", "Salary"))
-    print("-"*70)
-    for emp in employees:
-        print("{:<10} {:<15} {:<15} {:<12} {:>10.2f}".format(
-            emp['emp_id'],
-            emp['name'],
-            emp['joining_date'],
-            emp['department'],
-            emp['salary']
-        ))
-    print("="*70)
+    show(employee_lines("table"))
+
+# Save the employee report to a file: .csv, .json or a text table, and
+# compressed when the name ends in .gz, .bz2 or .xz
+@instrument("save_report")
+def save_report():
+    path = input("Save the report to (e.g. report.txt, report.csv, report.json.gz): ").strip()
+    if not path:
+        print("No file name given.")
+        return
+    try:
+        count = save(path, employee_lines("table", format_for(path)))
+    except OSError as e:
+        print(f"Could not save the report: {e}")
+        return
+    print(f"Saved {len(employees)} employee(s) to {path} ({count} lines).")
 
 # A function to sort employees according to the user's choice (name, salary, date of joining)
+@instrument("sort_employees")
 def sort_employees(): 
     while True: 
         
@@ -161,91 +336,133 @@ def sort_employees():
         elif choice == "2":
             key = "salary"
         elif choice == "3":
-            key = "joining_date"
+            key = "joining_ordinal"
         else: 
             print("The input is invalid")
             continue
 
         reverse = input("Descending? (y/n): ").lower() == 'y'
-        try:
-            sorted_list = sorted(employees, key=lambda x: x[key], reverse=reverse)
-            for emp in sorted_list:
-                print(emp) 
-        except KeyError: 
-            print("Invalid sort key.")
+        # Walk the store's sorted index instead of sorting the whole list
+        for emp in employees.sorted_by(key, reverse=reverse):
+            print(emp) 
+        metrics.add_rows(len(employees))
 
 # Function to calculate the total salaries of employees in each department and the number of employees in each department
+@instrument("total_department_salaries")
 def total_department_salaries(): 
-    dept_salaries = defaultdict(float)
-    dept_counts = defaultdict(int)
-
-    for emp in employees:
-        dept_salaries[emp['department']] += emp['salary']
-        dept_counts[emp['department']] += 1
-
-    print("\n" + "="*55)
-    print("{:<15} {:>15} {:>20}".format("Department", "Total Salary", "Employee Count"))
-    print("-"*55)
-
-    for dept in dept_salaries:
-        total = dept_salaries[dept]
-        count = dept_counts[dept]
-        print("{:<15} {:>15.2f} {:>20}".format(dept, total, count))
+    # Read from the materialized aggregates: the cost depends on the number
+    # of departments, not of employees
+    print("\n" + "="*115)
+    print("{:<15} {:>15} {:>15} {:>12} {:>12} {:>12} {:>12} {:>12}".format(
+        "Department", "Total Salary", "Employee Count", "Average", "Lowest", "Highest", "First Joined", "Last Joined"))
+    print("-"*115)
+
+    for row in departments.summary():
+        print("{:<15} {:>15.2f} {:>15} {:>12.2f} {:>12.2f} {:>12.2f} {:>12} {:>12}".format(
+            row['department'], row['total'], row['count'], row['mean'], row['lowest_salary'][0],
+            row['highest_salary'][0], format_date(row['first_joined'][0]), format_date(row['last_joined'][0])))
     
-    print("="*55)
+    print("="*115)
+
+# Rename a department for every employee in it at once; only the
+# category table changes, so it costs the same for 10 or 10 million employees
+@instrument("rename_department")
+def rename_department():
+    old = input("Department to rename: ").strip()
+    if old not in department_names:
+        print(f"No department named {old}.")
+        return
+    new = input("New department name: ").strip()
+    if not new:
+        print("The department name cannot be empty.")
+        return
+    try:
+        department_names.rename(old, new)
+    except ValueError as e:
+        print(e)
+        return
+    print(f"Department {old} renamed to {new}.")
+
+# Top-k leaderboards. The store's sorted indexes already hold the whole
+# payroll in order, so the first k cost O(k); a single department is
+# picked out with heap selection, O(n log k), instead of a full sort
+def leaders(by, k, highest, department=None):
+    if department is None:
+        field = "salary" if by == "salary" else "joining_ordinal"
+        return list(islice(employees.sorted_by(field, reverse=highest), k))
+    return [employees.find(emp_id) for emp_id in top_k(columns, k, by, highest, department)]
+
+# Ask how many employees to list and for an optional department
+def input_leaderboard():
+    while True:
+        answer = input("How many employees? [1]: ").strip() or "1"
+        if answer.isdigit() and int(answer) > 0:
+            break
+        print("Please enter a positive whole number.")
+    department = input("Department (leave empty for all departments): ").strip() or None
+    return int(answer), department
 
-# Function to find the first and last employee to join based on the date
+# Function to find the first and last employees to join based on the date
+@instrument("first_and_last_joined")
 def first_and_last_joined():
     if not employees:
         print("No employees to evaluate.")
         return
-    
-    # Sorting employees by date of joining
-    sorted_by_date = sorted(employees, key=lambda x: datetime.strptime(x['joining_date'], "%d/%m/%Y"))
 
     while True:
-        choice = input("Enter 1 to view the first joined employee, or 2 to view the last joined employee: ").strip()
-        
-        if choice == '1':
-            first = sorted_by_date[0]
-            print("\n--- First Joined Employee ---")
-            print(f"ID: {first['emp_id']}, Name: {first['name']}, Date: {first['joining_date']}, department: {first['department']}, Salary: {first['salary']}")
-            break
-        
-        elif choice == '2':
-            last = sorted_by_date[-1]
-            print("\n--- Last Joined Employee ---")
-            print(f"ID: {last['emp_id']}, Name: {last['name']}, Date: {last['joining_date']}, department: {last['department']}, Salary: {last['salary']}")
-            break
-        
-        else:
+        choice = input("Enter 1 to view the first joined employees, or 2 to view the last joined employees: ").strip()
+        if choice not in ('1', '2'):
             print("Invalid choice. Please enter 1 or 2.")
+            continue
 
-# Function to find the employee with the highest and lowest salary
+        k, department = input_leaderboard()
+        found = leaders("joining_date", k, highest=choice == '2', department=department)
+        metrics.add_rows(len(found))
+        print("\n--- First Joined Employees ---" if choice == '1' else "\n--- Last Joined Employees ---")
+        if not found:
+            print(f"No employees in department {department}.")
+        for emp in found:
+            print(f"ID: {emp['emp_id']}, Name: {emp['name']}, Date: {emp['joining_date']}, department: {emp['department']}, Salary: {emp['salary']}")
+        break
+
+# Function to find the employees with the highest and lowest salaries
+@instrument("lowest_and_highest_salary")
 def lowest_and_highest_salary():
     if not employees:
         print("No employees to evaluate.")
         return
 
-    sorted_by_salary = sorted(employees, key=lambda x: x['salary'])
-
     while True:
-        choice = input("Enter 1 to view the highest salary, or 2 to view the lowest salary: ").strip()
-        
-        if choice == '1':
-            highest = sorted_by_salary[-1]
-            print("\n--- Highest Salary ---")
-            print(f"ID: {highest['emp_id']}, Name: {highest['name']}, Salary: {highest['salary']}, department: {highest['department']}, Joining Date: {highest['joining_date']}")
-            break
+        choice = input("Enter 1 to view the highest salaries, or 2 to view the lowest salaries: ").strip()
+        if choice not in ('1', '2'):
+            print("Invalid input. Please enter 1 or 2.")
+            continue
 
-        elif choice == '2':
-            lowest = sorted_by_salary[0]
-            print("\n--- Lowest Salary ---")
-            print(f"ID: {lowest['emp_id']}, Name: {lowest['name']}, Salary: {lowest['salary']}, department: {lowest['department']}, Joining Date: {lowest['joining_date']}")
-            break
+        k, department = input_leaderboard()
+        found = leaders("salary", k, highest=choice == '1', department=department)
+        metrics.add_rows(len(found))
+        print("\n--- Highest Salaries ---" if choice == '1' else "\n--- Lowest Salaries ---")
+        if not found:
+            print(f"No employees in department {department}.")
+        for emp in found:
+            print(f"ID: {emp['emp_id']}, Name: {emp['name']}, Salary: {emp['salary']}, department: {emp['department']}, Joining Date: {emp['joining_date']}")
+        break
+
+# Function to show how salaries are distributed in equal-width bands
+@instrument("salary_distribution")
+def salary_distribution():
+    if not employees:
+        print("No employees to evaluate.")
+        return
 
-        else:
-            print("Invalid input. Please enter 1 or 2.")
+    counts, edges = salary_histogram(columns, bins=10)
+    metrics.add_rows(len(columns))
+    print("\n" + "="*55)
+    print("{:<30} {:>10}".format("Salary Range", "Employees"))
+    print("-"*55)
+    for count, low, high in zip(counts, edges, edges[1:]):
+        print("{:<30} {:>10} {}".format(f"{low:.2f} - {high:.2f}", count, "#" * min(count, 20)))
+    print("="*55)
 
 # The main function that displays the menu and interacts with the user
 def main():
@@ -264,16 +481,21 @@ def main():
 9.  Total salaries of employees in the department
 10. First and last joined employees
 11. Lowest and highest salary
+12. Salary distribution
+13. Performance metrics
+14. Filter employees
+15. Rename a department
+16. Save the employee report to a file
 """)
         choice = input("Choose the operation number :").strip() # The .strip() function is used to remove spaces
 
         # Input Validation
         if not choice.isdigit(): # Verify that the input number is correct
-            print("Please enter a valid number from 0 to 11.")
+            print("Please enter a valid number from 0 to 16.")
             continue
 
-        if choice not in [str(i) for i in range(0, 12)]: # To verify that the entered number is within the specified range
-            print("Please choose a number from the menu (0 to 11).")
+        if choice not in [str(i) for i in range(0, 17)]: # To verify that the entered number is within the specified range
+            print("Please choose a number from the menu (0 to 16).")
             continue
 
         if choice == "1" :
@@ -298,7 +520,130 @@ def main():
             first_and_last_joined()
         elif choice == "11" :
             lowest_and_highest_salary()
+        elif choice == "12" :
+            salary_distribution()
+        elif choice == "13" :
+            metrics_menu()
+        elif choice == "14" :
+            filter_employees()
+        elif choice == "15" :
+            rename_department()
+        elif choice == "16" :
+            save_report()
         else:
             break
 
-main()
\ No newline at end of file
+# ------------------ Headless commands (used by --batch, no menus or prompts) ------------------
+
+def record_to_dict(emp):
+    return {field: emp[field] for field in EmployeeRecord.FIELDS}
+
+def find_or_fail(emp_id):
+    emp = employees.find(str(emp_id))
+    if not emp:
+        raise LookupError(f"The employee {emp_id} was not found")
+    return emp
+
+def cmd_add(name, joining_date, salary, department=""):
+    employee = EmployeeRecord(next_emp_id(), name, joining_date, parse_salary(salary), department.strip())
+    employees.add(employee)
+    return record_to_dict(employee)
+
+def cmd_show(emp_id):
+    return record_to_dict(find_or_fail(emp_id))
+
+def cmd_modify(emp_id, name=None, joining_date=None, salary=None, department=None):
+    find_or_fail(emp_id)
+    changes = {"name": name, "salary": None if salary is None else parse_salary(salary), "department": department}
+    if joining_date is not None:
+        changes["joining_ordinal"] = parse_date(joining_date)
+    emp = employees.update(str(emp_id), {key: value for key, value in changes.items() if value is not None})
+    return record_to_dict(emp)
+
+def cmd_delete(emp_id):
+    return record_to_dict(employees.remove(find_or_fail(emp_id)['emp_id']))
+
+def cmd_search(query):
+    emp = employees.find(query)
+    matches = [emp] if emp else [employees.find(emp_id) for emp_id in sorted(search_index.search(query), key=int)]
+    return [record_to_dict(emp) for emp in matches]
+
+def cmd_list(sort_by=None, descending=False, min_salary=None, max_salary=None, joined_from=None,
+             joined_to=None, department=None, name=None, limit=None, offset=0):
+    if sort_by not in (None,) + EmployeeRecord.FIELDS:
+        raise ValueError(f"Cannot sort by {sort_by!r}")
+    query = employee_query(min_salary, max_salary, joined_from, joined_to, department, name, limit, offset)
+    if sort_by:
+        field = {"joining_date": "joining_ordinal", "department": "department_rank"}.get(sort_by, sort_by)
+        query = query.order_by(field, descending)
+    return [record_to_dict(emp) for emp in query.run(employees)]
+
+def cmd_department_totals():
+    return department_summary(columns)
+
+def cmd_departments():
+    return [{
+        "department": row["department"],
+        "count": row["count"],
+        "total": row["total"],
+        "mean": row["mean"],
+        "lowest_salary": {"emp_id": row["lowest_salary"][1], "salary": row["lowest_salary"][0]},
+        "highest_salary": {"emp_id": row["highest_salary"][1], "salary": row["highest_salary"][0]},
+        "first_joined": {"emp_id": row["first_joined"][1], "joining_date": format_date(row["first_joined"][0])},
+        "last_joined": {"emp_id": row["last_joined"][1], "joining_date": format_date(row["last_joined"][0])},
+    } for row in departments.summary()]
+
+def cmd_extremes():
+    if not employees:
+        return {}
+    return {
+        "first_joined": cmd_show(departments.extreme(by="joining_date", highest=False)),
+        "last_joined": cmd_show(departments.extreme(by="joining_date", highest=True)),
+        "highest_salary": cmd_show(departments.extreme(by="salary", highest=True)),
+        "lowest_salary": cmd_show(departments.extreme(by="salary", highest=False)),
+    }
+
+def cmd_rename_department(old, new):
+    new = new.strip()
+    if not new:
+        raise ValueError("The department name cannot be empty")
+    if old not in department_names:
+        raise LookupError(f"No department named {old}")
+    department_names.rename(old, new)
+    return {"from": old, "to": new}
+
+def cmd_report(path, format=None, layout="table"):
+    format = format or format_for(path)
+    return {"path": path, "format": format, "lines": save(path, employee_lines(layout, format))}
+
+def cmd_top(by="salary", k=10, highest=True, department=None):
+    if by not in ("salary", "joining_date"):
+        raise ValueError("by must be 'salary' or 'joining_date'")
+    return [record_to_dict(emp) for emp in leaders(by, int(k), highest, department)]
+
+BATCH_COMMANDS = {
+    "add": cmd_add,
+    "show": cmd_show,
+    "modify": cmd_modify,
+    "delete": cmd_delete,
+    "search": cmd_search,
+    "list": cmd_list,
+    "department_totals": cmd_department_totals,
+    "departments": cmd_departments,
+    "rename_department": cmd_rename_department,
+    "report": cmd_report,
+    "top": cmd_top,
+    "extremes": cmd_extremes,
+    "metrics": metrics_command,
+}
+
+if __name__ == "__main__":
+    # python "The second assignment.py" --batch commands.jsonl  (or --batch - for stdin)
+    # python "The second assignment.py" --metrics  (time operations, see menu option 13)
+    argv = sys.argv[1:]
+    if "--metrics" in argv:
+        argv.remove("--metrics")
+        metrics.enable()
+    if argv:
+        sys.exit(batch_main(BATCH_COMMANDS, argv))
+    main()
\ No newline at end of file
@@ -1,72 +1,149 @@
-from datetime import datetime
+import argparse
 import csv
+import json
+import math
 import os
+import sys
+from datetime import date
+
+from employee_backends import CsvBackend, LazyCsvBackend, SqliteBackend, convert, write_employee_csv
+from employee_batch import batch_main
+from employee_compression import open_text
+from employee_dates import format_date, parse_date, to_date
+from employee_ids import EMP_IDS, IdAllocator
+from employee_ingest import load_employee_csv
+from employee_locks import ConflictError
+from employee_metrics import instrument, metrics, metrics_command, metrics_menu
+from employee_query import Query
+from employee_reports import ReportCache, format_for, render, save, show
+from employee_search import split_term
+from employee_server import serve
+
+MAX_REPORTED_ROWS = 10
+
+# Layout of Employee.list
+LIST_FIELDS = ("id", "emp_id", "name", "joining_date", "salary")
+LIST_LINE = "{:<3} | {:<6} | {:<15} | {} | {}"
+LIST_HEADER = ["", "📋 Employee List:", "-" * 60]
+
+
+def report_skipped(path, errors):
+    """Tell the operator which rows of a CSV file could not be loaded"""
+    for line, message in errors[:MAX_REPORTED_ROWS]:
+        print(f"Skipped line {line} of {path}: {message}", file=sys.stderr)
+    if len(errors) > MAX_REPORTED_ROWS:
+        print(f"... {len(errors) - MAX_REPORTED_ROWS} more line(s) of {path} skipped.", file=sys.stderr)
+
 
 #------------------ Employee Class ------------------
 
 class Employee:
-    __employees = []
-    __auto_id = 1
-    __file_path = "employees.csv"
+    # No per-instance __dict__: at millions of rows this saves most of the memory
+    __slots__ = ("id", "emp_id", "name", "joining_date", "salary")
+
+    __backend = None  # where employees are stored, see use_backend()
+    __ids = IdAllocator()
+    # Rendered listings, dropped whenever the backend's version changes
+    __reports = ReportCache(lambda: Employee.__backend.version())
 
-    def __init__(self, data):
-        self.id = Employee.__auto_id
-        Employee.__auto_id += 1
+    def __init__(self, data, auto_id=None):
+        if auto_id is None:
+            auto_id = Employee.__ids.allocate()
+        self.id = auto_id
 
-        self.emp_id = f"E{self.id:03d}"
+        self.emp_id = EMP_IDS.format(self.id)
         self.name = data.get("name")
-        self.joining_date = datetime.strptime(data.get("joining_date"), "%d/%m/%Y").date()
+        self.joining_date = to_date(data.get("joining_date"))
         self.salary = float(data.get("salary"))
 
-    # ------------------ CSV SAVE & LOAD FUNCTIONS ------------------
+    @classmethod
+    def _from_row(cls, id, emp_id, name, joining_date, salary):
+        """Build an employee read back from storage, keeping its original ID"""
+        obj = cls.__new__(cls)
+        obj.id = id
+        obj.emp_id = emp_id
+        obj.name = name
+        obj.joining_date = joining_date
+        obj.salary = salary
+        return obj
+
+    # ------------------ STORAGE ------------------
 
     @classmethod
-    def load_from_csv(cls):
-        """Load employees from CSV file on start"""
-        if not os.path.exists(cls.__file_path):
-            return
+    def use_backend(cls, backend):
+        """Store employees in backend (CsvBackend by default, LazyCsvBackend or SqliteBackend)"""
+        backend.factory = cls._from_row
+        cls.__backend = backend
+        cls.__reports.clear()
 
-        with open(cls.__file_path, mode="r", newline="", encoding="utf-8") as file:
-            reader = csv.reader(file)
-            for row in reader:
-                if len(row) != 4:
-                    continue
+    @classmethod
+    @instrument("load")
+    def load(cls):
+        """Open the storage; on first use import employees.csv if there is one"""
+        if not cls.__backend.load():
+            cls.load_from_csv()
+        else:
+            report_skipped("employees.csv", cls.__backend.load_errors)
+        cls.__ids.advance_to(cls.__backend.next_id())
 
-                emp_id, name, joining_date, salary = row
+    @classmethod
+    def _write(cls, change, *args):
+        """Run a backend change; after a conflict skip the ids another operator used"""
+        try:
+            return change(*args)
+        except ConflictError:
+            cls.__ids.advance_to(cls.__backend.next_id())
+            raise
 
-                # Extract auto_id from E###
-                num = int(emp_id[1:])
-                if num >= cls.__auto_id:
-                    cls.__auto_id = num + 1
+    @classmethod
+    @instrument("load_from_csv")
+    def load_from_csv(cls, path="employees.csv", workers=None):
+        """Add the employees of an employees.csv file to the storage.
+
+        Large files are parsed by a pool of worker processes (see
+        employee_ingest); gzip, bz2 and lzma files are decompressed as
+        they are read. Rows that cannot be read are reported and
+        returned as a list of (line number, message).
+        """
+        if not os.path.exists(path):
+            return []
+        table, errors = load_employee_csv(path, workers)
+        report_skipped(path, errors)
+        known = {emp.emp_id for emp in cls.__backend.query()}
+        dates = {}
+        rows = []
+        for key, name, ordinal, salary in zip(table.ids, table.names, table.joining, table.salaries):
+            # Hand-edited ids such as e7 or E0007 are stored as E007
+            emp_id = table.format_id(key)
+            if emp_id not in known:
+                if ordinal not in dates:
+                    dates[ordinal] = date.fromordinal(ordinal)
+                rows.append(cls._from_row(key, emp_id, name, dates[ordinal], salary))
+        cls._write(cls.__backend.add_many, rows)
+        metrics.add_rows(len(rows))
+        return errors
 
-                obj = cls({
-                    "name": name,
-                    "joining_date": joining_date,
-                    "salary": salary
-                })
-                obj.emp_id = emp_id  # Keep original ID
-                cls.__employees.append(obj)
+    @classmethod
+    @instrument("save_to_csv")
+    def save_to_csv(cls, path="employees.csv"):
+        """Export all employees to CSV atomically (temp file + rename).
+
+        A path ending in .gz, .bz2 or .xz writes a compressed file.
+        """
+        write_employee_csv(path, cls.__backend.query())
 
     @classmethod
-    def save_to_csv(cls):
-        """Save all employees to CSV after each operation"""
-        with open(cls.__file_path, mode="w", newline="", encoding="utf-8") as file:
-            writer = csv.writer(file)
-            for emp in cls.__employees:
-                writer.writerow([
-                    emp.emp_id,
-                    emp.name,
-                    emp.joining_date.strftime("%d/%m/%Y"),
-                    emp.salary
-                ])
+    @instrument("close")
+    def close(cls):
+        cls.__backend.close()
 
     #------------------ CRUD OPERATIONS ------------------
 
     @classmethod
+    @instrument("create", rows=lambda emp: 1)
     def create(cls, data):
         obj = cls(data)
-        cls.__employees.append(obj)
-        cls.save_to_csv()
+        cls._write(cls.__backend.add, obj)
 
         print(f"Employee created successfully.")
         print(f"""
@@ -78,22 +155,14 @@ class Employee:
         return obj
 
     @classmethod
+    @instrument("update")
     def update(cls, emp_id, data):
-        emp = cls.find_by_emp_id(emp_id)
+        changes = {key: value for key, value in data.items() if value not in [None, ""]}
+        emp = cls._write(cls.__backend.update, emp_id, convert(changes))
         if not emp:
             print(f"No employee found with emp_id {emp_id}")
             return
 
-        for key, value in data.items():
-            if value not in [None, ""]:
-                if key == "joining_date":
-                    value = datetime.strptime(value, "%d/%m/%Y").date()
-                elif key == "salary":
-                    value = float(value)
-                setattr(emp, key, value)
-
-        cls.save_to_csv()
-
         print(f"Employee {emp_id} updated successfully.")
         print(f"""
             Employee ID number : {emp.emp_id}
@@ -103,37 +172,240 @@ class Employee:
         """)
 
     @classmethod
+    @instrument("find_by_emp_id", rows=lambda emp: 1)
     def find_by_emp_id(cls, emp_id):
-        for emp in cls._Employee__employees:
-            if emp.emp_id == emp_id:
-                return emp
-        return None
+        return cls.__backend.find(emp_id)
+
+    @classmethod
+    @instrument("find_by_name", rows=len)
+    def find_by_name(cls, name):
+        """All employees with this name (case-insensitive)"""
+        return cls.__backend.find_by_name(name)
 
     @classmethod
+    @instrument("delete")
     def delete(cls, emp_id):
-        emp = cls.find_by_emp_id(emp_id)
+        emp = cls._write(cls.__backend.remove, emp_id)
         if emp:
-            cls._Employee__employees.remove(emp)
-            cls.save_to_csv()
             print(f"Employee {emp_id} deleted successfully.")
         else:
             print(f"No employee found with emp_id {emp_id}")
 
+    #------------------ BULK OPERATIONS ------------------
+
+    @staticmethod
+    def validate(data, partial=False):
+        """Check raw employee fields, raising ValueError on the first bad one.
+
+        With partial=True only the fields present are checked (for updates).
+        """
+        clean = {}
+        name = data.get("name")
+        if name is not None or not partial:
+            name = str(name or "").strip()
+            if name == "":
+                raise ValueError("Name cannot be empty.")
+            if "\n" in name or "\r" in name:
+                raise ValueError("Name cannot contain line breaks.")
+            if "\0" in name:
+                # The snapshot keeps names NUL-separated
+                raise ValueError("Name cannot contain NUL characters.")
+            clean["name"] = name
+
+        joining_date = data.get("joining_date")
+        if joining_date is not None or not partial:
+            joining_date = str(joining_date or "").strip()
+            try:
+                parse_date(joining_date)
+            except ValueError:
+                raise ValueError(f"Invalid date format {joining_date!r}. Please use dd/mm/yyyy.")
+            clean["joining_date"] = joining_date
+
+        salary = data.get("salary")
+        if salary is not None or not partial:
+            try:
+                salary = float(salary)
+            except (TypeError, ValueError):
+                raise ValueError(f"Salary must be a number, got {salary!r}.")
+            if not math.isfinite(salary):
+                # nan and inf cannot be ordered, so the sorted salary index would break
+                raise ValueError(f"Salary must be a finite number, got {salary!r}.")
+            if salary < 0:
+                raise ValueError("Salary must be positive.")
+            clean["salary"] = salary
+
+        return clean
+
+    @classmethod
+    @instrument("bulk_create", rows=lambda result: len(result[0]))
+    def bulk_create(cls, rows):
+        """Create many employees and persist them in one write.
+
+        Every row is validated before anything is created. Returns
+        (created, errors) where errors is a list of (row number, message).
+        """
+        valid, errors = [], []
+        for number, data in enumerate(rows, start=1):
+            try:
+                valid.append(cls.validate(data))
+            except ValueError as e:
+                errors.append((number, str(e)))
+
+        # Allocate IDs for the whole batch in one step
+        first_id = cls.__ids.allocate(len(valid))
+
+        created = [cls(data, auto_id=first_id + i) for i, data in enumerate(valid)]
+        cls._write(cls.__backend.add_many, created)
+        return created, errors
+
+    @classmethod
+    @instrument("bulk_update", rows=lambda result: len(result[0]))
+    def bulk_update(cls, changes):
+        """Apply {emp_id: data} updates, persisted in one write.
+
+        Returns (updated, errors) where errors is a list of (emp_id, message).
+        """
+        valid, errors = {}, []
+        for emp_id, data in changes.items():
+            if cls.find_by_emp_id(emp_id) is None:
+                errors.append((emp_id, f"No employee found with emp_id {emp_id}"))
+                continue
+            data = {key: value for key, value in data.items() if value not in [None, ""]}
+            try:
+                valid[emp_id] = convert(cls.validate(data, partial=True))
+            except ValueError as e:
+                errors.append((emp_id, str(e)))
+
+        return cls._write(cls.__backend.update_many, valid), errors
+
+    @classmethod
+    @instrument("bulk_delete", rows=lambda result: len(result[0]))
+    def bulk_delete(cls, emp_ids):
+        """Delete many employees, persisted in one write.
+
+        Returns (deleted, errors) where errors is a list of (emp_id, message).
+        """
+        emp_ids = list(emp_ids)
+        deleted = cls._write(cls.__backend.remove_many, emp_ids)
+        found = {emp.emp_id for emp in deleted}
+        errors = [(emp_id, f"No employee found with emp_id {emp_id}") for emp_id in emp_ids if emp_id not in found]
+        return deleted, errors
+
+    @classmethod
+    def import_csv(cls, path):
+        """Import an external CSV with a name,joining_date,salary header row.
+
+        The file may be gzip, bz2 or lzma compressed. Errors are reported
+        by line number in the file.
+        """
+        rows, numbers = [], []
+        with open_text(path) as file:
+            reader = csv.DictReader(file)
+            missing = {"name", "joining_date", "salary"} - set(reader.fieldnames or [])
+            if missing:
+                raise ValueError(f"Missing column(s): {', '.join(sorted(missing))}")
+            for row in reader:
+                rows.append(row)
+                numbers.append(reader.line_num)
+
+        created, errors = cls.bulk_create(rows)
+        return created, [(numbers[number - 1], message) for number, message in errors]
+
+    @classmethod
+    def changes_since(cls, seq=0, limit=None):
+        """Change events after sequence number seq, oldest first.
+
+        Each event is {"seq", "emp_id", "before", "after", "op"}; a
+        consumer stores the last seq it applied (see employee_changelog).
+        """
+        return cls.__backend.changes_since(seq, limit)
+
+    @classmethod
+    @instrument("search", rows=len)
+    def search(cls, term):
+        """Employees whose emp_id or name contains term (case-insensitive); "jo*" matches words starting with jo"""
+        return cls.__backend.search(term)
+
+    @classmethod
+    @instrument("suggest", rows=len)
+    def suggest(cls, term, limit=5):
+        """Closest matches for a misspelled name or emp_id, best first"""
+        return cls.__backend.suggest(term, limit)
+
+    @classmethod
+    @instrument("query")
+    def query(cls, search=None, sort_by=None, descending=False, where=None):
+        """The employees list() would show, without printing them.
+
+        where is an employee_query.Query (see Employee.where) and is
+        answered from the backend's indexes, one row at a time. Without
+        sort_by, filtered rows come in the order of the index that was
+        scanned.
+        """
+        return cls.__backend.query(search, sort_by, descending, where)
+
+    @staticmethod
+    def where(min_salary=None, max_salary=None, joined_from=None, joined_to=None, name=None,
+              limit=None, offset=0):
+        """A Query from optional filters; joining dates are dd/mm/yyyy text"""
+        query = Query()
+        if min_salary is not None or max_salary is not None:
+            query = query.between("salary", None if min_salary is None else float(min_salary),
+                                  None if max_salary is None else float(max_salary))
+        if joined_from or joined_to:
+            query = query.between("joining_date", to_date(joined_from) if joined_from else None,
+                                  to_date(joined_to) if joined_to else None)
+        if name is not None:
+            query = query.equals("name", name.strip())
+        return query.offset(offset).limit(limit)
+
+    def to_dict(self):
+        return {
+            "emp_id": self.emp_id,
+            "name": self.name,
+            "joining_date": format_date(self.joining_date.toordinal()),
+            "salary": self.salary
+        }
+
+    @classmethod
+    def render(cls, search=None, sort_by=None, descending=False, where=None, format="text"):
+        """(row count, lines) of a listing as text, csv or json; cached until the next change"""
+        def build():
+            employees = list(cls.query(search, sort_by, descending, where))
+            metrics.add_rows(len(employees))
+            if format == "text":
+                rows = ((emp.id, emp.emp_id, emp.name, emp.joining_date, emp.salary) for emp in employees)
+                return len(employees), render(rows, LIST_FIELDS, line=LIST_LINE, header=LIST_HEADER,
+                                              footer=["-" * 60])
+            rows = ((emp.emp_id, emp.name, format_date(emp.joining_date.toordinal()), emp.salary)
+                    for emp in employees)
+            return len(employees), render(rows, LIST_FIELDS[1:], format)
+        return cls.__reports.get((search, sort_by, descending, repr(where), format), build)
+
+    @classmethod
+    def export(cls, path, search=None, sort_by=None, descending=False, where=None, format=None):
+        """Save a listing to path as text, csv or json (by extension unless format is given).
+
+        A name ending in .gz, .bz2 or .xz is compressed. Returns the row count.
+        """
+        count, lines = cls.render(search, sort_by, descending, where, format or format_for(path))
+        save(path, lines)
+        return count
+
     @classmethod
-    def list(cls, search=None, sort_by=None):
-        result = cls._Employee__employees
+    @instrument("list")
+    def list(cls, search=None, sort_by=None, descending=False, where=None, page_size=None):
+        """Print a listing a page at a time (see employee_reports.show)"""
+        count, lines = cls.render(search, sort_by, descending, where)
+        show(lines, page_size=page_size)
 
-        if search:
-            result = [emp for emp in result if search.lower() in emp.emp_id.lower() or search.lower() in emp.name.lower()]
+        if search and not count:
+            suggestions = cls.suggest(split_term(search)[0])
+            if suggestions:
+                print("Did you mean: " + ", ".join(f"{emp.name} ({emp.emp_id})" for emp in suggestions))
 
-        if sort_by:
-            result.sort(key=lambda e: getattr(e, sort_by))
 
-        print("\n📋 Employee List:")
-        print("-" * 60)
-        for emp in result:
-            print(f"{emp.id:<3} | {emp.emp_id:<6} | {emp.name:<15} | {emp.joining_date} | {emp.salary}")
-        print("-" * 60)
+Employee.use_backend(CsvBackend())
 
 
 #------------------ Validation functions ------------------
@@ -150,7 +422,7 @@ def input_joining_date():
     while True:
         date_str = input("Enter joining date (dd/mm/yyyy): ").strip()
         try:
-            datetime.strptime(date_str, "%d/%m/%Y")
+            parse_date(date_str)
             return date_str
         except ValueError:
             print("Invalid date format. Please use dd/mm/yyyy.")
@@ -160,7 +432,9 @@ def input_salary():
         salary = input("Enter salary: ").strip()
         try:
             val = float(salary)
-            if val < 0:
+            if not math.isfinite(val):
+                print("Salary must be a finite number.")
+            elif val < 0:
                 print("Salary must be positive.")
             else:
                 return val
@@ -178,7 +452,7 @@ def get_update_data():
     joining_date = input("New joining date (dd/mm/yyyy): ").strip()
     if joining_date != "":
         try:
-            datetime.strptime(joining_date, "%d/%m/%Y")
+            parse_date(joining_date)
             data["joining_date"] = joining_date
         except ValueError:
             print("Invalid date format. Skipping joining date update.")
@@ -187,7 +461,9 @@ def get_update_data():
     if salary != "":
         try:
             val = float(salary)
-            if val < 0:
+            if not math.isfinite(val):
+                print("Salary must be a finite number. Skipping salary update.")
+            elif val < 0:
                 print("Salary must be positive. Skipping salary update.")
             else:
                 data["salary"] = val
@@ -196,12 +472,34 @@ def get_update_data():
 
     return data
 
+def get_filters():
+    """Ask for salary, joining date and name filters; None when none are given"""
+    print("Leave a filter empty to skip it.")
+    filters = {}
+    for key, prompt, check in (("min_salary", "Lowest salary: ", float),
+                               ("max_salary", "Highest salary: ", float),
+                               ("joined_from", "Joined on or after (dd/mm/yyyy): ", parse_date),
+                               ("joined_to", "Joined on or before (dd/mm/yyyy): ", parse_date),
+                               ("name", "Exact name: ", str),
+                               ("limit", "Show at most (number of employees): ", int)):
+        while True:
+            answer = input(prompt).strip()
+            if answer == "":
+                break
+            try:
+                check(answer)
+                filters[key] = answer
+                break
+            except ValueError:
+                print("Invalid value. Please try again or leave it empty.")
+    return Employee.where(**filters) if filters else None
+
 
 #------------------ Menu --------------------------
 
 
 def main():
-    Employee.load_from_csv()  # <<< LOAD DATA WHEN PROGRAM STARTS
+    Employee.load()  # <<< LOAD DATA WHEN PROGRAM STARTS
 
     while True:
         print("""
@@ -211,15 +509,17 @@ def main():
 3. Delete Employee
 4. List Employees
 5. Exit
+6. Import Employees from CSV
+7. Performance Metrics
 =======================================
 """)
         choice = input("Choose the operation number :").strip()
 
         if not choice.isdigit():
-            print("Please enter a valid number from 0 to 5.")
+            print("Please enter a valid number from 1 to 7.")
             continue
 
-        if choice not in [str(i) for i in range(1, 6)]:
+        if choice not in [str(i) for i in range(1, 8)]:
             print("Please choose a number from the menu (0 to 11).")
             continue
 
@@ -229,7 +529,10 @@ def main():
                 "joining_date": input_joining_date(),
                 "salary": input_salary()
             }
-            Employee.create(emp_data)
+            try:
+                Employee.create(emp_data)
+            except ConflictError as e:
+                print(e)
 
         elif choice == "2":
             while True:
@@ -252,10 +555,10 @@ def main():
                     if emp_id == "0":
                         print("Returning to main menu...")
                         break
-                    if len(emp_id) != 4 or not emp_id[1:].isdigit() or emp_id[0].upper() != "E":
-                        print("Invalid Employee ID format. Use 'E' followed by 3 digits, e.g., E001.")
+                    if not EMP_IDS.is_valid(emp_id):
+                        print("Invalid Employee ID format. Use 'E' followed by digits, e.g., E001 or E1000.")
                         continue
-                    emp = Employee.find_by_emp_id(emp_id.upper())
+                    emp = Employee.find_by_emp_id(EMP_IDS.normalize(emp_id))
                     if not emp:
                         print(f"No employee found with emp_id {emp_id}")
                         continue
@@ -269,11 +572,8 @@ def main():
                     if not name:
                         print("Employee name cannot be empty.")
                         continue
-                    emp = None
-                    for e in Employee._Employee__employees:
-                        if e.name.lower() == name.lower():
-                            emp = e
-                            break
+                    matches = Employee.find_by_name(name)
+                    emp = matches[0] if matches else None
                     if not emp:
                         print(f"No employee found with name '{name}'")
                         continue
@@ -283,7 +583,10 @@ def main():
                 continue
 
             data = get_update_data()
-            Employee.update(emp.emp_id, data)
+            try:
+                Employee.update(emp.emp_id, data)
+            except ConflictError as e:
+                print(e)
 
         elif choice == "3":
             while True:
@@ -293,18 +596,22 @@ def main():
                     print("Returning to main menu...")
                     break
 
-                if len(emp_id) != 4 or not emp_id[1:].isdigit() or emp_id[0].upper() != "E":
-                    print("Invalid Employee ID format. Use 'E' followed by 3 digits, e.g., E001.")
+                if not EMP_IDS.is_valid(emp_id):
+                    print("Invalid Employee ID format. Use 'E' followed by digits, e.g., E001 or E1000.")
                     continue
 
-                emp = Employee.find_by_emp_id(emp_id.upper())
+                emp_id = EMP_IDS.normalize(emp_id)
+                emp = Employee.find_by_emp_id(emp_id)
                 if not emp:
                     print(f"No employee found with emp_id {emp_id}")
                     continue
 
                 confirm = input(f"Are you sure you want to delete employee {emp_id}? (y/n): ").strip().lower()
                 if confirm == "y":
-                    Employee.delete(emp_id.upper())
+                    try:
+                        Employee.delete(emp_id)
+                    except ConflictError as e:
+                        print(e)
                 else:
                     print("Delete cancelled.")
                 break
@@ -318,11 +625,18 @@ def main():
 
             search_term = None
             if search_option == "y":
-                search_term = input("Enter search term (emp_id or name): ").strip()
+                search_term = input("Enter search term (emp_id or name, end with * to match the start of a word): ").strip()
                 if not search_term:
                     print("Empty search term entered. Showing all employees.")
                     search_term = None
 
+            while True:
+                filter_option = input("Do you want to filter by salary, joining date or name? (y/n): ").strip().lower()
+                if filter_option in ("y", "n"):
+                    break
+                print("Invalid input. Please enter 'y' or 'n'.")
+            where = get_filters() if filter_option == "y" else None
+
             while True:
                 sort_option = input("Do you want to sort? (y/n): ").strip().lower()
                 if sort_option in ("y", "n"):
@@ -358,12 +672,127 @@ def main():
                     sort_by = sort_options[choice_sort]
                     break
 
-            Employee.list(search=search_term, sort_by=sort_by)
+            descending = sort_by is not None and input("Descending? (y/n): ").strip().lower() == "y"
+            Employee.list(search=search_term, sort_by=sort_by, descending=descending, where=where)
 
         elif choice == "5":
+            Employee.close()
             print("Goodbye!")
             break
 
+        elif choice == "6":
+            path = input("Enter the CSV file path or 0 to cancel: ").strip()
+            if path == "0":
+                print("Returning to main menu...")
+                continue
+            try:
+                created, errors = Employee.import_csv(path)
+            except (OSError, ValueError) as e:
+                print(f"Import failed: {e}")
+                continue
+
+            print(f"Imported {len(created)} employee(s).")
+            for line, message in errors:
+                print(f"  Line {line}: {message}")
+
+        elif choice == "7":
+            metrics_menu()
+
+
+#------------------ Headless commands (used by --batch) ------------------
+
+def find_or_fail(emp_id):
+    emp = Employee.find_by_emp_id(emp_id)
+    if not emp:
+        raise LookupError(f"No employee found with emp_id {emp_id}")
+    return emp
+
+def cmd_create(name, joining_date, salary):
+    return Employee.create(Employee.validate({"name": name, "joining_date": joining_date, "salary": salary})).to_dict()
+
+def cmd_update(emp_id, **data):
+    find_or_fail(emp_id)
+    Employee.update(emp_id, Employee.validate(data, partial=True))
+    return find_or_fail(emp_id).to_dict()
+
+def cmd_delete(emp_id):
+    result = find_or_fail(emp_id).to_dict()
+    Employee.delete(emp_id)
+    return result
+
+def cmd_get(emp_id):
+    return find_or_fail(emp_id).to_dict()
+
+def cmd_list(search=None, sort_by=None, descending=False, min_salary=None, max_salary=None,
+             joined_from=None, joined_to=None, name=None, limit=None, offset=0):
+    if sort_by not in (None, "emp_id", "name", "joining_date", "salary"):
+        raise ValueError(f"Cannot sort by {sort_by!r}")
+    where = Employee.where(min_salary, max_salary, joined_from, joined_to, name, limit, offset)
+    return [emp.to_dict() for emp in Employee.query(search, sort_by, descending, where)]
+
+def cmd_bulk_create(rows):
+    created, errors = Employee.bulk_create(rows)
+    return {"created": [emp.to_dict() for emp in created], "errors": errors}
+
+def cmd_import_csv(path):
+    created, errors = Employee.import_csv(path)
+    return {"created": len(created), "errors": errors}
+
+def cmd_export(path, format=None, search=None, sort_by=None, descending=False, min_salary=None,
+               max_salary=None, joined_from=None, joined_to=None, name=None, limit=None, offset=0):
+    where = Employee.where(min_salary, max_salary, joined_from, joined_to, name, limit, offset)
+    return {"path": path, "rows": Employee.export(path, search, sort_by, descending, where, format)}
+
+def cmd_changes(since=0, limit=None):
+    return list(Employee.changes_since(int(since), None if limit is None else int(limit)))
+
+BATCH_COMMANDS = {
+    "create": cmd_create,
+    "update": cmd_update,
+    "delete": cmd_delete,
+    "get": cmd_get,
+    "list": cmd_list,
+    "bulk_create": cmd_bulk_create,
+    "import_csv": cmd_import_csv,
+    "export": cmd_export,
+    "changes": cmd_changes,
+    "metrics": metrics_command,
+}
+
 
 if __name__ == "__main__":
+    # python "The third assignment.py" --batch commands.jsonl  (or --batch - for stdin)
+    # python "The third assignment.py" --sqlite employees.db   (store employees in SQLite)
+    # python "The third assignment.py" --lazy                   (read employees.csv on demand, see LazyCsvBackend)
+    # python "The third assignment.py" --serve 8080             (HTTP/JSON API, see employee_server)
+    # python "The third assignment.py" --metrics                (time operations, see menu option 7)
+    # python "The third assignment.py" --changes-since 42       (changes after seq 42 as JSON lines)
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--sqlite", metavar="DB")
+    parser.add_argument("--lazy", action="store_true")
+    parser.add_argument("--serve", metavar="[HOST:]PORT")
+    parser.add_argument("--metrics", action="store_true")
+    parser.add_argument("--changes-since", metavar="SEQ", type=int)
+    args, rest = parser.parse_known_args()
+    if args.metrics:
+        metrics.enable()
+    if args.sqlite:
+        Employee.use_backend(SqliteBackend(args.sqlite))
+    elif args.lazy:
+        Employee.use_backend(LazyCsvBackend())
+    if args.changes_since is not None:
+        # Only reads the changelog: the employees themselves are not loaded
+        for event in Employee.changes_since(args.changes_since):
+            print(json.dumps(event))
+        sys.exit(0)
+    if args.serve:
+        host, _, port = args.serve.rpartition(":")
+        Employee.load()
+        try:
+            serve(Employee, host or "127.0.0.1", int(port))
+        finally:
+            Employee.close()
+        sys.exit(0)
+    if rest:
+        sys.exit(batch_main(BATCH_COMMANDS, rest, setup=Employee.load, teardown=Employee.close))
     main()
@@ -0,0 +1,24 @@
+"""Benchmarks for the employee management assignments.
+
+Run them from the repository root, e.g. ``python -m benchmarks.memory``.
+"""
+import importlib.util
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def load_assignment(filename, name=None):
+    """Import one of the assignment scripts (their file names contain spaces)"""
+    name = name or os.path.splitext(filename)[0].replace(" ", "_").lower()
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, filename))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
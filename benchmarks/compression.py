@@ -0,0 +1,71 @@
+"""Compressed employees.csv: file size against write and read throughput per codec.
+
+    python -m benchmarks.compression --rows 1000000
+
+Writes a synthetic workforce with write_employee_csv once per codec
+(plain, gzip, bz2, lzma, chosen by the file extension) and loads it back
+with load_employee_csv in one process, so the codecs are compared on
+equal terms. Throughput is in uncompressed MiB per second, so the
+columns compare directly with the plain file's.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.workforce import generate
+from employee_backends import write_employee_csv
+from employee_dates import to_date
+from employee_ingest import load_employee_csv
+
+CODECS = (("plain", ".csv"), ("gzip", ".csv.gz"), ("bz2", ".csv.bz2"), ("lzma", ".csv.xz"))
+
+
+class Row:
+    """Just the attributes write_employee_csv reads"""
+    __slots__ = ("emp_id", "name", "joining_date", "salary")
+
+    def __init__(self, number, name, _, joining_date, salary):
+        self.emp_id = f"E{number:03d}"
+        self.name = name
+        self.joining_date = joining_date
+        self.salary = salary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rows = [Row(number, name, department, to_date(joining_date), salary)
+            for number, name, department, joining_date, salary in generate(args.rows, args.seed)]
+
+    def best(function):
+        times = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            function()
+            times.append(time.perf_counter() - started)
+        return min(times)
+
+    with tempfile.TemporaryDirectory() as directory:
+        plain_size = None
+        print(f"{args.rows:,} rows\n")
+        print(f"{'Codec':<8} {'Size MiB':>9} {'Ratio':>7} {'Write s':>8} {'Write MiB/s':>12} "
+              f"{'Read s':>8} {'Read MiB/s':>11}")
+        print("-" * 69)
+        for codec, extension in CODECS:
+            path = os.path.join(directory, "employees" + extension)
+            write = best(lambda: write_employee_csv(path, rows))
+            read = best(lambda: load_employee_csv(path, workers=1))
+            size = os.path.getsize(path)
+            plain_size = plain_size or size
+            mib = plain_size / 2**20
+            print(f"{codec:<8} {size / 2**20:>9.2f} {plain_size / size:>6.1f}x {write:>8.2f} "
+                  f"{mib / write:>12.1f} {read:>8.2f} {mib / read:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""Stress test: many threads and processes changing the same employees.
+
+    python -m benchmarks.concurrency --threads 8 --processes 4 --backend csv
+
+Threads share one Employee class; processes each load their own copy of
+the same files and retry when they get a ConflictError. Afterwards the
+data is loaded fresh and checked: every created employee is there, no
+emp_id is used twice, and every employee has the salary its last update
+wrote (no lost updates). Exits with 1 if any check fails.
+"""
+import argparse
+import contextlib
+import io
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks import load_assignment
+from employee_backends import CsvBackend, SqliteBackend
+from employee_locks import ConflictError
+
+
+def fresh_assignment(backend, directory):
+    os.chdir(directory)
+    module = load_assignment("The third assignment.py")
+    if backend == "sqlite":
+        module.Employee.use_backend(SqliteBackend())
+    else:
+        module.Employee.use_backend(CsvBackend())
+    module.Employee.load()
+    return module
+
+
+def retry(change, *args):
+    """Call change until it does not conflict; return (result, conflicts)"""
+    conflicts = 0
+    while True:
+        try:
+            return change(*args), conflicts
+        except ConflictError:
+            conflicts += 1
+
+
+def worker(Employee, label, creates, updates):
+    """Create employees, then update each one; return {emp_id: salary} and conflicts"""
+    expected, conflicts = {}, 0
+    for i in range(creates):
+        data = {"name": f"{label} {i}", "joining_date": "01/01/2020", "salary": 0}
+        emp, retries = retry(Employee.create, data)
+        conflicts += retries
+        expected[emp.emp_id] = 0.0
+    for value in range(1, updates + 1):
+        for emp_id in expected:
+            _, retries = retry(Employee.update, emp_id, {"salary": value})
+            conflicts += retries
+            expected[emp_id] = float(value)
+    return expected, conflicts
+
+
+def reader(Employee, stop, counts):
+    while not stop.is_set():
+        for emp in Employee.query(sort_by="salary"):
+            pass
+        Employee.search("thread")
+        counts[0] += 1
+
+
+def process_worker(backend, directory, label, creates, updates, results):
+    with contextlib.redirect_stdout(io.StringIO()):
+        Employee = fresh_assignment(backend, directory).Employee
+        results.put(worker(Employee, label, creates, updates))
+        Employee.close()
+
+
+def run_threads(Employee, threads, creates, updates):
+    results = [None] * threads
+    stop = threading.Event()
+    reads = [0]
+
+    def run(n):
+        results[n] = worker(Employee, f"thread {n}", creates, updates)
+
+    workers = [threading.Thread(target=run, args=(n,)) for n in range(threads)]
+    readers = [threading.Thread(target=reader, args=(Employee, stop, reads)) for _ in range(2)]
+    # Employee prints every change; stdout is swapped once for all threads
+    with contextlib.redirect_stdout(io.StringIO()):
+        for thread in readers + workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        stop.set()
+        for thread in readers:
+            thread.join()
+    return results, reads[0]
+
+
+def run_processes(backend, directory, processes, creates, updates):
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    workers = [context.Process(target=process_worker,
+                               args=(backend, directory, f"process {n}", creates, updates, queue))
+               for n in range(processes)]
+    for process in workers:
+        process.start()
+    results = [queue.get() for _ in workers]
+    for process in workers:
+        process.join()
+    return results
+
+
+def check(Employee, results):
+    """Return a list of problems found in the stored data"""
+    expected = {}
+    for salaries, _ in results:
+        duplicated = expected.keys() & salaries.keys()
+        if duplicated:
+            return [f"emp_id handed out twice: {sorted(duplicated)[:5]}"]
+        expected.update(salaries)
+
+    stored = {emp.emp_id: emp.salary for emp in Employee.query()}
+    problems = []
+    if len(stored) != len(expected):
+        problems.append(f"{len(expected)} employees created but {len(stored)} stored")
+    lost = [emp_id for emp_id, salary in expected.items() if stored.get(emp_id) != salary]
+    if lost:
+        problems.append(f"{len(lost)} lost update(s), e.g. {lost[:5]}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", choices=("csv", "sqlite"), default="csv")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--creates", type=int, default=200, help="employees created per worker")
+    parser.add_argument("--updates", type=int, default=5, help="update rounds per worker")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        Employee = fresh_assignment(args.backend, directory).Employee
+
+        started = time.perf_counter()
+        results, reads = run_threads(Employee, args.threads, args.creates, args.updates)
+        elapsed = time.perf_counter() - started
+        ops = args.threads * args.creates * (1 + args.updates)
+        print(f"threads:   {args.threads} x {args.creates * (1 + args.updates)} writes, "
+              f"{ops / elapsed:,.0f} writes/s, {reads} concurrent list+search rounds")
+
+        started = time.perf_counter()
+        results += run_processes(args.backend, directory, args.processes, args.creates, args.updates)
+        elapsed = time.perf_counter() - started
+        ops = args.processes * args.creates * (1 + args.updates)
+        conflicts = sum(count for _, count in results)
+        print(f"processes: {args.processes} x {args.creates * (1 + args.updates)} writes, "
+              f"{ops / elapsed:,.0f} writes/s, {conflicts} conflicts retried")
+
+        # Check what a brand-new session sees on disk
+        Employee.close()
+        problems = check(fresh_assignment(args.backend, directory).Employee, results)
+
+    for problem in problems:
+        print(f"FAILED: {problem}")
+    if not problems:
+        print("OK: no duplicate ids, no lost updates")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+"""dd/mm/yyyy parsing: datetime.strptime vs employee_dates.parse_date.
+
+    python -m benchmarks.dates --rows 1000000
+"""
+import argparse
+import random
+import time
+from datetime import date, datetime
+
+import benchmarks  # noqa: F401  (puts the repository root on sys.path)
+from employee_dates import parse_date
+
+
+def sample_dates(count, distinct, seed=1):
+    rng = random.Random(seed)
+    start = date(1990, 1, 1).toordinal()
+    pool = [date.fromordinal(start + rng.randrange(12000)).strftime("%d/%m/%Y") for _ in range(distinct)]
+    return [rng.choice(pool) for _ in range(count)]
+
+
+def timed(label, parse, texts):
+    started = time.perf_counter()
+    for text in texts:
+        parse(text)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<40} {elapsed:>9.3f} s {len(texts) / elapsed / 1e6:>9.2f} M/s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--distinct", type=int, default=5000, help="distinct joining dates")
+    args = parser.parse_args()
+
+    texts = sample_dates(args.rows, args.distinct)
+    print(f"{'Parser':<40} {'Time':>11} {'Rate':>11}")
+    print("-" * 64)
+    baseline = timed("datetime.strptime(...).date()", lambda t: datetime.strptime(t, "%d/%m/%Y").date(), texts)
+    uncached = timed("parse_date (no memo cache)", parse_date.__wrapped__, texts)
+    parse_date.cache_clear()
+    cached = timed("parse_date (memo cache)", parse_date, texts)
+    print(f"\nSpeed-up over strptime: {baseline / uncached:.1f}x uncached, {baseline / cached:.1f}x cached")
+
+    # The parser must agree with strptime on every date
+    for text in set(texts):
+        assert parse_date(text) == datetime.strptime(text, "%d/%m/%Y").toordinal(), text
+
+
+if __name__ == "__main__":
+    main()
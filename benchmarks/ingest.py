@@ -0,0 +1,64 @@
+"""Parallel CSV ingestion: rows per second against the number of workers.
+
+    python -m benchmarks.ingest --rows 2000000 --workers 1 2 4 8
+
+Writes a synthetic employees.csv to a temporary directory, then times the
+row-at-a-time reader the loader replaced and load_employee_csv with each
+worker count. On an idle machine the speed-up should stay close to the
+worker count until it runs out of physical cores or disk bandwidth.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.workforce import generate, write_employees_csv
+from employee_backends import read_employee_csv
+from employee_dates import to_date
+from employee_ingest import load_employee_csv
+
+
+def row_at_a_time(path):
+    """What Employee.load_from_csv used to do, minus building the objects"""
+    rows = 0
+    for emp_id, name, joining_date, salary in read_employee_csv(path):
+        int(emp_id[1:]), to_date(joining_date), float(salary)
+        rows += 1
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "employees.csv")
+        write_employees_csv(path, generate(args.rows, args.seed))
+        size = os.path.getsize(path)
+        print(f"{args.rows:,} rows, {size / 2**20:,.1f} MiB, {os.cpu_count()} CPU(s)\n")
+        print(f"{'Loader':<24} {'Seconds':>9} {'Rows/s':>12} {'Speed-up':>9}")
+        print("-" * 57)
+
+        def best(function):
+            times = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                function()
+                times.append(time.perf_counter() - started)
+            return min(times)
+
+        baseline = best(lambda: row_at_a_time(path))
+        print(f"{'row at a time':<24} {baseline:>9.2f} {args.rows / baseline:>12,.0f} {1:>8.2f}x")
+        for workers in args.workers:
+            elapsed = best(lambda: load_employee_csv(path, workers))
+            print(f"{f'{workers} worker(s)':<24} {elapsed:>9.2f} {args.rows / elapsed:>12,.0f} "
+                  f"{baseline / elapsed:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
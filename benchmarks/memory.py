@@ -0,0 +1,144 @@
+"""Bytes per employee for each in-memory representation.
+
+    python -m benchmarks.memory --rows 100000
+
+The assignments are imported before anything is measured, so module and
+class set-up never count as per-employee cost. The last rows are the
+second assignment's whole EmployeeStore, every index included, and the
+share of it taken by the trigram search index.
+"""
+import argparse
+import gc
+import random
+import tracemalloc
+from datetime import date
+
+from benchmarks import load_assignment
+from employee_columns import EmployeeColumns
+from employee_search import TrigramIndex
+
+
+# The third assignment's Employee as it was before __slots__
+class DictEmployee:
+    def __init__(self, id, emp_id, name, joining_date, salary):
+        self.id = id
+        self.emp_id = emp_id
+        self.name = name
+        self.joining_date = joining_date
+        self.salary = salary
+
+
+# Raw rows as they come out of employees.csv; every representation has to
+# build its own field values from them, so those allocations are counted
+def sample_rows(count, seed=1):
+    rng = random.Random(seed)
+    start = date(2000, 1, 1).toordinal()
+    for i in range(1, count + 1):
+        yield (f"E{i:03d}", f"Employee {rng.randrange(10**6)}",
+               date.fromordinal(start + rng.randrange(9000)).strftime("%d/%m/%Y"),
+               str(rng.randrange(1000, 20000)))
+
+
+def parse_date(text):
+    day, month, year = text.split("/")
+    return date(int(year), int(month), int(day))
+
+
+def as_dicts(rows):
+    return [{"emp_id": emp_id, "name": name, "joining_date": joining_date,
+             "salary": float(salary), "department": "Sales"}
+            for emp_id, name, joining_date, salary in rows]
+
+
+def as_dict_objects(rows):
+    return [DictEmployee(int(emp_id[1:]), emp_id, name, parse_date(joining_date), float(salary))
+            for emp_id, name, joining_date, salary in rows]
+
+
+def as_slots_objects(rows):
+    Employee = load_assignment("The third assignment.py").Employee  # imported by main()
+    result = []
+    for emp_id, name, joining_date, salary in rows:
+        obj = Employee.__new__(Employee)
+        obj.id = int(emp_id[1:])
+        obj.emp_id = emp_id
+        obj.name = name
+        obj.joining_date = parse_date(joining_date)
+        obj.salary = float(salary)
+        result.append(obj)
+    return result
+
+
+def as_columns(rows):
+    table = EmployeeColumns()
+    for emp_id, name, joining_date, salary in rows:
+        table.append(emp_id, name, parse_date(joining_date), salary)
+    return table
+
+
+def as_records(rows):
+    """The second assignment's EmployeeRecords (numeric emp_ids)"""
+    EmployeeRecord = load_assignment("The second assignment.py").EmployeeRecord
+    return [EmployeeRecord(emp_id[1:], name, joining_date, float(salary), "Sales")
+            for emp_id, name, joining_date, salary in rows]
+
+
+def as_record_store(rows):
+    """EmployeeRecords in the second assignment's store, with all its indexes"""
+    second = load_assignment("The second assignment.py")
+    second.employees.add_many(as_records(rows))
+    second.search_index.substring("zzz")  # the trigram index is built by the first search
+    return second.employees
+
+
+def as_trigram_index(records):
+    """Only the trigram index over records that already exist"""
+    index = TrigramIndex()
+    index.add_many((record.emp_id, record) for record in records)
+    index.substring("zzz")
+    return index
+
+
+def measure(build, count, prepare=list):
+    """Allocated bytes per employee for one representation.
+
+    Names and emp_id strings are shared with the input rows and so are
+    not counted for any representation. prepare turns the rows into
+    build's input before measuring starts.
+    """
+    rows = prepare(sample_rows(count))
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    data = build(rows)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del data
+    return (after - before) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    # Imported up front: module set-up is not a cost per employee
+    load_assignment("The second assignment.py")
+    load_assignment("The third assignment.py")
+
+    cases = [
+        ("dict per employee (second assignment, before)", as_dicts, list),
+        ("object with __dict__ (third assignment, before)", as_dict_objects, list),
+        ("__slots__ Employee", as_slots_objects, list),
+        ("columnar arrays", as_columns, list),
+        ("EmployeeRecord store, all indexes (second assignment)", as_record_store, list),
+        ("  of which the trigram index", as_trigram_index, as_records),
+    ]
+    print(f"{'Representation':<55} {'Bytes/employee':>15}")
+    print("-" * 71)
+    for label, build, prepare in cases:
+        print(f"{label:<55} {measure(build, args.rows, prepare):>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""Time every operation of both assignments on a synthetic workforce.
+
+    python -m benchmarks.operations --rows 1000 10000 100000 --json results.json
+    python -m benchmarks.operations --rows 10000 --baseline results.json
+
+The second assignment's menu functions are driven with scripted input()
+answers and the third assignment's Employee methods are called directly;
+everything they print is discarded. Each operation is timed --repeat
+times and the best run is kept. --json saves the results and --baseline
+compares this run against a saved one, so a change that makes something
+slower shows up as a ratio above 1.
+"""
+import argparse
+import builtins
+import contextlib
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+from benchmarks import load_assignment
+from benchmarks.workforce import generate, write_employees_csv
+from employee_backends import CsvBackend, SqliteBackend
+
+SECOND = "The second assignment.py"
+THIRD = "The third assignment.py"
+
+
+def fresh(filename):
+    """Import an assignment with empty module state"""
+    name = os.path.splitext(filename)[0].replace(" ", "_").lower()
+    sys.modules.pop(name, None)
+    return load_assignment(filename, name)
+
+
+@contextlib.contextmanager
+def scripted(answers=()):
+    """Feed answers to input() and throw away everything printed"""
+    answers = iter(answers)
+    original = builtins.input
+    builtins.input = lambda prompt="": next(answers)
+    try:
+        with open(os.devnull, mode="w") as devnull, contextlib.redirect_stdout(devnull):
+            yield
+    finally:
+        builtins.input = original
+
+
+class Timer:
+    def __init__(self, suite, rows, repeat):
+        self.suite = suite
+        self.rows = rows
+        self.repeat = repeat
+        self.results = []
+
+    def time(self, operation, function, ops=1, setup=None):
+        """Best of repeat runs of function(), which performs ops operations"""
+        best = None
+        for _ in range(self.repeat):
+            if setup:
+                setup()
+            started = time.perf_counter()
+            function()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        result = {"suite": self.suite, "operation": operation, "rows": self.rows,
+                  "ops": ops, "seconds": best, "per_op": best / ops}
+        self.results.append(result)
+        print(f"{self.suite:<7} {operation:<32} {self.rows:>9} {best / ops * 1e6:>14,.1f} us", flush=True)
+        return result
+
+
+#------------------ The second assignment (dict-style records) ------------------
+
+def bench_second(rows, ops, repeat, seed):
+    module = fresh(SECOND)
+    timer = Timer("second", rows, repeat)
+    rng = random.Random(seed)
+    workforce = list(generate(rows, seed))
+
+    timer.time("load (employees.add_many)", lambda: module.employees.add_many(
+        module.EmployeeRecord(str(number), name, joining, salary, department)
+        for number, name, department, joining, salary in workforce),
+        ops=rows, setup=lambda: module.employees.clear())
+
+    answers = []
+    for i in range(ops):
+        answers += [f"New Hire {i}", "15/03/2024", "5000", "Engineering"]
+
+    def add():
+        with scripted(answers):
+            for _ in range(ops):
+                module.add_employee()
+    timer.time("add_employee", add, ops=ops)
+
+    emp_ids = [str(rng.randint(1, rows)) for _ in range(ops)]
+
+    def search_by_id():
+        with scripted(emp_ids):
+            for _ in range(ops):
+                module.search_employee()
+    timer.time("search_employee (emp_id)", search_by_id, ops=ops)
+
+    names = [f"{rng.choice(('Zainab', 'Omar', 'Wei'))} {rng.choice(('Zaki', 'Nasr'))}" for _ in range(ops)]
+
+    def search_by_name():
+        with scripted(names):
+            for _ in range(ops):
+                module.search_employee()
+    timer.time("search_employee (name)", search_by_name, ops=ops)
+
+    def sort():
+        with scripted(["2", "n", "0"]):
+            module.sort_employees()
+    timer.time("sort_employees (salary)", sort)
+
+    def report():
+        with scripted():
+            module.employee_report()
+    timer.time("employee_report", report, setup=module.reports.clear)
+    timer.time("employee_report (cached)", report)
+
+    def totals():
+        with scripted():
+            module.total_department_salaries()
+    timer.time("total_department_salaries", totals)
+
+    def first_and_last():
+        # choice, how many (default 1), department (default all)
+        with scripted(["1", "", "", "2", "", ""]):
+            module.first_and_last_joined()
+            module.first_and_last_joined()
+    timer.time("first_and_last_joined", first_and_last, ops=2)
+
+    def top_in_department():
+        with scripted(["1", "10", "Engineering"]):
+            module.lowest_and_highest_salary()
+    timer.time("lowest_and_highest (top 10, dept)", top_in_department)
+
+    def filtered():
+        # salary from/to, joined from/to, department, name, limit
+        with scripted(["8000", "", "01/01/2019", "31/12/2021", "Engineering", "", ""]):
+            module.filter_employees()
+    timer.time("filter_employees (range + dept)", filtered)
+    return timer.results
+
+
+#------------------ The third assignment (Employee class) ------------------
+
+def bench_third(rows, ops, repeat, seed, backend):
+    timer = Timer("third", rows, repeat)
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as directory:
+        cwd = os.getcwd()
+        os.chdir(directory)
+        try:
+            write_employees_csv("employees.csv", generate(rows, seed))
+            state = {}
+
+            def new_session():
+                for name in ("employees.db", "employees.db-wal", "employees.db-shm"):
+                    if os.path.exists(name):
+                        os.remove(name)
+                state["Employee"] = Employee = fresh(THIRD).Employee
+                Employee.use_backend(SqliteBackend() if backend == "sqlite" else CsvBackend())
+
+            timer.time("load_from_csv", lambda: state["Employee"].load(), ops=rows, setup=new_session)
+            Employee = state["Employee"]
+
+            timer.time("save_to_csv", lambda: Employee.save_to_csv("export.csv"), ops=rows)
+
+            def create():
+                with scripted():
+                    for i in range(ops):
+                        Employee.create({"name": f"New Hire {i}", "joining_date": "15/03/2024", "salary": 5000})
+            timer.time("create", create, ops=ops)
+
+            def update():
+                with scripted():
+                    for _ in range(ops):
+                        Employee.update(f"E{rng.randint(1, rows):03d}", {"salary": rng.randint(1000, 9000)})
+            timer.time("update", update, ops=ops)
+
+            def delete():
+                with scripted():
+                    for _ in range(ops):
+                        Employee.delete(f"E{rng.randint(1, rows):03d}")
+            timer.time("delete", delete, ops=ops)
+
+            for label, kwargs in (("list", {}),
+                                  ("list (sort_by=salary)", {"sort_by": "salary"}),
+                                  ("list (search=name)", {"search": "zainab zaki"}),
+                                  ("list (where=salary+date)", {"where": Employee.where(
+                                      min_salary=8000, joined_from="01/01/2019", joined_to="31/12/2021")})):
+                def listing(kwargs=kwargs):
+                    with scripted():
+                        Employee.list(**kwargs)
+                timer.time(label, listing)
+            Employee.close()
+        finally:
+            os.chdir(cwd)
+    return timer.results
+
+
+#------------------ Reporting ------------------
+
+def compare(results, baseline_path):
+    with open(baseline_path, mode="r", encoding="utf-8") as file:
+        baseline = {(r["suite"], r["operation"], r["rows"]): r for r in json.load(file)["results"]}
+    print(f"\nAgainst {baseline_path} (ratio > 1 is slower):")
+    for result in results:
+        old = baseline.get((result["suite"], result["operation"], result["rows"]))
+        if old:
+            ratio = result["per_op"] / old["per_op"]
+            flag = "  <-- slower" if ratio > 1.10 else ""
+            print(f"{result['suite']:<7} {result['operation']:<32} {result['rows']:>9} {ratio:>8.2f}x{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="workforce sizes (1k to 10M)")
+    parser.add_argument("--ops", type=int, default=200, help="operations per timing of single-record operations")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--suite", choices=("second", "third", "both"), default="both")
+    parser.add_argument("--backend", choices=("csv", "sqlite"), default="csv", help="third assignment storage")
+    parser.add_argument("--json", metavar="PATH", help="save the results here")
+    parser.add_argument("--baseline", metavar="PATH", help="compare with results saved by --json")
+    args = parser.parse_args()
+
+    print(f"{'Suite':<7} {'Operation':<32} {'Rows':>9} {'Per operation':>17}")
+    print("-" * 68)
+    results = []
+    for rows in args.rows:
+        if args.suite in ("second", "both"):
+            results += bench_second(rows, args.ops, args.repeat, args.seed)
+        if args.suite in ("third", "both"):
+            results += bench_third(rows, args.ops, args.repeat, args.seed, args.backend)
+
+    if args.json:
+        report = {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "backend": args.backend,
+            "results": results,
+        }
+        with open(args.json, mode="w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+    if args.baseline:
+        compare(results, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
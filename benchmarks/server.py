@@ -0,0 +1,159 @@
+"""Load generator for the employee HTTP/JSON API.
+
+    python -m benchmarks.server --clients 50 --seconds 10
+    python -m benchmarks.server --url http://127.0.0.1:8080 --writes 0.5
+
+Without --url it starts `The third assignment.py --serve` on a free port
+in a temporary directory. Each client keeps one connection open and
+sends a mix of reads (a single employee or a page of the list) and
+writes (creates and salary updates). Requests per second and p50/p99
+latency are reported for reads, writes and everything together.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from urllib.parse import urlsplit
+
+from benchmarks import ROOT
+
+
+class Client:
+    """One keep-alive HTTP/1.1 connection"""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = self.writer = None
+
+    async def request(self, method, path, payload=None):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        self.writer.write((f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+                           f"Content-Length: {len(body)}\r\n\r\n").encode("latin-1") + body)
+        await self.writer.drain()
+
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        return status, json.loads(await self.reader.readexactly(length))
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p / 100))]
+
+
+async def run_client(client, rng, deadline, writes, emp_ids, latencies):
+    while time.perf_counter() < deadline:
+        is_write = rng.random() < writes
+        if is_write and rng.random() < 0.5 or not emp_ids:
+            request = ("POST", "/employees", {"name": f"Load {rng.randrange(10**6)}",
+                                             "joining_date": "01/01/2020", "salary": 1000})
+        elif is_write:
+            request = ("PATCH", f"/employees/{rng.choice(emp_ids)}", {"salary": rng.randrange(1000, 9000)})
+        elif rng.random() < 0.8:
+            request = ("GET", f"/employees/{rng.choice(emp_ids)}", None)
+        else:
+            request = ("GET", f"/employees?sort_by=salary&page={rng.randrange(1, 5)}&per_page=20", None)
+
+        started = time.perf_counter()
+        status, result = await client.request(*request)
+        elapsed = time.perf_counter() - started
+        latencies["write" if is_write else "read"].append(elapsed)
+        if status >= 400:
+            latencies["errors"].append(result.get("error"))
+        elif request[0] == "POST":
+            emp_ids.append(result["emp_id"])
+
+
+async def load(host, port, clients, seconds, writes, seed_rows, seed):
+    setup = Client(host, port)
+    emp_ids = []
+    for i in range(seed_rows):
+        _, result = await setup.request("POST", "/employees", {
+            "name": f"Seed {i}", "joining_date": "01/01/2020", "salary": 1000 + i})
+        emp_ids.append(result["emp_id"])
+    setup.close()
+
+    latencies = {"read": [], "write": [], "errors": []}
+    connections = [Client(host, port) for _ in range(clients)]
+    deadline = time.perf_counter() + seconds
+    started = time.perf_counter()
+    await asyncio.gather(*(run_client(client, random.Random(seed + n), deadline, writes, emp_ids, latencies)
+                           for n, client in enumerate(connections)))
+    elapsed = time.perf_counter() - started
+    for client in connections:
+        client.close()
+    return latencies, elapsed
+
+
+def start_server(directory):
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, "The third assignment.py"), "--serve", "127.0.0.1:0"],
+        cwd=directory, stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()
+    match = re.search(r"http://([\d.]+):(\d+)", line)
+    if not match:
+        process.kill()
+        raise RuntimeError(f"The server did not start: {line!r}")
+    return process, match.group(1), int(match.group(2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="an already running server (default: start one)")
+    parser.add_argument("--clients", type=int, default=50, help="concurrent connections")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--writes", type=float, default=0.2, help="share of requests that write")
+    parser.add_argument("--seed-rows", type=int, default=1000, help="employees created before timing")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    process = None
+    with tempfile.TemporaryDirectory() as directory:
+        if args.url:
+            url = urlsplit(args.url)
+            host, port = url.hostname, url.port or 80
+        else:
+            process, host, port = start_server(directory)
+        try:
+            latencies, elapsed = asyncio.run(
+                load(host, port, args.clients, args.seconds, args.writes, args.seed_rows, args.seed))
+        finally:
+            if process:
+                process.terminate()
+                process.wait()
+
+    print(f"{args.clients} clients for {elapsed:.1f}s, {args.writes:.0%} writes")
+    print(f"{'Requests':<10} {'Count':>8} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    print("-" * 47)
+    everything = latencies["read"] + latencies["write"]
+    for label, values in (("reads", latencies["read"]), ("writes", latencies["write"]), ("all", everything)):
+        values = sorted(values)
+        print(f"{label:<10} {len(values):>8} {len(values) / elapsed:>9,.0f} "
+              f"{percentile(values, 50) * 1000:>8.2f} {percentile(values, 99) * 1000:>8.2f}")
+    if latencies["errors"]:
+        print(f"{len(latencies['errors'])} error(s), e.g. {latencies['errors'][0]}")
+
+
+if __name__ == "__main__":
+    main()
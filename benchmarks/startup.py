@@ -0,0 +1,113 @@
+"""Cold start: employees.csv versus the binary snapshot and lazy loading.
+
+    python -m benchmarks.startup --rows 100000 1000000
+
+For each size it times reading the file into columns (the format cost
+alone) and a full Employee.load() in a fresh interpreter, which also
+builds the objects and every index. The lazy rows use LazyCsvBackend:
+"lazy cold" builds the offset index, "lazy" reuses it and only maps the
+files.
+"""
+import argparse
+import csv
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date
+
+from benchmarks import ROOT
+from employee_columns import EmployeeColumns
+from employee_dates import format_date, parse_date
+from employee_offsets import OffsetIndex
+from employee_snapshot import read_snapshot, write_snapshot
+
+LOAD = """
+import sys, time
+sys.path.insert(0, {root!r})
+from benchmarks import load_assignment
+Employee = load_assignment("The third assignment.py").Employee
+{setup}
+started = time.perf_counter()
+Employee.load()
+print(time.perf_counter() - started)
+"""
+
+
+def write_files(directory, count, seed=1):
+    rng = random.Random(seed)
+    start = date(1990, 1, 1).toordinal()
+    table = EmployeeColumns()
+    for i in range(1, count + 1):
+        table.append(f"E{i:03d}", f"Employee {rng.randrange(10**6)}",
+                     start + rng.randrange(12000), float(rng.randrange(1000, 20000)))
+
+    with open(os.path.join(directory, "employees.csv"), mode="w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        for key, name, ordinal, salary in zip(table.ids, table.names, table.joining, table.salaries):
+            writer.writerow([table.format_id(key), name, format_date(ordinal), salary])
+    write_snapshot(os.path.join(directory, "employees.snap"), table)
+
+
+def read_csv_columns(path):
+    table = EmployeeColumns()
+    with open(path, mode="r", newline="", encoding="utf-8") as file:
+        for emp_id, name, joining_date, salary in csv.reader(file):
+            table.append(emp_id, name, parse_date(joining_date), salary)
+    return table
+
+
+def timed(function, *args):
+    started = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - started
+
+
+def open_index(path):
+    OffsetIndex(path, os.path.join(os.path.dirname(path), "employees.idx")).close()
+
+
+def full_load(directory, use_snapshot, lazy=False):
+    """Seconds for Employee.load() in a fresh interpreter"""
+    setup = ("from employee_backends import LazyCsvBackend\n"
+             "Employee.use_backend(LazyCsvBackend())") if lazy else ""
+    if not use_snapshot:
+        os.rename(os.path.join(directory, "employees.snap"), os.path.join(directory, "hidden.snap"))
+    try:
+        output = subprocess.run([sys.executable, "-c", LOAD.format(root=ROOT, setup=setup)], cwd=directory,
+                                capture_output=True, text=True, check=True).stdout
+    finally:
+        if not use_snapshot:
+            os.rename(os.path.join(directory, "hidden.snap"), os.path.join(directory, "employees.snap"))
+    return float(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100000, 1000000])
+    parser.add_argument("--skip-full", action="store_true", help="only time the file formats")
+    args = parser.parse_args()
+
+    print(f"{'Rows':>9} {'Format':<10} {'Size MB':>8} {'Read s':>8} {'Load s':>8}")
+    print("-" * 47)
+    for count in args.rows:
+        with tempfile.TemporaryDirectory() as directory:
+            write_files(directory, count)
+            for label, filename, reader, use_snapshot, lazy in (
+                    ("csv", "employees.csv", read_csv_columns, False, False),
+                    ("snapshot", "employees.snap", read_snapshot, True, False),
+                    ("lazy cold", "employees.csv", open_index, False, True),
+                    ("lazy", "employees.csv", open_index, False, True)):
+                path = os.path.join(directory, filename)
+                size = os.path.getsize(path) / 1e6
+                read = timed(reader, path)
+                if label == "lazy cold" and not args.skip_full:
+                    os.remove(os.path.join(directory, "employees.idx"))  # built again by the load
+                load = "-" if args.skip_full else f"{full_load(directory, use_snapshot, lazy):.2f}"
+                print(f"{count:>9} {label:<10} {size:>8.1f} {read:>8.2f} {load:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Seeded synthetic workforce for the benchmarks.
+
+    python -m benchmarks.workforce --rows 100000 --out employees.csv
+
+The same seed always gives the same employees, so timings from two runs
+(or two machines) are measured on identical data. Rows are generated
+lazily, which keeps 10M-row files within memory.
+"""
+import argparse
+import csv
+import random
+from datetime import date
+
+import benchmarks  # noqa: F401  (puts the repository root on sys.path)
+from employee_dates import format_date
+
+FIRST_NAMES = (
+    "Abdullah", "Ahmed", "Ali", "Amina", "Fatima", "Hassan", "Huda", "Ibrahim", "Khalid", "Layla",
+    "Mariam", "Mohammed", "Mona", "Nasser", "Noor", "Omar", "Reem", "Saeed", "Salem", "Sara",
+    "Tariq", "Yasmin", "Youssef", "Zainab", "John", "Maria", "Wei", "Priya", "Carlos", "Anna",
+)
+LAST_NAMES = (
+    "Ammar", "Al-Harbi", "Bakr", "Farouk", "Haddad", "Hamdan", "Jaber", "Karim", "Mansour", "Nasr",
+    "Qasim", "Rashid", "Saleh", "Shami", "Taha", "Yousef", "Zaki", "Smith", "Garcia", "Chen",
+)
+# (department, share of the workforce, median salary)
+DEPARTMENTS = (
+    ("Engineering", 30, 9000), ("Sales", 20, 6000), ("Support", 15, 4500), ("Finance", 10, 8000),
+    ("HR", 8, 5500), ("Marketing", 10, 6500), ("Operations", 7, 5000),
+)
+FIRST_DAY = date(1990, 1, 1).toordinal()
+LAST_DAY = date(2025, 12, 31).toordinal()
+
+
+def generate(count, seed=1):
+    """Yield (number, name, department, joining dd/mm/yyyy, salary) rows"""
+    rng = random.Random(seed)
+    names = [d[0] for d in DEPARTMENTS]
+    weights = [d[1] for d in DEPARTMENTS]
+    medians = {d[0]: d[2] for d in DEPARTMENTS}
+    for number in range(1, count + 1):
+        department = rng.choices(names, weights)[0]
+        salary = round(medians[department] * rng.lognormvariate(0, 0.35), 2)
+        yield (number,
+               f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+               department,
+               format_date(rng.randint(FIRST_DAY, LAST_DAY)),
+               salary)
+
+
+def write_employees_csv(path, rows):
+    """Write rows in the third assignment's employees.csv format"""
+    with open(path, mode="w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        for number, name, _, joining_date, salary in rows:
+            writer.writerow([f"E{number:03d}", name, joining_date, salary])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", default="employees.csv")
+    args = parser.parse_args()
+    write_employees_csv(args.out, generate(args.rows, args.seed))
+    print(f"Wrote {args.rows} employees to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+"""Salary and department reports over an EmployeeColumns table.
+
+The reports are vectorized with NumPy when it is installed; otherwise the
+same numbers are computed in pure Python. DepartmentAggregates keeps the
+per-department totals and extremes current as the store changes, so a
+dashboard reads them without touching the rows.
+"""
+import math
+from heapq import heapify, heappop, heappush, nlargest, nsmallest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _department_codes(table):
+    """Factorize the department column into (names, codes)"""
+    if table.categories is not None:
+        # Already dictionary-encoded; names of departments nobody is in
+        # any more have an empty group and are left out of the reports
+        return list(table.categories.names), table.departments
+    lookup = {}
+    codes = [lookup.setdefault(department, len(lookup)) for department in table.departments]
+    return list(lookup), codes
+
+
+def _percentile(values, p):
+    """Linear-interpolated percentile of sorted values (NumPy's default method)"""
+    k = (len(values) - 1) * p / 100
+    low = math.floor(k)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (k - low)
+
+
+#------------------ Department summary ------------------
+
+def department_summary(table, percentiles=(25, 75)):
+    """Count, total, mean, median and salary percentiles per department.
+
+    Returns one dict per department, in the order departments first appear.
+    """
+    names, codes = _department_codes(table)
+    if not names or not len(codes):
+        return []
+    if np is None:
+        return _department_summary_python(table, names, codes, percentiles)
+
+    codes = np.fromiter(codes, dtype=np.int32, count=len(codes))
+    salaries = np.array(table.salaries, dtype=np.float64)
+    counts = np.bincount(codes, minlength=len(names))
+    totals = np.bincount(codes, weights=salaries, minlength=len(names))
+
+    # Group rows by department so every group is a contiguous slice
+    grouped = salaries[np.argsort(codes, kind="stable")]
+    bounds = np.concatenate(([0], np.cumsum(counts)))
+
+    summary = []
+    for code, name in enumerate(names):
+        if not counts[code]:
+            continue
+        group = grouped[bounds[code]:bounds[code + 1]]
+        row = {
+            "department": name,
+            "count": int(counts[code]),
+            "total": float(totals[code]),
+            "mean": float(totals[code] / counts[code]),
+            "median": float(np.median(group)),
+        }
+        for p in percentiles:
+            row[f"p{p}"] = float(np.percentile(group, p))
+        summary.append(row)
+    return summary
+
+
+def _department_summary_python(table, names, codes, percentiles):
+    groups = [[] for _ in names]
+    for code, salary in zip(codes, table.salaries):
+        groups[code].append(salary)
+
+    summary = []
+    for name, group in zip(names, groups):
+        if not group:
+            continue
+        group.sort()
+        total = math.fsum(group)
+        row = {
+            "department": name,
+            "count": len(group),
+            "total": total,
+            "mean": total / len(group),
+            "median": _percentile(group, 50),
+        }
+        for p in percentiles:
+            row[f"p{p}"] = _percentile(group, p)
+        summary.append(row)
+    return summary
+
+
+#------------------ Salary histogram ------------------
+
+def salary_histogram(table, bins=10):
+    """Return (counts, edges) for equal-width salary bins"""
+    if not len(table):
+        return [], []
+    if np is not None:
+        counts, edges = np.histogram(np.array(table.salaries, dtype=np.float64), bins=bins)
+        return counts.tolist(), edges.tolist()
+
+    low, high = min(table.salaries), max(table.salaries)
+    if low == high:
+        low, high = low - 0.5, high + 0.5
+    width = (high - low) / bins
+    edges = [low + width * i for i in range(bins)] + [high]
+    counts = [0] * bins
+    for salary in table.salaries:
+        # The last bin is closed on the right, like NumPy's
+        counts[min(int((salary - low) / width), bins - 1)] += 1
+    return counts, edges
+
+
+#------------------ Extremes ------------------
+
+def extreme(table, by="salary", highest=True):
+    """emp_id of the employee with the highest/lowest salary or joining date"""
+    if not len(table):
+        return None
+    column = table.salaries if by == "salary" else table.joining
+
+    if np is not None:
+        values = np.array(column)
+        row = int(values.argmax() if highest else values.argmin())
+    else:
+        pick = max if highest else min
+        row = pick(range(len(column)), key=column.__getitem__)
+    return table.format_id(table.ids[row])
+
+
+def top_k(table, k, by="salary", highest=True, department=None):
+    """emp_ids of the k highest/lowest salaries or joining dates, best first.
+
+    Selects instead of sorting every row: heap selection in O(n log k),
+    or argpartition in O(n) with NumPy. department limits the query to
+    one department.
+    """
+    if k <= 0 or not len(table):
+        return []
+    column = table.salaries if by == "salary" else table.joining
+    if department is None:
+        rows = range(len(column))
+    elif table.categories is not None:
+        code = table.categories.lookup(department)
+        if code is None:
+            return []
+        if np is not None:
+            rows = np.flatnonzero(np.frombuffer(table.departments, dtype=np.int32) == code).tolist()
+        else:
+            rows = [row for row, value in enumerate(table.departments) if value == code]
+    else:
+        rows = [row for row, name in enumerate(table.departments) if name == department]
+
+    if np is not None and rows:
+        rows = np.arange(len(column)) if department is None else np.array(rows)
+        values = np.array(column, dtype=np.float64)[rows]
+        if highest:
+            values = -values
+        if k < len(values):
+            chosen = np.argpartition(values, k - 1)[:k]
+            chosen = chosen[np.argsort(values[chosen], kind="stable")]
+        else:
+            chosen = np.argsort(values, kind="stable")
+        chosen = rows[chosen].tolist()
+    else:
+        pick = nlargest if highest else nsmallest
+        chosen = pick(k, rows, key=column.__getitem__)
+    return [table.format_id(table.ids[row]) for row in chosen]
+
+
+#------------------ Materialized department aggregates ------------------
+
+class _Extremes:
+    """Lowest and highest (value, emp_id) of a changing set, O(log n) per change.
+
+    Removed entries stay in the heaps until they reach the top (lazy
+    deletion); both heaps are rebuilt when dead entries outnumber live ones.
+    """
+
+    __slots__ = ("_low", "_high", "_dead_low", "_dead_high", "_size")
+
+    def __init__(self):
+        self._low, self._high = [], []
+        self._dead_low, self._dead_high = {}, {}
+        self._size = 0
+
+    def add(self, value, emp_id):
+        heappush(self._low, (value, emp_id))
+        heappush(self._high, (-value, emp_id))
+        self._size += 1
+
+    def discard(self, value, emp_id):
+        for dead, key in ((self._dead_low, (value, emp_id)), (self._dead_high, (-value, emp_id))):
+            dead[key] = dead.get(key, 0) + 1
+        self._size -= 1
+        if len(self._low) > 2 * self._size + 32:
+            self._rebuild()
+
+    @staticmethod
+    def _top(heap, dead):
+        while heap and heap[0] in dead:
+            key = heappop(heap)
+            dead[key] -= 1
+            if not dead[key]:
+                del dead[key]
+        return heap[0] if heap else None
+
+    def low(self):
+        return self._top(self._low, self._dead_low)
+
+    def high(self):
+        top = self._top(self._high, self._dead_high)
+        return None if top is None else (-top[0], top[1])
+
+    def _rebuild(self):
+        for heap, dead in ((self._low, self._dead_low), (self._high, self._dead_high)):
+            live = []
+            for key in heap:
+                if dead.get(key):
+                    dead[key] -= 1
+                else:
+                    live.append(key)
+            heapify(live)
+            heap[:] = live
+            dead.clear()
+
+
+class _Department:
+    __slots__ = ("count", "total", "salaries", "joined")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.salaries = _Extremes()
+        self.joined = _Extremes()
+
+
+class DepartmentAggregates:
+    """Count, salary total, lowest/highest salary and first/last joiner per
+    department, kept current by an EmployeeStore.
+
+    Register it with EmployeeStore.add_index(). Every add, delete and
+    update (a salary change or a move to another department is a discard
+    followed by an add) costs O(log n), and reading the aggregates costs
+    O(number of departments). date_field must hold day ordinals.
+
+    With categories, departments are grouped on the records' codes
+    (department_field) and named through the table when read, so a
+    renamed department shows its new name straight away.
+    """
+
+    def __init__(self, getter=getattr, date_field="joining_date", department_field="department",
+                 categories=None):
+        self.getter = getter
+        self.date_field = date_field
+        self.department_field = department_field
+        self.categories = categories
+        self._departments = {}
+
+    def add(self, emp_id, record):
+        name = self.getter(record, self.department_field)
+        department = self._departments.get(name)
+        if department is None:
+            department = self._departments[name] = _Department()
+        salary = self.getter(record, "salary")
+        department.count += 1
+        department.total += salary
+        department.salaries.add(salary, emp_id)
+        department.joined.add(self.getter(record, self.date_field), emp_id)
+
+    def discard(self, emp_id, record):
+        name = self.getter(record, self.department_field)
+        department = self._departments[name]
+        if department.count == 1:
+            # Dropping the department also drops any rounding left in its total
+            del self._departments[name]
+            return
+        salary = self.getter(record, "salary")
+        department.count -= 1
+        department.total -= salary
+        department.salaries.discard(salary, emp_id)
+        department.joined.discard(self.getter(record, self.date_field), emp_id)
+
+    def __len__(self):
+        return len(self._departments)
+
+    def summary(self):
+        """One dict per department, in the order departments first appeared.
+
+        Salary extremes are (salary, emp_id) and joiners (day ordinal, emp_id).
+        """
+        names = self.categories.names if self.categories is not None else None
+        return [{
+            "department": name if names is None else names[name],
+            "count": department.count,
+            "total": department.total,
+            "mean": department.total / department.count,
+            "lowest_salary": department.salaries.low(),
+            "highest_salary": department.salaries.high(),
+            "first_joined": department.joined.low(),
+            "last_joined": department.joined.high(),
+        } for name, department in self._departments.items()]
+
+    def extreme(self, by="salary", highest=True):
+        """emp_id of the employee with the highest/lowest salary or joining date"""
+        candidates = []
+        for department in self._departments.values():
+            extremes = department.salaries if by == "salary" else department.joined
+            candidates.append(extremes.high() if highest else extremes.low())
+        if not candidates:
+            return None
+        return (max(candidates) if highest else min(candidates))[1]
@@ -0,0 +1,1098 @@
+"""Storage backends for the Employee class.
+
+A backend owns the employees and their persistence. Employee objects are
+built by the factory the Employee class binds (see Employee.use_backend),
+so backends never import the Employee class itself.
+
+    CsvBackend     everything in memory, journal + binary snapshot on disk,
+                   employees.csv as the export (the original behavior)
+    LazyCsvBackend the same files, but employees.csv is memory-mapped and
+                   employees are read from it one at a time when needed
+    SqliteBackend  rows live in an SQLite database; only the rows a
+                   command touches are turned into Employee objects
+"""
+import csv
+import heapq
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import date
+from operator import attrgetter
+
+from employee_changelog import Changelog
+from employee_columns import EmployeeColumns
+from employee_compression import is_compressed, open_text, write_text
+from employee_dates import format_date, to_date
+from employee_ids import EMP_IDS
+from employee_ingest import load_employee_csv
+from employee_journal import Journal
+from employee_locks import ConflictError, FileLock, RWLock
+from employee_metrics import instrument, metrics
+from employee_offsets import OffsetIndex
+from employee_search import START, TrigramIndex, matcher, split_term, value_trigrams
+from employee_snapshot import SnapshotView, read_snapshot, write_snapshot
+from employee_store import EmployeeStore
+
+SORT_FIELDS = ("emp_id", "name", "joining_date", "salary")
+
+
+def sort_column(field):
+    """The attribute (and SQL column) a sort field is ordered by.
+
+    emp_ids are ordered by their number, so E1000 comes after E999.
+    """
+    return "id" if field == "emp_id" else field
+
+
+def check_query(where, sort_by):
+    """Reject sort and filter fields the backends have no index for"""
+    if sort_by is not None and sort_by not in SORT_FIELDS:
+        raise ValueError(f"Cannot sort by {sort_by!r}")
+    if where is not None:
+        unknown = where.fields() - set(SORT_FIELDS)
+        if unknown:
+            raise ValueError(f"Cannot filter on {', '.join(sorted(unknown))}")
+
+
+#------------------ CSV helpers ------------------
+
+def read_employee_csv(path):
+    """Yield (emp_id, name, joining_date, salary) rows of an employees.csv file (or .gz, .bz2, .xz)"""
+    with open_text(path) as file:
+        for row in csv.reader(file):
+            if len(row) == 4:
+                yield row
+
+
+def write_employee_csv(path, employees, keep=()):
+    """Write employees to an employees.csv file atomically; return the row count.
+
+    keep holds raw rows (bytes) that could not be read, written back
+    unchanged after the employees. A path ending in .gz, .bz2 or .xz is
+    compressed as it is written.
+    """
+    count = 0
+    # surrogateescape: a kept row that is not valid UTF-8 keeps its bytes
+    with write_text(path, errors="surrogateescape") as file:
+        writer = csv.writer(file)
+        for emp in employees:
+            writer.writerow([
+                emp.emp_id,
+                emp.name,
+                format_date(emp.joining_date.toordinal()),
+                emp.salary
+            ])
+            count += 1
+        for raw in keep:
+            file.write(raw.decode("utf-8", "surrogateescape"))
+            if not raw.endswith(b"\n"):
+                file.write("\n")
+    metrics.add_rows(count)
+    return count
+
+
+def journal_fields(emp):
+    return {
+        "emp_id": emp.emp_id,
+        "name": emp.name,
+        "joining_date": format_date(emp.joining_date.toordinal()),
+        "salary": emp.salary
+    }
+
+
+def convert(data):
+    """Turn raw field values into the types stored on an Employee"""
+    changes = {}
+    for key, value in data.items():
+        if key == "joining_date" and not isinstance(value, date):
+            value = to_date(value)
+        elif key == "salary":
+            value = float(value)
+        changes[key] = value
+    return changes
+
+
+#------------------ Backend interface ------------------
+
+class StorageBackend:
+    """Operations the Employee class needs from its storage.
+
+    factory(id, emp_id, name, joining_date, salary) builds an Employee and
+    is set by Employee.use_backend().
+    """
+
+    factory = None
+    load_errors = ()  # (line, message) of employees.csv rows load() could not read
+
+    def load(self):
+        """Open the storage; return False if it is new and employees.csv is still to be imported"""
+        raise NotImplementedError
+
+    def next_id(self):
+        """Smallest numeric id above every employee ever stored (deleted ones too)"""
+        raise NotImplementedError
+
+    def add(self, emp):
+        raise NotImplementedError
+
+    def add_many(self, emps):
+        raise NotImplementedError
+
+    def update(self, emp_id, changes):
+        """Apply typed field changes; return the employee or None"""
+        raise NotImplementedError
+
+    def update_many(self, changes):
+        """{emp_id: changes} in one write; return the updated employees"""
+        raise NotImplementedError
+
+    def remove(self, emp_id):
+        """Delete an employee; return it or None"""
+        raise NotImplementedError
+
+    def remove_many(self, emp_ids):
+        """Delete in one write; return the employees that existed"""
+        raise NotImplementedError
+
+    def find(self, emp_id):
+        raise NotImplementedError
+
+    def find_by_name(self, name):
+        raise NotImplementedError
+
+    def search(self, term):
+        """Employees whose emp_id or name contains term (case-insensitive).
+
+        A term ending in * ("jo*") matches a word starting with the rest instead.
+        """
+        raise NotImplementedError
+
+    def suggest(self, term, limit=5):
+        """Closest matches for a misspelled name or emp_id, best first"""
+        raise NotImplementedError
+
+    def changes_since(self, seq=0, limit=None):
+        """Iterate the change events after seq, oldest first (see employee_changelog)"""
+        raise NotImplementedError
+
+    def version(self):
+        """A value that changes whenever the employees do, in any process; for caches"""
+        raise NotImplementedError
+
+    def query(self, search=None, sort_by=None, descending=False, where=None):
+        """Iterate employees, optionally filtered and sorted.
+
+        where is an employee_query.Query over SORT_FIELDS, with
+        joining_date bounds given as dates.
+        """
+        raise NotImplementedError
+
+    def close(self):
+        raise NotImplementedError
+
+
+#------------------ In-memory store + journal + snapshot ------------------
+
+class CsvBackend(StorageBackend):
+    """All employees in memory; changes go to an append-only journal.
+
+    The journal is folded into a binary snapshot every compact_threshold
+    records, and employees.csv is rewritten once when the session closes.
+    An employees.csv modified after that (edited by hand or restored) is
+    newer than the snapshot and is loaded instead, as LazyCsvBackend does.
+    Every change is also published in the changelog (employee_changelog),
+    which compaction leaves alone.
+
+    Threads share the store through a readers-writer lock. Processes share
+    the files through an fcntl lock on lock_path, whose generation number
+    goes up on every change. A stale copy catches up by replaying only the
+    journal records appended since it last looked (everything is reloaded
+    only after a compaction); a change to an employee that one of those
+    records changed raises ConflictError, so a retry sees the other change.
+    """
+
+    def __init__(self, csv_path="employees.csv", snapshot_path="employees.snap",
+                 journal_path="employees.journal", lock_path="employees.lock",
+                 compact_threshold=1000, changelog_path="employees.changes"):
+        self.csv_path = csv_path
+        self.snapshot_path = snapshot_path
+        self.journal = Journal(journal_path)
+        self.changelog = Changelog(changelog_path)
+        self.compact_threshold = compact_threshold
+        self.lock = RWLock()
+        self.file_lock = FileLock(lock_path)
+        self.generation = None  # generation of the files this copy was read from
+        self._journal_end = 0   # journal size when this copy last caught up
+        self._snapshot_stamp = None
+        self._new_store()
+
+    def _new_store(self):
+        self.employees = EmployeeStore(sorted_fields=[sort_column(field) for field in SORT_FIELDS])
+        self.trigrams = self.employees.add_index(TrigramIndex())
+        self._next_id = 1  # id high-water mark, kept in the snapshot
+
+    def _restore(self, emp_id, name, joining_date, salary):
+        """Rebuild a saved employee, keeping its original ID.
+
+        A hand-edited emp_id such as e7 or E0007 is stored as E007.
+        """
+        number = EMP_IDS.parse(emp_id)
+        self._next_id = max(self._next_id, number + 1)
+        return self.factory(number, EMP_IDS.format(number), name, to_date(joining_date), float(salary))
+
+    # ------------------ Loading ------------------
+
+    def load(self):
+        """Load the binary snapshot (or employees.csv), then replay the journal"""
+        with self.lock.write(), self.file_lock.shared() as generation:
+            self._read_files()
+            self._mark(generation)
+        self.journal.open()
+        # employees.csv is one of these files and was read above, its bad
+        # rows in load_errors: nothing is left for a first-use import
+        return True
+
+    def __len__(self):
+        with self.lock.read():
+            return len(self.employees)
+
+    def _read_files(self):
+        self.load_errors = []
+        if os.path.exists(self.snapshot_path) and not self._csv_is_newer():
+            self.load_snapshot()
+        elif os.path.exists(self.csv_path):
+            if os.path.exists(self.snapshot_path):
+                # employees.csv was edited or restored after the snapshot:
+                # it wins, but ids the snapshot had handed out stay used
+                with SnapshotView(self.snapshot_path) as view:
+                    self._next_id = view.next_id
+            # Parsed in parallel for large files, see employee_ingest
+            table, self.load_errors = load_employee_csv(self.csv_path)
+            self._add_table(table)
+        self._replay(self.journal.replay())
+        metrics.add_rows(len(self.employees))
+
+    def _replay(self, records):
+        for record in records:
+            op = record.pop("op")
+            emp_id = record.pop("emp_id")
+            # Replay is idempotent: a crash between writing a snapshot and
+            # resetting the journal replays records the snapshot already has
+            if op == "create":
+                self.employees.remove(emp_id)
+                self.employees.add(self._restore(emp_id, **record))
+            elif op == "update":
+                self.employees.update(emp_id, convert(record))
+            elif op == "delete":
+                self.employees.remove(emp_id)
+
+    def _csv_is_newer(self):
+        """Whether employees.csv changed after the snapshot was written"""
+        if not os.path.exists(self.csv_path):
+            return False
+        return os.stat(self.csv_path).st_mtime_ns > os.stat(self.snapshot_path).st_mtime_ns
+
+    def _same_time_as_csv(self):
+        """Give the snapshot the CSV's mtime once both hold the same employees.
+
+        Both backends then read whichever file they prefer; a CSV modified
+        after this is newer and is read instead of the snapshot.
+        """
+        stat = os.stat(self.csv_path)
+        os.utime(self.snapshot_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    def _snapshot_time(self):
+        """Identifies the snapshot file: it is replaced on every compaction"""
+        try:
+            stat = os.stat(self.snapshot_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _mark(self, generation):
+        """Remember which generation, snapshot and journal length this copy holds"""
+        self.generation = generation
+        self._journal_end = self.journal.size()
+        self._snapshot_stamp = self._snapshot_time()
+
+    def _reload(self, generation):
+        self._new_store()
+        self._read_files()
+        self._mark(generation)
+
+    def _catch_up(self, generation):
+        """Apply another process's changes: the journal tail, or everything after a compaction"""
+        if self._snapshot_time() == self._snapshot_stamp and self.journal.size() >= self._journal_end:
+            self._replay(self.journal.replay(self._journal_end))
+            self._mark(generation)
+        else:
+            self._reload(generation)
+
+    def refresh(self):
+        """Catch up if another process has changed the files since we read them"""
+        with self.file_lock.shared() as generation:
+            if generation == self.generation:
+                return
+        with self.lock.write(), self.file_lock.shared() as generation:
+            if generation != self.generation:
+                self._catch_up(generation)
+
+    def load_snapshot(self):
+        self._add_table(read_snapshot(self.snapshot_path))
+
+    def _add_table(self, table):
+        """Add the rows of an EmployeeColumns table as Employee objects"""
+        dates = {}
+        employees = []
+        for key, name, ordinal, salary in zip(table.ids, table.names, table.joining, table.salaries):
+            if ordinal not in dates:
+                dates[ordinal] = date.fromordinal(ordinal)
+            employees.append(self.factory(key, table.format_id(key), name, dates[ordinal], salary))
+        self.employees.add_many(employees)
+        self._next_id = max(self._next_id, table.next_id)
+
+    def next_id(self):
+        with self.lock.read():
+            return self._next_id
+
+    # ------------------ Journal ------------------
+
+    def _get(self, emp_id):
+        return self.employees.find(emp_id)
+
+    @contextmanager
+    def _writing(self, emp_ids=()):
+        """Hold both locks for one change to emp_ids and publish it as a new generation"""
+        with self.lock.write(), self.file_lock.exclusive() as generation:
+            if generation != self.generation:
+                before = {}
+                for emp_id in emp_ids:
+                    emp = self._get(emp_id)
+                    before[emp_id] = emp and journal_fields(emp)
+                self._catch_up(generation)
+                for emp_id, fields in before.items():
+                    emp = self._get(emp_id)
+                    if (emp and journal_fields(emp)) != fields:
+                        raise ConflictError(f"Employee {emp_id} was changed by another operator. "
+                                            "The latest data has been loaded, please try again.")
+            self.changelog.begin()
+            yield
+            # Other processes read the journal, so it must not sit in our buffer
+            self.journal.flush()
+            self.changelog.flush()
+            self._mark(self.file_lock.bump(generation))
+
+    def _log(self, op, before, after):
+        """Journal one change and publish it; before/after are journal_fields or None"""
+        self.changelog.append_change(op, before, after)
+        self.journal.append(op, **(after or {"emp_id": before["emp_id"]}))
+        self._maybe_compact()
+
+    def _log_many(self, op, changes):
+        """The same for [(before, after)] in one write"""
+        self.changelog.append_changes(op, changes)
+        self.journal.append_many(op, [dict(after or {"emp_id": before["emp_id"]}) for before, after in changes])
+        self._maybe_compact()
+
+    def changes_since(self, seq=0, limit=None):
+        return self.changelog.since(seq, limit)
+
+    def version(self):
+        self.refresh()
+        return self.generation
+
+    def _maybe_compact(self):
+        if self.journal.records >= self.compact_threshold:
+            self.compact()
+
+    @instrument("compact")
+    def compact(self):
+        """Fold the journal into a fresh binary snapshot and empty it"""
+        self.journal.commit()
+        table = EmployeeColumns.from_records(self.employees)
+        table.next_id = max(table.next_id, self._next_id)
+        write_snapshot(self.snapshot_path, table)
+        self.journal.reset()
+
+    def close(self):
+        """Refresh the CSV export and the snapshot at the end of a session"""
+        with self.lock.write(), self.file_lock.exclusive() as generation:
+            if generation != self.generation:
+                # Export what is on disk, not our stale copy of it
+                self._catch_up(generation)
+            self.compact()
+            write_employee_csv(self.csv_path, self.employees)
+            self._same_time_as_csv()
+            self.journal.close()
+            self.changelog.close()
+            self.generation = self.file_lock.bump(generation)
+        self.file_lock.close()
+
+    # ------------------ Changes ------------------
+
+    def add(self, emp):
+        with self._writing([emp.emp_id]):
+            self.employees.add(emp)
+            self._next_id = max(self._next_id, emp.id + 1)
+            self._log("create", None, journal_fields(emp))
+
+    def add_many(self, emps):
+        with self._writing([emp.emp_id for emp in emps]):
+            self.employees.add_many(emps)
+            self._next_id = max([self._next_id] + [emp.id + 1 for emp in emps])
+            self._log_many("create", [(None, journal_fields(emp)) for emp in emps])
+
+    def update(self, emp_id, changes):
+        with self._writing([emp_id]):
+            emp = self.employees.find(emp_id)
+            if emp is not None:
+                before = journal_fields(emp)
+                self.employees.update(emp_id, changes)
+                self._log("update", before, journal_fields(emp))
+        return emp
+
+    def update_many(self, changes):
+        with self._writing(changes):
+            updated, logged = [], []
+            for emp_id, fields in changes.items():
+                emp = self.employees.find(emp_id)
+                if emp is not None:
+                    before = journal_fields(emp)
+                    self.employees.update(emp_id, fields)
+                    updated.append(emp)
+                    logged.append((before, journal_fields(emp)))
+            self._log_many("update", logged)
+        return updated
+
+    def remove(self, emp_id):
+        with self._writing([emp_id]):
+            emp = self.employees.remove(emp_id)
+            if emp is not None:
+                self._log("delete", journal_fields(emp), None)
+        return emp
+
+    def remove_many(self, emp_ids):
+        emp_ids = list(emp_ids)
+        with self._writing(emp_ids):
+            removed = [emp for emp in map(self.employees.remove, emp_ids) if emp is not None]
+            self._log_many("delete", [(journal_fields(emp), None) for emp in removed])
+        return removed
+
+    # ------------------ Lookups ------------------
+
+    def find(self, emp_id):
+        with self.lock.read():
+            return self.employees.find(emp_id)
+
+    def find_by_name(self, name):
+        with self.lock.read():
+            return self.employees.find_by_name(name)
+
+    def search(self, term):
+        with self.lock.read():
+            return [self.employees.find(emp_id) for emp_id in self.trigrams.search(term)]
+
+    def suggest(self, term, limit=5):
+        with self.lock.read():
+            return [self.employees.find(emp_id) for emp_id, _ in self.trigrams.fuzzy(term, limit)]
+
+    def query(self, search=None, sort_by=None, descending=False, where=None):
+        check_query(where, sort_by)
+        sort_by = sort_by and sort_column(sort_by)
+        self.refresh()
+        if search:
+            result = self.search(search)
+            result.sort(key=lambda e: getattr(e, sort_by or "id"), reverse=descending)
+            return result if where is None else list(where.apply(result))
+        if where is not None:
+            # Streamed from the narrowest index, taking the read lock per batch
+            if sort_by:
+                where = where.order_by(sort_by, descending)
+            return where.run(self.employees, self.lock.read)
+        # Copied under the lock so no writer changes the store mid-iteration
+        with self.lock.read():
+            if sort_by:
+                # Walk the sorted index; storage order is never changed
+                return list(self.employees.sorted_by(sort_by, reverse=descending))
+            return list(self.employees)
+
+
+#------------------ Lazy, memory-mapped employees.csv ------------------
+
+class LazyCsvBackend(CsvBackend):
+    """employees.csv memory-mapped, employees read from it on demand.
+
+    Startup opens the sidecar offset index (see employee_offsets; it is
+    built on the first run and whenever the CSV changes) and replays the
+    journal, so it takes about the same time for any size of file.
+    find() decodes one line and keeps the employee in an LRU cache of
+    cache_size employees; employees changed since the CSV was written
+    are held in an overlay. Listings, searches and name lookups stream
+    every row without keeping them.
+
+    The files are the CsvBackend's: compaction and close() merge the
+    overlay into a new employees.csv and snapshot, and the journal and
+    locks work the same, so both backends can share a data set. A
+    compressed employees.csv cannot be memory-mapped; use CsvBackend.
+    """
+
+    def __init__(self, csv_path="employees.csv", snapshot_path="employees.snap",
+                 journal_path="employees.journal", lock_path="employees.lock",
+                 index_path="employees.idx", compact_threshold=1000, cache_size=4096,
+                 changelog_path="employees.changes"):
+        if is_compressed(csv_path):
+            raise ValueError(f"{csv_path} is compressed and cannot be memory-mapped")
+        self.index_path = index_path
+        self.cache_size = cache_size
+        self.base = None  # OffsetIndex of the current employees.csv
+        self._cache_lock = threading.Lock()  # readers share the LRU order
+        super().__init__(csv_path, snapshot_path, journal_path, lock_path, compact_threshold, changelog_path)
+
+    def _new_store(self):
+        self._overlay = {}           # emp_id -> employee changed since the CSV was written, None if deleted
+        self._cache = OrderedDict()  # emp_id -> employee read from the CSV, least recently used first
+        self._next_id = 1
+
+    def _hydrate(self, number, name, joining_date, salary):
+        return self.factory(number, EMP_IDS.format(number), name, to_date(joining_date), salary)
+
+    def _get(self, emp_id):
+        """The current employee with this emp_id, or None"""
+        if emp_id in self._overlay:
+            return self._overlay[emp_id]
+        with self._cache_lock:
+            emp = self._cache.get(emp_id)
+            if emp is not None:
+                self._cache.move_to_end(emp_id)
+                return emp
+        try:
+            number = EMP_IDS.parse(emp_id)
+        except ValueError:
+            return None
+        if EMP_IDS.format(number) != emp_id:
+            return None  # like the other backends, only the stored form is found
+        row = self.base.find(number)
+        if row is None:
+            return None
+        emp = self._hydrate(*row)
+        with self._cache_lock:
+            self._cache[emp_id] = emp
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return emp
+
+    def _pin(self, emp_id, emp):
+        """Record a change in the overlay; the cached copy is not needed any more"""
+        self._overlay[emp_id] = emp
+        with self._cache_lock:
+            self._cache.pop(emp_id, None)
+
+    # ------------------ Loading ------------------
+
+    def _read_files(self):
+        csv_time = os.stat(self.csv_path).st_mtime_ns if os.path.exists(self.csv_path) else None
+        if os.path.exists(self.snapshot_path):
+            if csv_time is None or os.stat(self.snapshot_path).st_mtime_ns > csv_time:
+                # A CsvBackend session compacted after the CSV was last
+                # written: bring the CSV up to date once
+                write_employee_csv(self.csv_path, self._snapshot_rows())
+                self._same_time_as_csv()
+            with SnapshotView(self.snapshot_path) as view:
+                self._next_id = view.next_id
+        if self.base is not None:
+            # Closed once the listings still reading it are done
+            self.base.retire()
+        self.base = OffsetIndex(self.csv_path, self.index_path)
+        self.load_errors = self.base.errors
+        self._next_id = max(self._next_id, self.base.next_id)
+        self._replay(self.journal.replay())
+        metrics.add_rows(len(self._overlay))
+
+    def _replay(self, records):
+        for record in records:
+            op = record.pop("op")
+            emp_id = record.pop("emp_id")
+            if op == "create":
+                self._pin(emp_id, self._restore(emp_id, **record))
+            elif op == "update":
+                emp = self._get(emp_id)
+                if emp is not None:
+                    for key, value in convert(record).items():
+                        setattr(emp, key, value)
+                    self._pin(emp_id, emp)
+            elif op == "delete":
+                self._pin(emp_id, None)
+
+    def _snapshot_rows(self):
+        table = read_snapshot(self.snapshot_path)
+        for key, name, ordinal, salary in zip(table.ids, table.names, table.joining, table.salaries):
+            yield self.factory(key, table.format_id(key), name, date.fromordinal(ordinal), salary)
+
+    def _all(self):
+        """Every employee in id order, read from the CSV one at a time"""
+        with self.lock.read():
+            overlay, base = dict(self._overlay), self.base
+            # A compaction may replace base meanwhile; it stays open until released
+            base.acquire()
+        try:
+            added = sorted((emp for emp_id, emp in overlay.items()
+                            if emp is not None and emp.id not in base), key=attrgetter("id"))
+        except BaseException:
+            base.release()
+            raise
+
+        def stored():
+            try:
+                for number, name, joining_date, salary in base.rows():
+                    emp_id = EMP_IDS.format(number)
+                    if emp_id in overlay:
+                        if overlay[emp_id] is not None:
+                            yield overlay[emp_id]
+                    else:
+                        yield self.factory(number, emp_id, name, to_date(joining_date), salary)
+            finally:
+                base.release()
+        return heapq.merge(stored(), added, key=attrgetter("id"))
+
+    def __len__(self):
+        with self.lock.read():
+            count = len(self.base)
+            for emp_id, emp in self._overlay.items():
+                count += (emp is not None) - (EMP_IDS.parse(emp_id) in self.base)
+            return count
+
+    @instrument("compact")
+    def compact(self):
+        """Merge the overlay into a new snapshot and employees.csv; empty the journal"""
+        self.journal.commit()
+        table = EmployeeColumns.from_records(self._all())
+        table.next_id = max(table.next_id, self._next_id)
+        write_snapshot(self.snapshot_path, table)
+        # Rows the index could not read are carried over, never dropped
+        write_employee_csv(self.csv_path, self._all(), keep=self.base.unread_rows())
+        self._same_time_as_csv()
+        self.journal.reset()
+        self.base.retire()
+        self.base = OffsetIndex(self.csv_path, self.index_path)
+        self._overlay = {}
+        with self._cache_lock:
+            self._cache.clear()
+
+    def close(self):
+        """Write the changes of the session back; an untouched CSV is left as it is"""
+        with self.lock.write(), self.file_lock.exclusive() as generation:
+            if generation != self.generation:
+                self._catch_up(generation)
+            changed = bool(self._overlay)
+            if changed:
+                self.compact()
+            self.journal.close()
+            self.changelog.close()
+            if changed:
+                self.generation = self.file_lock.bump(generation)
+            if self.base is not None:
+                self.base.retire()
+        self.file_lock.close()
+
+    # ------------------ Changes ------------------
+
+    def add(self, emp):
+        with self._writing([emp.emp_id]):
+            if self._get(emp.emp_id) is not None:
+                raise KeyError(f"Duplicate emp_id {emp.emp_id}")
+            self._pin(emp.emp_id, emp)
+            self._next_id = max(self._next_id, emp.id + 1)
+            self._log("create", None, journal_fields(emp))
+
+    def add_many(self, emps):
+        with self._writing([emp.emp_id for emp in emps]):
+            for emp in emps:
+                if self._get(emp.emp_id) is not None:
+                    raise KeyError(f"Duplicate emp_id {emp.emp_id}")
+            if len({emp.emp_id for emp in emps}) != len(emps):
+                raise KeyError("Duplicate emp_id in batch")
+            for emp in emps:
+                self._pin(emp.emp_id, emp)
+            self._next_id = max([self._next_id] + [emp.id + 1 for emp in emps])
+            self._log_many("create", [(None, journal_fields(emp)) for emp in emps])
+
+    def _apply(self, emp_id, changes):
+        """Update one employee; return it and its fields before the change"""
+        emp = self._get(emp_id)
+        if emp is None:
+            return None, None
+        before = journal_fields(emp)
+        for key, value in changes.items():
+            setattr(emp, key, value)
+        self._pin(emp_id, emp)
+        return emp, before
+
+    def update(self, emp_id, changes):
+        with self._writing([emp_id]):
+            emp, before = self._apply(emp_id, changes)
+            if emp is not None:
+                self._log("update", before, journal_fields(emp))
+        return emp
+
+    def update_many(self, changes):
+        with self._writing(changes):
+            updated, logged = [], []
+            for emp_id, fields in changes.items():
+                emp, before = self._apply(emp_id, fields)
+                if emp is not None:
+                    updated.append(emp)
+                    logged.append((before, journal_fields(emp)))
+            self._log_many("update", logged)
+        return updated
+
+    def remove(self, emp_id):
+        with self._writing([emp_id]):
+            emp = self._get(emp_id)
+            if emp is not None:
+                self._pin(emp_id, None)
+                self._log("delete", journal_fields(emp), None)
+        return emp
+
+    def remove_many(self, emp_ids):
+        emp_ids = list(emp_ids)
+        with self._writing(emp_ids):
+            removed = []
+            for emp_id in emp_ids:
+                emp = self._get(emp_id)
+                if emp is not None:
+                    self._pin(emp_id, None)
+                    removed.append(emp)
+            self._log_many("delete", [(journal_fields(emp), None) for emp in removed])
+        return removed
+
+    # ------------------ Lookups ------------------
+
+    def find(self, emp_id):
+        with self.lock.read():
+            return self._get(emp_id)
+
+    def find_by_name(self, name):
+        folded = name.casefold()
+        return [emp for emp in self._all() if emp.name.casefold() == folded]
+
+    def search(self, term):
+        match = matcher(term)
+        return [emp for emp in self._all() if match(emp.name.casefold()) or match(emp.emp_id.casefold())]
+
+    def suggest(self, term, limit=5):
+        # Ranked the way TrigramIndex.fuzzy ranks names, over a stream of rows
+        grams = value_trigrams(term.casefold())
+        if not grams:
+            return []
+        scored = []
+        for emp in self._all():
+            name_grams = value_trigrams(emp.name.casefold())
+            score = len(grams & name_grams) / len(grams)
+            if score >= 0.4:
+                scored.append((-score, len(name_grams), emp.id, emp))
+        return [emp for _, _, _, emp in heapq.nsmallest(limit, scored)]
+
+    def query(self, search=None, sort_by=None, descending=False, where=None):
+        check_query(where, sort_by)
+        sort_by = sort_by and sort_column(sort_by)
+        self.refresh()
+        if search:
+            result = self.search(search)
+            result.sort(key=lambda e: getattr(e, sort_by or "id"), reverse=descending)
+            return result if where is None else list(where.apply(result))
+        if where is not None:
+            if sort_by:
+                where = where.order_by(sort_by, descending)
+            return where.apply(self._all())
+        if sort_by:
+            return sorted(self._all(), key=attrgetter(sort_by), reverse=descending)
+        return self._all()
+
+
+#------------------ SQLite ------------------
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS employees (
+    id           INTEGER PRIMARY KEY,
+    emp_id       TEXT    NOT NULL UNIQUE,
+    name         TEXT    NOT NULL,
+    name_folded  TEXT    NOT NULL,
+    joining_date INTEGER NOT NULL,  -- day ordinal
+    salary       REAL    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS employees_name ON employees (name);
+CREATE INDEX IF NOT EXISTS employees_name_folded ON employees (name_folded);
+CREATE INDEX IF NOT EXISTS employees_joining_date ON employees (joining_date);
+CREATE INDEX IF NOT EXISTS employees_salary ON employees (salary);
+CREATE TABLE IF NOT EXISTS counters (
+    name  TEXT    PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+-- Databases from before the counter start it above their highest id
+INSERT OR IGNORE INTO counters (name, value)
+    SELECT 'next_id', COALESCE(MAX(id), 0) + 1 FROM employees;
+-- Change feed (see employee_changelog); AUTOINCREMENT never reuses a seq
+CREATE TABLE IF NOT EXISTS changes (
+    seq    INTEGER PRIMARY KEY AUTOINCREMENT,
+    op     TEXT    NOT NULL,
+    emp_id TEXT    NOT NULL,
+    before TEXT,  -- JSON fields, NULL for a create
+    after  TEXT   -- JSON fields, NULL for a delete
+);
+"""
+
+COLUMNS = "id, emp_id, name, joining_date, salary"
+INSERT = "INSERT INTO employees (id, emp_id, name, name_folded, joining_date, salary) VALUES (?, ?, ?, ?, ?, ?)"
+SELECT_ONE = f"SELECT {COLUMNS} FROM employees WHERE emp_id = ?"
+DELETE = "DELETE FROM employees WHERE emp_id = ?"
+RAISE_NEXT_ID = "UPDATE counters SET value = max(value, ?) WHERE name = 'next_id'"
+INSERT_CHANGE = "INSERT INTO changes (op, emp_id, before, after) VALUES (?, ?, ?, ?)"
+
+
+def change_row(op, before, after):
+    """INSERT_CHANGE parameters for one change"""
+    return (op, (after or before)["emp_id"],
+            None if before is None else json.dumps(before, separators=(",", ":")),
+            None if after is None else json.dumps(after, separators=(",", ":")))
+
+
+class SqliteBackend(StorageBackend):
+    """Employees stored in an SQLite database (WAL mode, indexed columns).
+
+    Every change is its own transaction (bulk operations share one) and
+    adds its event to the changes table in the same transaction. Search
+    and sort run as SQL so the table never has to fit in memory.
+    sqlite3 keeps the parameterized statements below prepared in its
+    statement cache.
+
+    Each thread gets its own connection and SQLite does the locking:
+    readers run concurrently under WAL, and changes take the write lock
+    up front (BEGIN IMMEDIATE) so a read-modify-write is never interleaved
+    with another thread's or process's change.
+    """
+
+    def __init__(self, path="employees.db", timeout=30.0):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    @property
+    def connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            # Autocommit mode: transactions are opened explicitly by _transaction()
+            connection = sqlite3.connect(self.path, timeout=self.timeout,
+                                         isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def load(self):
+        # A database whose employees were all deleted is not new: only a
+        # missing table means employees.csv has not been imported yet
+        existed = self.connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'employees'").fetchone() is not None
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SCHEMA)
+        return existed
+
+    @contextmanager
+    def _transaction(self):
+        connection = self.connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except sqlite3.IntegrityError as e:
+            connection.execute("ROLLBACK")
+            # Another operator took one of these ids first
+            raise ConflictError(f"The employees were changed by another operator ({e}). "
+                                "Please try again.") from e
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def _employee(self, row):
+        id, emp_id, name, ordinal, salary = row
+        return self.factory(id, emp_id, name, date.fromordinal(ordinal), salary)
+
+    def _params(self, emp):
+        return (emp.id, emp.emp_id, emp.name, emp.name.casefold(), emp.joining_date.toordinal(), emp.salary)
+
+    def next_id(self):
+        return self.connection.execute("SELECT value FROM counters WHERE name = 'next_id'").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+        self._local = threading.local()
+
+    # ------------------ Changes ------------------
+
+    def add(self, emp):
+        with self._transaction() as connection:
+            connection.execute(INSERT, self._params(emp))
+            connection.execute(RAISE_NEXT_ID, (emp.id + 1,))
+            connection.execute(INSERT_CHANGE, change_row("create", None, journal_fields(emp)))
+
+    def add_many(self, emps):
+        with self._transaction() as connection:
+            connection.executemany(INSERT, map(self._params, emps))
+            if emps:
+                connection.execute(RAISE_NEXT_ID, (max(emp.id for emp in emps) + 1,))
+            connection.executemany(INSERT_CHANGE, (change_row("create", None, journal_fields(emp))
+                                                   for emp in emps))
+
+    def _apply(self, emp_id, changes):
+        emp = self.find(emp_id)
+        if emp is None:
+            return None
+        before = journal_fields(emp)
+        for key, value in changes.items():
+            setattr(emp, key, value)
+        self.connection.execute(
+            "UPDATE employees SET name = ?, name_folded = ?, joining_date = ?, salary = ? WHERE emp_id = ?",
+            (emp.name, emp.name.casefold(), emp.joining_date.toordinal(), emp.salary, emp_id))
+        self.connection.execute(INSERT_CHANGE, change_row("update", before, journal_fields(emp)))
+        return emp
+
+    def update(self, emp_id, changes):
+        with self._transaction():
+            return self._apply(emp_id, changes)
+
+    def update_many(self, changes):
+        with self._transaction():
+            updated = [self._apply(emp_id, fields) for emp_id, fields in changes.items()]
+        return [emp for emp in updated if emp is not None]
+
+    def remove(self, emp_id):
+        with self._transaction() as connection:
+            emp = self.find(emp_id)
+            if emp is not None:
+                connection.execute(DELETE, (emp_id,))
+                connection.execute(INSERT_CHANGE, change_row("delete", journal_fields(emp), None))
+        return emp
+
+    def remove_many(self, emp_ids):
+        with self._transaction() as connection:
+            removed = [emp for emp in map(self.find, emp_ids) if emp is not None]
+            connection.executemany(DELETE, ((emp.emp_id,) for emp in removed))
+            connection.executemany(INSERT_CHANGE, (change_row("delete", journal_fields(emp), None)
+                                                   for emp in removed))
+        return removed
+
+    # ------------------ Lookups ------------------
+
+    def find(self, emp_id):
+        row = self.connection.execute(SELECT_ONE, (emp_id,)).fetchone()
+        return self._employee(row) if row else None
+
+    def version(self):
+        # Every change records an event, so the last seq is a version number
+        return self.connection.execute("SELECT COALESCE(MAX(seq), 0) FROM changes").fetchone()[0]
+
+    def changes_since(self, seq=0, limit=None):
+        try:
+            rows = self.connection.execute(
+                "SELECT seq, op, emp_id, before, after FROM changes WHERE seq > ? ORDER BY seq LIMIT ?",
+                (seq, -1 if limit is None else limit))
+        except sqlite3.OperationalError as e:
+            if "no such table" not in str(e):
+                raise
+            return  # a database load() has not opened yet has no changes
+        for seq, op, emp_id, before, after in rows:
+            yield {"seq": seq, "emp_id": emp_id,
+                   "before": None if before is None else json.loads(before),
+                   "after": None if after is None else json.loads(after), "op": op}
+
+    def find_by_name(self, name):
+        rows = self.connection.execute(
+            f"SELECT {COLUMNS} FROM employees WHERE name_folded = ? ORDER BY id", (name.casefold(),))
+        return [self._employee(row) for row in rows]
+
+    def search(self, term):
+        return list(self.query(search=term))
+
+    def suggest(self, term, limit=5):
+        # Candidates contain one of the term's trigrams or a word starting
+        # with its first two letters; they are then ranked the way
+        # TrigramIndex.fuzzy ranks them
+        grams = value_trigrams(term.casefold())
+        if not grams:
+            return []
+        patterns = sorted({gram.replace(START[0], " ") for gram in grams if not gram.startswith(START)})
+        if not patterns:
+            # One letter: every trigram is padding, so look for words starting with it
+            patterns = [" " + term.casefold().strip()]
+        where = " OR ".join("instr(' ' || name_folded, ?) > 0" for _ in patterns)
+        rows = self.connection.execute(
+            f"SELECT {COLUMNS} FROM employees WHERE {where} LIMIT 1000", patterns).fetchall()
+        scored = []
+        for row in rows:
+            name_grams = value_trigrams(row[2].casefold())
+            scored.append((len(grams & name_grams) / len(grams), -len(name_grams), row))
+        scored.sort(key=lambda item: (-item[0], -item[1], item[2][0]))
+        return [self._employee(row) for score, _, row in scored[:limit] if score >= 0.4]
+
+    @staticmethod
+    def _conditions(where):
+        """SQL conditions and parameters for a checked Query"""
+        def value(field, v):
+            return v.toordinal() if field == "joining_date" else v
+
+        conditions, params = [], []
+        for field, (low, high) in where.ranges.items():
+            if low is not None:
+                conditions.append(f"{field} >= ?")
+                params.append(value(field, low))
+            if high is not None:
+                conditions.append(f"{field} <= ?")
+                params.append(value(field, high))
+        for field, v in where.equal.items():
+            if field == "name":
+                conditions.append("name_folded = ?")
+                params.append(v.casefold())
+            else:
+                conditions.append(f"{field} = ?")
+                params.append(value(field, v))
+        return conditions, params
+
+    def query(self, search=None, sort_by=None, descending=False, where=None):
+        check_query(where, sort_by)
+        sql = f"SELECT {COLUMNS} FROM employees"
+        conditions, params = [], []
+        if search:
+            text, is_prefix = split_term(search.casefold())
+            if is_prefix:
+                # A leading space makes the start of the value a word start too
+                conditions.append("(instr(' ' || name_folded, ?) > 0 OR instr(' ' || lower(emp_id), ?) > 0)")
+                text = " " + text
+            else:
+                conditions.append("(instr(name_folded, ?) > 0 OR instr(lower(emp_id), ?) > 0)")
+            params += [text, text]
+        if where is not None:
+            if where.empty:
+                return iter(())
+            where_conditions, where_params = self._conditions(where)
+            conditions += where_conditions
+            params += where_params
+            if sort_by is None and where.order:
+                sort_by, descending = where.order
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        direction = "DESC" if descending else "ASC"
+        sql += f" ORDER BY {sort_column(sort_by or 'id')} {direction}, id {direction}"
+        if where is not None and (where.take is not None or where.skip):
+            sql += " LIMIT ? OFFSET ?"
+            params += [-1 if where.take is None else where.take, where.skip]
+        # Rows are turned into Employee objects one at a time as they are read
+        return (self._employee(row) for row in self.connection.execute(sql, params))
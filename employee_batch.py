@@ -0,0 +1,101 @@
+"""Headless command mode for the menu-driven assignments.
+
+Commands are JSON objects, one per line, read from a file or stdin:
+
+    {"op": "create", "name": "Ali", "joining_date": "01/02/2020", "salary": 5000}
+    {"op": "delete", "emp_id": "E001"}
+
+Each command produces one JSON line on stdout, {"ok": true, "result": ...}
+or {"ok": false, "error": ...}. The exit code is 0 when every command
+succeeded, 1 when at least one failed and 2 for bad usage.
+
+Add "profile": true to a command to run it under cProfile; its response
+then also carries the profile report.
+"""
+import argparse
+import contextlib
+import io
+import json
+import sys
+
+from employee_metrics import profile_call
+
+
+def _text_emp_id(command):
+    """emp_ids are text: a JSON number 7 becomes "7", anything else is refused"""
+    emp_id = command.get("emp_id")
+    if isinstance(emp_id, int) and not isinstance(emp_id, bool):
+        command["emp_id"] = str(emp_id)
+    elif emp_id is not None and not isinstance(emp_id, str):
+        raise TypeError(f"emp_id must be a string, got {emp_id!r}")
+
+
+def run_commands(lines, handlers, out):
+    """Execute JSON-lines commands against handlers; return the failure count.
+
+    Anything the handlers print is discarded so out only carries results.
+    """
+    failures = 0
+    discard = io.StringIO()
+    for number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+
+        try:
+            command = json.loads(line)
+            op = command.pop("op")
+            profile = command.pop("profile", False)
+            handler = handlers[op]
+        except ValueError as e:
+            response = {"ok": False, "error": f"invalid JSON: {e}"}
+        except KeyError:
+            response = {"ok": False, "error": f"unknown op, expected one of: {', '.join(sorted(handlers))}"}
+        except (AttributeError, TypeError):
+            response = {"ok": False, "error": "a command must be a JSON object with an \"op\" key"}
+        else:
+            try:
+                _text_emp_id(command)
+                with contextlib.redirect_stdout(discard):
+                    if profile:
+                        result, report = profile_call(handler, **command)
+                        response = {"ok": True, "result": result, "profile": report}
+                    else:
+                        response = {"ok": True, "result": handler(**command)}
+            except (LookupError, TypeError, ValueError, OSError) as e:
+                response = {"ok": False, "error": str(e)}
+            discard.seek(0)
+            discard.truncate()
+
+        if not response["ok"]:
+            failures += 1
+        response["line"] = number
+        out.write(json.dumps(response) + "\n")
+    return failures
+
+
+def batch_main(handlers, argv=None, setup=None, teardown=None):
+    """Command-line entry point: returns the process exit code"""
+    parser = argparse.ArgumentParser(description="Run employee commands without the menu.")
+    parser.add_argument("--batch", metavar="FILE", required=True,
+                        help="file of JSON-lines commands, or - for stdin")
+    try:
+        args = parser.parse_args(argv)
+    except SystemExit as e:
+        return 2 if e.code else 0
+
+    if setup:
+        setup()
+    try:
+        if args.batch == "-":
+            failures = run_commands(sys.stdin, handlers, sys.stdout)
+        else:
+            with open(args.batch, mode="r", encoding="utf-8") as file:
+                failures = run_commands(file, handlers, sys.stdout)
+    except OSError as e:
+        print(f"Cannot read {args.batch}: {e}", file=sys.stderr)
+        return 2
+    finally:
+        if teardown:
+            teardown()
+    return 1 if failures else 0
@@ -0,0 +1,78 @@
+"""Dictionary encoding for low-cardinality text columns such as department.
+
+    departments = Categories()
+    code = departments.code("Sales")      # 0, the same code every time
+    departments.names[code]               # "Sales"
+    departments.rename("Sales", "Sales & Marketing")
+
+Each distinct value is stored once and records keep its small integer
+code. Grouping, filtering and sorting compare codes instead of hashing
+or comparing strings, and renaming a value changes one table entry, so
+it costs O(1) whatever the number of records that hold it. Codes are
+never reused or reordered: indexes keyed on codes stay valid through a
+rename.
+"""
+
+
+class Categories:
+    """Value <-> code table; codes are handed out 0, 1, 2, ... in first-seen order"""
+
+    def __init__(self, names=()):
+        self.names = []   # code -> value
+        self._codes = {}  # value -> code
+        self._ranks = None
+        self.version = 0  # goes up when a value is added or renamed
+        for name in names:
+            self.code(name)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __contains__(self, name):
+        return name in self._codes
+
+    def __repr__(self):
+        return f"Categories({self.names!r})"
+
+    def code(self, name):
+        """The code of name, added to the table if it is new"""
+        code = self._codes.get(name)
+        if code is None:
+            code = self._codes[name] = len(self.names)
+            self.names.append(name)
+            self._ranks = None
+            self.version += 1
+        return code
+
+    def lookup(self, name):
+        """The code of name, or None if no record has ever held it"""
+        return self._codes.get(name)
+
+    def rename(self, old, new):
+        """Give every record holding old the value new, in O(1)"""
+        code = self._codes.get(old)
+        if code is None:
+            raise KeyError(f"No such value: {old!r}")
+        if new == old:
+            return code
+        if new in self._codes:
+            raise ValueError(f"{new!r} already exists; renaming cannot merge two values")
+        del self._codes[old]
+        self._codes[new] = code
+        self.names[code] = new
+        self._ranks = None
+        self.version += 1
+        return code
+
+    def rank(self, code):
+        """Position of code's value in alphabetical order, for sorting by codes"""
+        if self._ranks is None:
+            # Rebuilt only after a new value or a rename: O(k log k) for k values
+            order = sorted(range(len(self.names)), key=self.names.__getitem__)
+            self._ranks = [0] * len(order)
+            for rank, position in enumerate(order):
+                self._ranks[position] = rank
+        return self._ranks[code]
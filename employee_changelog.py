@@ -0,0 +1,113 @@
+"""Change-data-capture feed: every create, update and delete as a sequenced event.
+
+    {"seq": 42, "emp_id": "E007",
+     "before": {"emp_id": "E007", "name": "Ali", "joining_date": "01/02/2020", "salary": 5000.0},
+     "after":  {"emp_id": "E007", "name": "Ali", "joining_date": "01/02/2020", "salary": 5500.0},
+     "op": "update"}
+
+before is null for a create and after is null for a delete. Sequence
+numbers start at 1 and only go up, across sessions and processes, so a
+consumer keeps the last seq it applied and next time asks for the
+changes since it. Unlike the journal, the changelog is not emptied when
+the journal is compacted.
+
+Events are appended under the backend's write lock, one JSON line each,
+and made durable in groups like the journal. since() finds its first
+event by bisecting the file on byte offsets, so reading the changes
+after N costs a few short reads plus the changes themselves.
+"""
+import json
+import os
+from itertools import islice
+
+from employee_journal import Journal
+
+TAIL = 4096  # bytes read from the end at a time when looking for the last event
+
+
+class Changelog(Journal):
+    def __init__(self, path="employees.changes", **kwargs):
+        super().__init__(path, **kwargs)
+        self.last_seq = 0
+
+    #------------------ Writing ------------------
+
+    def begin(self):
+        """Catch up with events other processes appended; call under the write lock"""
+        self.flush()
+        self.last_seq = self._read_last_seq()
+
+    def _read_last_seq(self):
+        """seq of the last complete event; a torn line left by a crash is cut off"""
+        if not os.path.exists(self.path):
+            return 0
+        with open(self.path, mode="r+b") as file:
+            size = file.seek(0, os.SEEK_END)
+            chunk = b""
+            start = size
+            while start > 0:
+                start = max(0, start - TAIL)
+                file.seek(start)
+                chunk = file.read(size - start)
+                if chunk.count(b"\n") >= 2 or start == 0:
+                    break
+            end = chunk.rfind(b"\n") + 1
+            if start + end < size:
+                file.truncate(start + end)
+            lines = chunk[:end].splitlines()
+        return json.loads(lines[-1])["seq"] if lines else 0
+
+    def _event(self, before, after):
+        self.last_seq += 1
+        return {"seq": self.last_seq, "emp_id": (after or before)["emp_id"],
+                "before": before, "after": after}
+
+    def append_change(self, op, before, after):
+        """Record one change; before/after are field dicts, None for a create/delete"""
+        self.append(op, **self._event(before, after))
+
+    def append_changes(self, op, changes):
+        """Record [(before, after)] of one bulk operation in one write"""
+        if changes:
+            self.append_many(op, [self._event(before, after) for before, after in changes])
+
+    #------------------ Reading ------------------
+
+    def since(self, seq=0, limit=None):
+        """Yield the events after seq, oldest first, at most limit of them"""
+        return islice(self._since(seq), limit)
+
+    def _since(self, seq):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, mode="rb") as file:
+            # Smallest offset whose next line holds an event after seq
+            low, high = 0, file.seek(0, os.SEEK_END)
+            while low < high:
+                middle = (low + high) // 2
+                if self._seq_at(file, middle) <= seq:
+                    low = middle + 1
+                else:
+                    high = middle
+            self._seek_line(file, low)
+            for line in file:
+                if not line.endswith(b"\n"):
+                    return  # torn last line
+                event = json.loads(line)
+                if event["seq"] > seq:
+                    yield event
+
+    @staticmethod
+    def _seek_line(file, offset):
+        """Move to the first line starting at or after offset"""
+        file.seek(max(offset - 1, 0))
+        if offset:
+            file.readline()
+
+    def _seq_at(self, file, offset):
+        """seq of the first line starting at or after offset (infinite past the end)"""
+        self._seek_line(file, offset)
+        line = file.readline()
+        if not line.endswith(b"\n"):
+            return float("inf")
+        return json.loads(line)["seq"]
@@ -0,0 +1,208 @@
+from array import array
+from datetime import date
+
+from employee_dates import parse_date
+
+#------------------ Row view ------------------
+
+class EmployeeRow:
+    """Lightweight object-style view of one row of an EmployeeColumns table"""
+
+    __slots__ = ("_table", "_key")
+
+    def __init__(self, table, key):
+        self._table = table
+        self._key = key
+
+    def _row(self):
+        return self._table.row_of(self._key)
+
+    @property
+    def emp_id(self):
+        return self._table.format_id(self._key)
+
+    @property
+    def name(self):
+        return self._table.names[self._row()]
+
+    @name.setter
+    def name(self, value):
+        self._table.names[self._row()] = value
+
+    @property
+    def joining_date(self):
+        return date.fromordinal(self._table.joining[self._row()])
+
+    @joining_date.setter
+    def joining_date(self, value):
+        self._table.joining[self._row()] = value.toordinal()
+
+    @property
+    def salary(self):
+        return self._table.salaries[self._row()]
+
+    @salary.setter
+    def salary(self, value):
+        self._table.salaries[self._row()] = float(value)
+
+    @property
+    def department(self):
+        department = self._table.departments[self._row()]
+        categories = self._table.categories
+        return department if categories is None else categories.names[department]
+
+    @department.setter
+    def department(self, value):
+        categories = self._table.categories
+        self._table.departments[self._row()] = value if categories is None else categories.code(value)
+
+    def __repr__(self):
+        return (f"EmployeeRow({self.emp_id!r}, {self.name!r}, "
+                f"{self.joining_date.strftime('%d/%m/%Y')!r}, {self.salary!r})")
+
+
+#------------------ Columnar table ------------------
+
+class EmployeeColumns:
+    """Employees stored column by column instead of one object each.
+
+    ids are the numeric part of emp_id, joining dates are day ordinals in
+    an int32 array and salaries live in a double array, so a row costs a
+    few bytes plus its name string. The id -> row lookup is a dict, so a
+    hand-edited id such as E50000000 costs no more than E001. next_id is one past the highest id the table has held, removed rows
+    included, so it can be saved as the id high-water mark. When
+    categories is set, departments holds their codes (see
+    employee_categories) instead of the names.
+    """
+
+    def __init__(self, prefix="E", width=3):
+        self.prefix = prefix
+        self.width = width
+        self.ids = array("q")
+        self.names = []
+        self.joining = array("i")
+        self.salaries = array("d")
+        self.departments = []
+        self.categories = None
+        self._rows = {}  # numeric id -> row number
+        self.next_id = 1
+
+    @classmethod
+    def from_records(cls, records, getter=getattr, prefix="E", width=3):
+        """Build a table from Employee objects (or dicts with operator.getitem)"""
+        table = cls(prefix, width)
+        for record in records:
+            try:
+                department = getter(record, "department")
+            except (AttributeError, KeyError):
+                department = None
+            table.append(getter(record, "emp_id"), getter(record, "name"),
+                         getter(record, "joining_date"), getter(record, "salary"),
+                         department)
+        return table
+
+    @classmethod
+    def from_columns(cls, ids, names, joining, salaries, prefix="E", width=3):
+        """Wrap already built columns (arrays of ids, ordinals and salaries)"""
+        table = cls(prefix, width)
+        table.ids = ids
+        table.names = names
+        table.joining = joining
+        table.salaries = salaries
+        table.departments = [None] * len(ids)
+        if ids:
+            table._rows = dict(zip(ids, range(len(ids))))
+            table.next_id = max(ids) + 1
+        return table
+
+    def format_id(self, key):
+        return f"{self.prefix}{key:0{self.width}d}"
+
+    def parse_id(self, emp_id):
+        return int(emp_id[len(self.prefix):])
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self):
+        return (EmployeeRow(self, key) for key in list(self.ids))
+
+    def row_of(self, key):
+        """Row number of a numeric id, or -1"""
+        return self._rows.get(key, -1)
+
+    def __contains__(self, emp_id):
+        return self.row_of(self.parse_id(emp_id)) >= 0
+
+    def append(self, emp_id, name, joining_date, salary, department=None):
+        key = self.parse_id(emp_id)
+        if self.row_of(key) >= 0:
+            raise KeyError(f"Duplicate emp_id {emp_id}")
+        self._rows[key] = len(self.ids)
+        self.next_id = max(self.next_id, key + 1)
+        self.ids.append(key)
+        self.names.append(name)
+        # Accepts a date, a dd/mm/yyyy string or an already parsed day ordinal
+        if isinstance(joining_date, str):
+            joining_date = parse_date(joining_date)
+        elif isinstance(joining_date, date):
+            joining_date = joining_date.toordinal()
+        self.joining.append(joining_date)
+        self.salaries.append(float(salary))
+        self.departments.append(department)
+        return EmployeeRow(self, key)
+
+    def find(self, emp_id):
+        key = self.parse_id(emp_id)
+        return EmployeeRow(self, key) if self.row_of(key) >= 0 else None
+
+    def remove(self, emp_id):
+        """Delete in O(1) by moving the last row into the freed slot"""
+        key = self.parse_id(emp_id)
+        row = self.row_of(key)
+        if row < 0:
+            return False
+        del self._rows[key]
+
+        last = len(self.ids) - 1
+        if row != last:
+            moved = self.ids[last]
+            for column in (self.ids, self.names, self.joining, self.salaries, self.departments):
+                column[row] = column[last]
+            self._rows[moved] = row
+        for column in (self.ids, self.names, self.joining, self.salaries, self.departments):
+            column.pop()
+        return True
+
+
+#------------------ Store index ------------------
+
+class ColumnIndex(EmployeeColumns):
+    """An EmployeeColumns table kept in sync by an EmployeeStore.
+
+    Register it with EmployeeStore.add_index() and every add, update and
+    delete on the store is mirrored into the columns. With categories,
+    department_field names the records' department code and the
+    departments column is an int32 array of codes.
+    """
+
+    def __init__(self, getter=getattr, prefix="E", width=3, date_field="joining_date",
+                 department_field="department", categories=None):
+        super().__init__(prefix, width)
+        self.getter = getter
+        self.date_field = date_field
+        self.department_field = department_field
+        if categories is not None:
+            self.categories = categories
+            self.departments = array("i")
+
+    def add(self, emp_id, record):
+        try:
+            department = self.getter(record, self.department_field)
+        except (AttributeError, KeyError):
+            department = None
+        self.append(emp_id, self.getter(record, "name"), self.getter(record, self.date_field),
+                    self.getter(record, "salary"), department)
+
+    def discard(self, emp_id, record):
+        self.remove(emp_id)
@@ -0,0 +1,95 @@
+"""Transparent gzip, bz2 and lzma for employee CSV files.
+
+    with open_text("employees-2024-06.csv.gz") as file:    # or .csv, .bz2, .xz
+        rows = list(csv.reader(file))
+    with write_text("employees-2024-06.csv.xz") as file:
+        csv.writer(file).writerows(rows)
+
+A file being read is recognised by its magic bytes, so a compressed file
+is read correctly whatever its name; a file being written is compressed
+when its name ends in one of the extensions below. Data is compressed
+and decompressed as it streams through, a block at a time: neither side
+ever holds the whole file.
+"""
+import bz2
+import gzip
+import lzma
+import os
+from contextlib import contextmanager
+
+from employee_journal import atomic_write
+
+
+class Codec:
+    def __init__(self, name, magic, extensions, opener):
+        self.name = name
+        self.magic = magic
+        self.extensions = extensions
+        self.open = opener  # gzip.open and friends: a path or a binary file object
+
+    def __repr__(self):
+        return f"Codec({self.name!r})"
+
+
+CODECS = (
+    Codec("gzip", b"\x1f\x8b", (".gz", ".gzip"), gzip.open),
+    Codec("bz2", b"BZh", (".bz2",), bz2.open),
+    Codec("lzma", b"\xfd7zXZ\x00", (".xz", ".lzma"), lzma.open),
+)
+MAGIC_BYTES = max(len(codec.magic) for codec in CODECS)
+
+
+def codec_for_name(path):
+    """The codec a file called path is written with, or None for plain text"""
+    lower = str(path).lower()
+    for codec in CODECS:
+        if lower.endswith(codec.extensions):
+            return codec
+    return None
+
+
+def codec_for_file(path):
+    """The codec of an existing file, from its magic bytes (by name if it is empty)"""
+    with open(path, mode="rb") as file:
+        head = file.read(MAGIC_BYTES)
+    for codec in CODECS:
+        if head.startswith(codec.magic):
+            return codec
+    return None if head else codec_for_name(path)
+
+
+def is_compressed(path):
+    if os.path.exists(path):
+        return codec_for_file(path) is not None
+    return codec_for_name(path) is not None
+
+
+#------------------ Opening ------------------
+
+def open_binary(path):
+    """path opened for reading bytes, decompressed as it is read"""
+    codec = codec_for_file(path)
+    return open(path, mode="rb") if codec is None else codec.open(path, "rb")
+
+
+def open_text(path, encoding="utf-8"):
+    """path opened for reading text as the csv module wants it (newline="")"""
+    codec = codec_for_file(path)
+    if codec is None:
+        return open(path, mode="r", newline="", encoding=encoding)
+    return codec.open(path, "rt", newline="", encoding=encoding)
+
+
+@contextmanager
+def write_text(path, encoding="utf-8", errors="strict"):
+    """Write text to path atomically, compressed if its name says so"""
+    codec = codec_for_name(path)
+    if codec is None:
+        with atomic_write(path, mode="w", newline="", encoding=encoding, errors=errors) as file:
+            yield file
+        return
+    with atomic_write(path, mode="wb") as raw:
+        # Closing the codec's file writes its trailer but leaves raw open
+        # for atomic_write to fsync and rename
+        with codec.open(raw, "wt", newline="", encoding=encoding, errors=errors) as file:
+            yield file
@@ -0,0 +1,55 @@
+"""Fast dd/mm/yyyy parsing and formatting.
+
+Dates are parsed once, at ingest, into day ordinals (the same numbers as
+date.toordinal()), which sort and compare as plain integers. Parsing and
+formatting are memoized: a payroll only has a few thousand distinct
+joining dates, so almost every call is a cache hit.
+"""
+from datetime import date
+from functools import lru_cache
+
+_DAYS_IN_MONTH = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+_DAYS_BEFORE_MONTH = (0, 0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334)
+
+
+def _is_leap(year):
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+@lru_cache(maxsize=65536)
+def parse_date(text):
+    """dd/mm/yyyy -> day ordinal, raising ValueError like strptime would.
+
+    Like "%d/%m/%Y", day and month may have one or two digits.
+    """
+    parts = text.split("/")
+    if len(parts) != 3:
+        raise ValueError(f"time data {text!r} does not match format '%d/%m/%Y'")
+    day, month, year = parts
+    if not (0 < len(day) <= 2 and 0 < len(month) <= 2 and len(year) == 4
+            and (day + month + year).isascii() and (day + month + year).isdigit()):
+        raise ValueError(f"time data {text!r} does not match format '%d/%m/%Y'")
+
+    day, month, year = int(day), int(month), int(year)
+    if not 1 <= month <= 12 or year < 1:
+        raise ValueError(f"time data {text!r} does not match format '%d/%m/%Y'")
+    leap_day = month == 2 and _is_leap(year)
+    if not 1 <= day <= _DAYS_IN_MONTH[month] + leap_day:
+        raise ValueError("day is out of range for month")
+
+    y = year - 1
+    return (y * 365 + y // 4 - y // 100 + y // 400
+            + _DAYS_BEFORE_MONTH[month] + (month > 2 and _is_leap(year)) + day)
+
+
+@lru_cache(maxsize=65536)
+def format_date(ordinal):
+    """Day ordinal -> dd/mm/yyyy"""
+    d = date.fromordinal(ordinal)
+    return f"{d.day:02d}/{d.month:02d}/{d.year:04d}"
+
+
+@lru_cache(maxsize=65536)
+def to_date(text):
+    """dd/mm/yyyy -> datetime.date; equal dates share one object"""
+    return date.fromordinal(parse_date(text))
@@ -0,0 +1,97 @@
+"""Employee ids: the emp_id text format and allocation of new numbers.
+
+emp_ids are a prefix and a number padded to a minimum width, so E001 to
+E999 keep their look and E1000, E1000000, ... simply grow wider. Numbers
+are only ever handed out upwards: a deleted employee's id is not reused,
+and the storage keeps the high-water mark so that holds across sessions.
+"""
+import re
+import threading
+
+
+class IdFormat:
+    """prefix + number padded to at least width digits, e.g. E001 or E12345"""
+
+    def __init__(self, prefix="E", width=3):
+        self.prefix = prefix
+        self.width = width
+        self._pattern = re.compile(rf"{re.escape(prefix)}(\d+)", re.IGNORECASE)
+
+    def format(self, number):
+        return f"{self.prefix}{number:0{self.width}d}"
+
+    def parse(self, emp_id):
+        """Number of an emp_id; lenient about case, padding and spaces"""
+        if emp_id.startswith(self.prefix):
+            digits = emp_id[len(self.prefix):]
+            if digits.isdigit() and digits.isascii():
+                return int(digits)  # the usual, already canonical case
+        match = self._pattern.fullmatch(str(emp_id).strip())
+        if match is None:
+            raise ValueError(f"Invalid Employee ID {emp_id!r}. Use {self.prefix!r} followed by "
+                             f"digits, e.g., {self.format(1)}.")
+        return int(match.group(1))
+
+    def normalize(self, emp_id):
+        """The stored form of an emp_id typed as e7, E0007, ..."""
+        return self.format(self.parse(emp_id))
+
+    def is_valid(self, emp_id):
+        try:
+            self.parse(emp_id)
+        except ValueError:
+            return False
+        return True
+
+
+# The third assignment's E001 style; the second assignment uses bare numbers
+EMP_IDS = IdFormat("E", 3)
+NUMBERS = IdFormat("", 1)
+
+
+class IdAllocator:
+    """Hands out numeric employee ids; safe to call from many threads"""
+
+    def __init__(self, next_id=1):
+        self._next = next_id
+        self._lock = threading.Lock()
+
+    def allocate(self, count=1):
+        """Reserve count consecutive ids and return the first one"""
+        with self._lock:
+            first = self._next
+            self._next += count
+            return first
+
+    def advance_to(self, next_id):
+        """Never hand out an id below next_id (e.g. ids used by another process)"""
+        with self._lock:
+            self._next = max(self._next, next_id)
+
+    def peek(self):
+        return self._next
+
+
+class IdIndex(IdAllocator):
+    """An IdAllocator kept above every emp_id an EmployeeStore has seen.
+
+    Register it with EmployeeStore.add_index(): records added with an
+    explicit emp_id move it forward, deleting them does not move it back.
+    """
+
+    def __init__(self, id_format=NUMBERS):
+        super().__init__()
+        self.format = id_format
+
+    def add(self, emp_id, record):
+        self.advance_to(self.format.parse(emp_id) + 1)
+
+    def add_many(self, items):
+        if items:
+            self.advance_to(max(self.format.parse(emp_id) for emp_id, _ in items) + 1)
+
+    def discard(self, emp_id, record):
+        pass
+
+    def next_emp_id(self):
+        return self.format.format(self.allocate())
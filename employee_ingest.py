@@ -0,0 +1,260 @@
+"""Parallel, chunked loading of large employees.csv files.
+
+    table, errors = load_employee_csv("employees.csv", workers=8)
+
+The file is cut into byte ranges that end on a newline, and each range
+is parsed and validated in a worker process (ProcessPoolExecutor).
+Workers send back compact columns instead of row objects: arrays of
+ids, day ordinals and salaries, plus the names. The chunks are merged
+into one EmployeeColumns table in emp_id order. A row that cannot be
+loaded comes back as a (line number, message) error; it is never
+silently skipped.
+
+Small files are parsed in this process, because starting workers costs
+more than it saves. Rows are expected one per line, which is how
+write_employee_csv writes them. A quoted name that holds a newline
+parses correctly inside a chunk, but is reported as malformed if a
+chunk boundary splits it.
+
+gzip, bz2 and lzma files (see employee_compression) cannot be split by
+byte offset. They are decompressed as a stream in this process and
+parsed STREAM_BYTES at a time, so memory holds one block of text plus
+the columns, never the whole decompressed file.
+"""
+import csv
+import heapq
+import io
+import math
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from employee_columns import EmployeeColumns
+from employee_compression import is_compressed, open_binary
+from employee_dates import parse_date
+from employee_ids import EMP_IDS
+
+PARALLEL_MIN_BYTES = 4 << 20  # smaller files are parsed in-process
+CHUNKS_PER_WORKER = 4         # more chunks than workers evens out the load
+STREAM_BYTES = 4 << 20        # decompressed text parsed at a time
+
+
+#------------------ Splitting ------------------
+
+def split_ranges(path, chunks):
+    """[(start, end)] byte ranges of path, each ending just after a newline"""
+    size = os.path.getsize(path)
+    bounds = [0]
+    with open(path, mode="rb") as file:
+        for i in range(1, chunks):
+            file.seek(max(size * i // chunks, bounds[-1]))
+            file.readline()
+            bounds.append(min(file.tell(), size))
+    bounds.append(size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
+
+
+#------------------ Parsing (runs in the workers) ------------------
+
+def _decode(data, errors):
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        lines = data.split(b"\n")
+        for number, line in enumerate(lines, start=1):
+            try:
+                lines[number - 1] = line.decode("utf-8")
+            except UnicodeDecodeError:
+                errors.append((number, "Not valid UTF-8 text."))
+                lines[number - 1] = ""
+        return "\n".join(lines)
+
+
+def _parse_columns(text, id_format):
+    """Fast path: convert whole columns at once, or None if any row is not clean.
+
+    Clean means four fields per row, prefixed emp_ids in increasing
+    order and valid names, dates and salaries, which is what
+    write_employee_csv produces.
+    """
+    # Straight into one list per column: holding a list per row would
+    # keep the garbage collector busy for nothing
+    emp_ids, names, dates, salaries = [], [], [], []
+    try:
+        for emp_id, name, joining_date, salary in csv.reader(io.StringIO(text, newline="")):
+            emp_ids.append(emp_id)
+            names.append(name)
+            dates.append(joining_date)
+            salaries.append(salary)
+    except (csv.Error, ValueError):  # ValueError: not four fields
+        return None
+    if not emp_ids:
+        return [], [], [], [], []
+    cut = len(id_format.prefix)
+    digits = [emp_id[cut:] for emp_id in emp_ids]
+    if ({emp_id[:cut] for emp_id in emp_ids} != {id_format.prefix}
+            or not all(map(str.isdigit, digits)) or not all(names) or any(map(str.isspace, names))
+            or "\0" in text):
+        return None
+    try:
+        ids = list(map(int, digits))
+        joining = list(map(parse_date, dates))
+        salaries = list(map(float, salaries))
+    except ValueError:
+        return None
+    if ids != sorted(ids) or len(set(ids)) != len(ids) or not all(map(math.isfinite, salaries)):
+        return None
+    # Duplicates across chunks are reported by line, so keep the real
+    # ones; a clean chunk holds one row per line unless a quoted field
+    # spans lines, which the slow path numbers properly
+    if text.count("\n") + (not text.endswith("\n")) != len(ids):
+        return None
+    lines = list(range(1, len(ids) + 1))
+    return ids, names, joining, salaries, lines
+
+
+def _parse_rows(text, id_format, errors):
+    """Slow path: row by row, recording an error for every row left out"""
+    ids, names, joining, salaries, lines = [], [], [], [], []
+    reader = csv.reader(io.StringIO(text, newline=""))
+    while True:
+        try:
+            for row in reader:
+                if len(row) != 4:
+                    if row:  # blank lines are not errors
+                        errors.append((reader.line_num, f"Expected 4 fields (emp_id, name, joining_date, "
+                                                        f"salary), got {len(row)}."))
+                    continue
+                emp_id, name, joining_date, salary = row
+                try:
+                    key = id_format.parse(emp_id)
+                    if not name or name.isspace():
+                        raise ValueError("Name cannot be empty.")
+                    if "\0" in name:
+                        raise ValueError("Name cannot contain NUL characters.")
+                    try:
+                        ordinal = parse_date(joining_date)
+                    except ValueError:
+                        raise ValueError(f"Invalid date format {joining_date!r}. Please use dd/mm/yyyy.")
+                    try:
+                        salary = float(salary)
+                    except ValueError:
+                        raise ValueError(f"Salary must be a number, got {salary!r}.")
+                    if not math.isfinite(salary):
+                        raise ValueError(f"Salary must be a finite number, got {salary!r}.")
+                except ValueError as e:
+                    errors.append((reader.line_num, str(e)))
+                    continue
+                ids.append(key)
+                names.append(name)
+                joining.append(ordinal)
+                salaries.append(salary)
+                lines.append(reader.line_num)
+            break
+        except csv.Error as e:
+            # The reader carries on with the next line
+            errors.append((reader.line_num, f"Malformed CSV: {e}"))
+
+    # Sorted by emp_id, then line; duplicates are left for _merge to report
+    order = sorted(range(len(ids)), key=lambda row: (ids[row], lines[row]))
+    return ([ids[row] for row in order], [names[row] for row in order], [joining[row] for row in order],
+            [salaries[row] for row in order], [lines[row] for row in order])
+
+
+def parse_range(path, start, end, id_format=EMP_IDS):
+    """Parse one byte range into columns sorted by emp_id.
+
+    Returns (ids, names, joining, salaries, lines, errors, line count)
+    where lines and errors use line numbers relative to the range.
+    """
+    with open(path, mode="rb") as file:
+        file.seek(start)
+        data = file.read(end - start)
+    return parse_bytes(data, id_format)
+
+
+def parse_bytes(data, id_format=EMP_IDS):
+    """parse_range for bytes already read; data must end on a line boundary"""
+    errors = []
+    text = _decode(data, errors)
+
+    columns = None if errors else _parse_columns(text, id_format)
+    if columns is None:
+        columns = _parse_rows(text, id_format, errors)
+    ids, names, joining, salaries, lines = columns
+    line_count = text.count("\n") + (0 if text.endswith("\n") or not text else 1)
+    return array("q", ids), names, array("i", joining), array("d", salaries), array("q", lines), errors, line_count
+
+
+#------------------ Merging ------------------
+
+def _merge(chunks, id_format):
+    """Combine sorted chunks into one table; return (table, errors)"""
+    ids, names, joining, salaries = array("q"), [], array("i"), array("d")
+    errors = []
+    parts = []  # (ids, names, joining, salaries, lines, first line) of the non-empty chunks
+    first_line = 0
+    for chunk_ids, chunk_names, chunk_joining, chunk_salaries, lines, chunk_errors, line_count in chunks:
+        errors.extend((first_line + line, message) for line, message in chunk_errors)
+        if chunk_ids:
+            parts.append((chunk_ids, chunk_names, chunk_joining, chunk_salaries, lines, first_line))
+        first_line += line_count
+
+    if (all(a[0][-1] < b[0][0] for a, b in zip(parts, parts[1:]))
+            and all(len(set(part[0])) == len(part[0]) for part in parts)):
+        # No duplicates and the chunks do not overlap: concatenating them keeps emp_id order
+        for chunk_ids, chunk_names, chunk_joining, chunk_salaries, _, _ in parts:
+            ids.extend(chunk_ids)
+            names.extend(chunk_names)
+            joining.extend(chunk_joining)
+            salaries.extend(chunk_salaries)
+    else:
+        rows = heapq.merge(*(zip(part[0], [part[5] + line for line in part[4]], range(len(part[0])),
+                                 [n] * len(part[0]))
+                             for n, part in enumerate(parts)))
+        kept_line = None
+        for key, line, row, n in rows:
+            if ids and ids[-1] == key:
+                errors.append((line, f"Duplicate emp_id {id_format.format(key)} "
+                                     f"(first seen on line {kept_line})."))
+                continue
+            kept_line = line
+            ids.append(key)
+            names.append(parts[n][1][row])
+            joining.append(parts[n][2][row])
+            salaries.append(parts[n][3][row])
+
+    errors.sort()
+    table = EmployeeColumns.from_columns(ids, names, joining, salaries, id_format.prefix, id_format.width)
+    return table, errors
+
+
+def stream_blocks(file, size=STREAM_BYTES):
+    """Yield about size bytes of a binary file at a time, cut after a newline"""
+    while True:
+        lines = file.readlines(size)
+        if not lines:
+            return
+        yield b"".join(lines)
+
+
+def load_employee_csv(path, workers=None, id_format=EMP_IDS):
+    """Parse an employees.csv file into (EmployeeColumns, [(line, message)]).
+
+    workers defaults to the number of CPUs; files under PARALLEL_MIN_BYTES
+    (or workers=1) and compressed files are parsed in this process.
+    """
+    if is_compressed(path):
+        with open_binary(path) as file:
+            return _merge([parse_bytes(block, id_format) for block in stream_blocks(file)], id_format)
+
+    workers = workers or os.cpu_count() or 1
+    size = os.path.getsize(path)
+    if workers == 1 or size < PARALLEL_MIN_BYTES:
+        return _merge([parse_range(path, 0, size, id_format)], id_format)
+
+    ranges = split_ranges(path, workers * CHUNKS_PER_WORKER)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunks = list(executor.map(parse_range, [path] * len(ranges), *zip(*ranges),
+                                   [id_format] * len(ranges)))
+    return _merge(chunks, id_format)
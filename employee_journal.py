@@ -0,0 +1,147 @@
+import json
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+
+from employee_metrics import instrument, metrics
+
+#------------------ Atomic snapshot writes ------------------
+
+@contextmanager
+def atomic_write(path, mode="w", **kwargs):
+    """Write to a temp file next to path, then rename it over path.
+
+    Readers see either the old file or the complete new one, never a
+    half-written file.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=directory)
+    try:
+        # mkstemp creates the file 0600; give it the permissions the file
+        # already had, or what open() would have used for a new file
+        if os.path.exists(path):
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o777)
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(tmp_path, 0o666 & ~umask)
+        with os.fdopen(fd, mode, **kwargs) as file:
+            yield file
+            file.flush()
+            metrics.add_bytes(file.tell())
+            os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+#------------------ Write-ahead journal ------------------
+
+class Journal:
+    """Append-only log of operations, one JSON record per line.
+
+    Records are buffered and made durable together (group commit): the
+    file is fsynced once every `sync_every` records or `sync_interval`
+    seconds, whichever comes first, and on commit()/close().
+    """
+
+    def __init__(self, path, sync_every=64, sync_interval=1.0):
+        self.path = path
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.records = 0  # records written since the last reset
+        self._file = None
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def open(self):
+        if self._file is None:
+            self._file = open(self.path, mode="a", encoding="utf-8")
+
+    def append(self, op, **fields):
+        self.open()
+        fields["op"] = op
+        line = json.dumps(fields, separators=(",", ":")) + "\n"
+        self._file.write(line)
+        if metrics.enabled:
+            metrics.add_bytes(len(line.encode("utf-8")))
+        self._pending += 1
+        self.records += 1
+        if (self._pending >= self.sync_every
+                or time.monotonic() - self._last_sync >= self.sync_interval):
+            self.commit()
+
+    def append_many(self, op, records):
+        """Append a whole batch in one write and one fsync"""
+        self.open()
+        lines = []
+        for fields in records:
+            fields["op"] = op
+            lines.append(json.dumps(fields, separators=(",", ":")) + "\n")
+        data = "".join(lines)
+        self._file.write(data)
+        if metrics.enabled:
+            metrics.add_bytes(len(data.encode("utf-8")))
+        self._pending += len(lines)
+        self.records += len(lines)
+        self.commit()
+
+    def flush(self):
+        """Hand buffered records to the OS so other processes can read them"""
+        if self._file is not None:
+            self._file.flush()
+
+    @instrument("journal_commit")
+    def commit(self):
+        """Flush and fsync every buffered record in one go"""
+        if self._file is None or not self._pending:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def replay(self, start=0):
+        """Yield the journal records in order, from byte offset start.
+
+        A torn last line left by a crash mid-append is ignored. start is
+        a size() seen earlier, to read only what was appended since.
+        """
+        if not os.path.exists(self.path):
+            return
+        count = 0
+        with open(self.path, mode="rb") as file:
+            file.seek(start)
+            for line in file:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                count += 1
+                yield record
+        self.records = self.records + count if start else count
+
+    def size(self):
+        """Bytes handed to the OS so far: where the next record will start"""
+        try:
+            return os.path.getsize(self.path)
+        except FileNotFoundError:
+            return 0
+
+    def reset(self):
+        """Empty the journal once its records are safe in a snapshot"""
+        self.close()
+        with open(self.path, mode="w", encoding="utf-8") as file:
+            os.fsync(file.fileno())
+        self.records = 0
+
+    def close(self):
+        if self._file is not None:
+            self.commit()
+            self._file.close()
+            self._file = None
@@ -0,0 +1,135 @@
+"""Locks for running several threads or operators against one data set.
+
+    RWLock    many readers or one writer inside a process
+    FileLock  advisory fcntl lock shared by every process using a data set;
+              it also stores the data set's generation number, which goes
+              up on every write, so a process can tell its copy is stale
+"""
+import os
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, a single operator only
+    fcntl = None
+
+
+class ConflictError(OSError):
+    """Another process changed the data since this process last read it"""
+
+
+#------------------ In-process readers-writer lock ------------------
+
+class RWLock:
+    """Any number of readers, or one writer.
+
+    Waiting writers block new readers, so a steady stream of readers
+    cannot starve a writer. The writer may re-enter read() and write().
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = None  # thread holding the write lock
+        self._depth = 0      # re-entries of the writer
+        self._waiting = 0    # writers waiting for the lock
+
+    @contextmanager
+    def read(self):
+        me = threading.get_ident()
+        if self._writer == me:
+            yield
+            return
+        with self._cond:
+            while self._writer is not None or self._waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self):
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._depth += 1
+            else:
+                self._waiting += 1
+                while self._writer is not None or self._readers:
+                    self._cond.wait()
+                self._waiting -= 1
+                self._writer = me
+                self._depth = 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._depth -= 1
+                if not self._depth:
+                    self._writer = None
+                    self._cond.notify_all()
+
+
+#------------------ Cross-process file lock ------------------
+
+class FileLock:
+    """Advisory lock file holding the data set's generation number.
+
+    with lock.exclusive() as generation: ... ; lock.bump()
+    Only cooperating processes (ones that use the same lock file) are
+    excluded; fcntl locks are released by the OS if a process dies.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+        self._lock = threading.Lock()  # fcntl locks are per process, not per thread
+
+    def _open(self):
+        if self._file is None:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o666)
+            self._file = os.fdopen(fd, mode="r+", encoding="ascii")
+
+    def _read(self):
+        self._file.seek(0)
+        text = self._file.read().strip()
+        return int(text) if text else 0
+
+    @contextmanager
+    def _locked(self, mode):
+        with self._lock:
+            self._open()
+            if fcntl:
+                fcntl.flock(self._file.fileno(), mode)
+            try:
+                yield self._read()
+            finally:
+                if fcntl:
+                    fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+    def shared(self):
+        """Hold the lock for reading; yields the current generation"""
+        return self._locked(fcntl.LOCK_SH if fcntl else None)
+
+    def exclusive(self):
+        """Hold the lock for writing; yields the current generation"""
+        return self._locked(fcntl.LOCK_EX if fcntl else None)
+
+    def bump(self, generation):
+        """Record a new generation; call it while holding exclusive()"""
+        self._file.seek(0)
+        self._file.truncate()
+        self._file.write(f"{generation + 1}\n")
+        self._file.flush()
+        return generation + 1
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,239 @@
+"""Opt-in timing of the hot paths: call counts, latency histograms, rows
+touched and bytes written per operation.
+
+Instrumented functions cost one flag check while metrics are off. Turn
+them on with metrics.enable(), the --metrics flag of the assignments or
+EMPLOYEE_METRICS=1 in the environment. The numbers can be shown as a
+table, dumped as JSON or in the Prometheus text format, and
+profile_call() runs a single command under cProfile (in --batch mode add
+"profile": true to a command).
+"""
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import threading
+import time
+
+# Upper bounds (seconds) of the latency histogram buckets
+BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+class Operation:
+    __slots__ = ("count", "seconds", "rows", "bytes", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.rows = 0
+        self.bytes = 0
+        self.buckets = [0] * (len(BUCKETS) + 1)  # the last one is +Inf
+
+
+class Metrics:
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._operations = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()  # stack of the operations running in this thread
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self._operations = {}
+
+    #------------------ Recording ------------------
+
+    def instrument(self, name, rows=None):
+        """Decorator timing every call as operation name.
+
+        rows, if given, maps the return value to the number of rows touched.
+        """
+        def decorate(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                stack = self._stack()
+                stack.append([0, 0])
+                result = None
+                started = time.perf_counter()
+                try:
+                    result = function(*args, **kwargs)
+                    return result
+                finally:
+                    elapsed = time.perf_counter() - started
+                    touched, written = stack.pop()
+                    if rows is not None and result is not None:
+                        touched += rows(result)
+                    if stack:
+                        # Bytes a nested operation wrote were written for its
+                        # caller too; rows are not, or a load would count its
+                        # rows once per layer
+                        stack[-1][1] += written
+                    self.observe(name, elapsed, touched, written)
+            return wrapper
+        return decorate
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def add_rows(self, count):
+        """Count rows touched by the innermost running operation"""
+        if self.enabled:
+            stack = self._stack()
+            if stack:
+                stack[-1][0] += count
+
+    def add_bytes(self, count):
+        """Count bytes written by the innermost running operation"""
+        if self.enabled:
+            stack = self._stack()
+            if stack:
+                stack[-1][1] += count
+
+    def observe(self, name, seconds, rows=0, nbytes=0):
+        bucket = 0
+        while bucket < len(BUCKETS) and seconds > BUCKETS[bucket]:
+            bucket += 1
+        with self._lock:
+            operation = self._operations.get(name)
+            if operation is None:
+                operation = self._operations[name] = Operation()
+            operation.count += 1
+            operation.seconds += seconds
+            operation.rows += rows
+            operation.bytes += nbytes
+            operation.buckets[bucket] += 1
+
+    #------------------ Reporting ------------------
+
+    def snapshot(self):
+        """{operation: {...}} with cumulative histogram buckets"""
+        with self._lock:
+            operations = sorted(self._operations.items())
+            result = {}
+            for name, op in operations:
+                cumulative, total = {}, 0
+                for bound, count in zip(BUCKETS + ("+Inf",), op.buckets):
+                    total += count
+                    cumulative[str(bound)] = total
+                result[name] = {"count": op.count, "seconds": op.seconds, "rows": op.rows,
+                                "bytes_written": op.bytes, "buckets": cumulative}
+        return result
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self, prefix="employee"):
+        lines = [f"# HELP {prefix}_operation_seconds Time spent in each operation.",
+                 f"# TYPE {prefix}_operation_seconds histogram"]
+        snapshot = self.snapshot()
+        for name, op in snapshot.items():
+            for bound, count in op["buckets"].items():
+                lines.append(f'{prefix}_operation_seconds_bucket{{operation="{name}",le="{bound}"}} {count}')
+            lines.append(f'{prefix}_operation_seconds_sum{{operation="{name}"}} {op["seconds"]}')
+            lines.append(f'{prefix}_operation_seconds_count{{operation="{name}"}} {op["count"]}')
+        for metric, key, text in (("rows", "rows", "Rows touched by each operation."),
+                                  ("bytes_written", "bytes_written", "Bytes written by each operation.")):
+            lines.append(f"# HELP {prefix}_operation_{metric}_total {text}")
+            lines.append(f"# TYPE {prefix}_operation_{metric}_total counter")
+            for name, op in snapshot.items():
+                lines.append(f'{prefix}_operation_{metric}_total{{operation="{name}"}} {op[key]}')
+        return "\n".join(lines) + "\n"
+
+    def percentile(self, name, p):
+        """Upper bound of the bucket holding the p-th percentile call"""
+        with self._lock:
+            op = self._operations.get(name)
+            if op is None or not op.count:
+                return None
+            target, total = op.count * p / 100, 0
+            for bound, count in zip(BUCKETS + (float("inf"),), op.buckets):
+                total += count
+                if total >= target:
+                    return bound
+
+    def format_table(self):
+        snapshot = self.snapshot()
+        if not snapshot:
+            return "No operations recorded yet." if self.enabled else "Metrics are off."
+        lines = ["{:<28} {:>7} {:>10} {:>10} {:>10} {:>10} {:>12}".format(
+            "Operation", "Calls", "Total ms", "Mean ms", "p99 <= ms", "Rows", "Bytes")]
+        lines.append("-" * 93)
+        for name, op in snapshot.items():
+            p99 = self.percentile(name, 99)
+            lines.append("{:<28} {:>7} {:>10.2f} {:>10.3f} {:>10} {:>10} {:>12}".format(
+                name, op["count"], op["seconds"] * 1000, op["seconds"] * 1000 / op["count"],
+                "inf" if p99 == float("inf") else f"{p99 * 1000:g}", op["rows"], op["bytes_written"]))
+        return "\n".join(lines)
+
+
+metrics = Metrics(enabled=os.environ.get("EMPLOYEE_METRICS", "") not in ("", "0"))
+instrument = metrics.instrument
+
+
+def profile_call(function, *args, limit=25, sort="cumulative", **kwargs):
+    """Run one call under cProfile; return (result, report text)"""
+    profiler = cProfile.Profile()
+    result = profiler.runcall(function, *args, **kwargs)
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats(sort).print_stats(limit)
+    return result, out.getvalue()
+
+
+#------------------ Menu and batch access ------------------
+
+def metrics_command(format="json"):
+    """Headless "metrics" command: the snapshot, or Prometheus text"""
+    if format == "prometheus":
+        return metrics.to_prometheus()
+    if format != "json":
+        raise ValueError("format must be 'json' or 'prometheus'")
+    return metrics.snapshot()
+
+
+def metrics_menu():
+    """Menu option: show the table, then dump it or switch metrics on/off"""
+    print("\n" + metrics.format_table())
+    while True:
+        print("""
+1. Save as JSON
+2. Save in Prometheus text format
+3. Turn metrics {}
+4. Reset
+0. Back""".format("off" if metrics.enabled else "on"))
+        choice = input("Choose: ").strip()
+        if choice == "0":
+            return
+        if choice in ("1", "2"):
+            default = "metrics.json" if choice == "1" else "metrics.prom"
+            path = input(f"File name [{default}]: ").strip() or default
+            text = metrics.to_json() if choice == "1" else metrics.to_prometheus()
+            try:
+                with open(path, mode="w", encoding="utf-8") as file:
+                    file.write(text)
+                print(f"Saved to {path}")
+            except OSError as e:
+                print(f"Cannot save: {e}")
+        elif choice == "3":
+            if metrics.enabled:
+                metrics.disable()
+            else:
+                metrics.enable()
+            print("Metrics are " + ("on." if metrics.enabled else "off."))
+        elif choice == "4":
+            metrics.reset()
+            print("Metrics cleared.")
+        else:
+            print("Invalid choice.")
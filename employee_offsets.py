@@ -0,0 +1,273 @@
+"""Sidecar offset index of an employees.csv file: emp_id -> byte offset.
+
+Layout (little-endian, 8-byte aligned):
+
+    header   magic "EMPOFFS\\0", version (u16), size of the CSV (u64),
+             its modification time (i64, ns), row count (u64), next id (u64),
+             unread row count (u64)
+    ids      int64[rows]    numeric part of emp_id, ascending
+    offsets  int64[rows]    byte offset of each row in the CSV
+    unread   int64[unread]  byte offset of each row the index left out
+    lengths  int64[unread]  and its length in bytes
+
+Building the index reads and validates every row once. After that,
+OffsetIndex memory-maps both files: opening costs the same for ten rows
+or ten million, and a row is found with a bisect over the mapped ids and
+decoded from its line. The index belongs to one version of the CSV; when
+the CSV's size or modification time no longer match, it is rebuilt.
+A quoted field may hold a line break, so a row can span several lines.
+
+Rows that cannot be read (or repeat an emp_id) are listed too, so that
+rewriting the CSV can carry them over verbatim instead of losing them.
+"""
+import csv
+import math
+import mmap
+import os
+import struct
+import threading
+from array import array
+from bisect import bisect_left
+
+from employee_dates import parse_date
+from employee_ids import EMP_IDS
+from employee_journal import atomic_write
+from employee_metrics import instrument, metrics
+
+MAGIC = b"EMPOFFS\0"
+VERSION = 2
+HEADER = struct.Struct("<8sH6xQqQQQ")
+
+
+def _fields(text):
+    """The fields of one CSV line; only quoted lines go through the csv module"""
+    if '"' in text:
+        return next(csv.reader([text]), [])
+    return text.split(",")
+
+
+def parse_row(text, id_format=EMP_IDS):
+    """(number, name, joining_date, salary) of one line, or ValueError"""
+    row = _fields(text.rstrip("\r\n"))
+    if len(row) != 4:
+        raise ValueError(f"Expected 4 fields (emp_id, name, joining_date, salary), got {len(row)}.")
+    emp_id, name, joining_date, salary = row
+    number = id_format.parse(emp_id)
+    if not name or name.isspace():
+        raise ValueError("Name cannot be empty.")
+    if "\0" in name:
+        raise ValueError("Name cannot contain NUL characters.")
+    try:
+        parse_date(joining_date)
+    except ValueError:
+        raise ValueError(f"Invalid date format {joining_date!r}. Please use dd/mm/yyyy.")
+    try:
+        salary = float(salary)
+    except ValueError:
+        raise ValueError(f"Salary must be a number, got {salary!r}.")
+    if not math.isfinite(salary):
+        raise ValueError(f"Salary must be a finite number, got {salary!r}.")
+    return number, name, joining_date, salary
+
+
+def _records(file):
+    """Yield (first line number, offset, raw bytes) of each row of a binary file.
+
+    A line with an unbalanced quote continues on the next one, as the csv
+    module reads it.
+    """
+    offset = 0
+    start = first = None
+    parts = []
+    quotes = 0
+    for number, raw in enumerate(file, start=1):
+        if not parts:
+            start, first = offset, number
+        parts.append(raw)
+        quotes += raw.count(b'"')
+        offset += len(raw)
+        if quotes % 2 == 0:
+            yield first, start, b"".join(parts)
+            parts = []
+            quotes = 0
+    if parts:
+        yield first, start, b"".join(parts)
+
+
+#------------------ Build ------------------
+
+@instrument("build_offset_index")
+def build_index(csv_path, index_path, id_format=EMP_IDS):
+    """Scan csv_path once and write its offset index.
+
+    Returns [(line, message)] for the rows the index leaves out.
+    """
+    entries = []  # (number, line, offset, length)
+    errors = []
+    unread, lengths = array("q"), array("q")
+    highest = 0  # largest id in an unread row, kept out of next_id
+    with open(csv_path, mode="rb") as file:
+        stat = os.fstat(file.fileno())
+        for line, offset, raw in _records(file):
+            if raw.strip():
+                try:
+                    entries.append((parse_row(raw.decode("utf-8"), id_format)[0], line, offset, len(raw)))
+                    continue
+                except UnicodeDecodeError:
+                    errors.append((line, "Not valid UTF-8 text."))
+                except ValueError as e:
+                    errors.append((line, str(e)))
+                try:
+                    highest = max(highest, id_format.parse(_fields(raw.decode("utf-8", "replace"))[0]))
+                except (IndexError, ValueError):
+                    pass
+                unread.append(offset)
+                lengths.append(len(raw))
+
+    entries.sort()
+    ids, offsets = array("q"), array("q")
+    for key, line, offset, length in entries:
+        if ids and ids[-1] == key:
+            errors.append((line, f"Duplicate emp_id {id_format.format(key)} (first seen on line {kept_line})."))
+            unread.append(offset)
+            lengths.append(length)
+            continue
+        kept_line = line
+        ids.append(key)
+        offsets.append(offset)
+
+    with atomic_write(index_path, mode="wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, stat.st_size, stat.st_mtime_ns, len(ids),
+                               max(ids[-1] if ids else 0, highest) + 1, len(unread)))
+        for column in (ids, offsets, unread, lengths):
+            file.write(column.tobytes())
+    metrics.add_rows(len(ids))
+    errors.sort()
+    return errors
+
+
+#------------------ Read ------------------
+
+class OffsetIndex:
+    """A memory-mapped employees.csv and its offset index.
+
+    errors lists the rows left out when the index had to be (re)built
+    by this call, and is empty when an up-to-date index was reused.
+    """
+
+    def __init__(self, csv_path, index_path, id_format=EMP_IDS):
+        self.id_format = id_format
+        self.errors = []
+        self._readers = 0       # acquire() calls not released yet
+        self._retired = False
+        self._lock = threading.Lock()
+        self._csv = self._index = None
+        self._csv_map = self._index_map = None
+        self.next_id = 1
+        self.ids = self.offsets = self.unread = self.lengths = ()
+        if not os.path.exists(csv_path):
+            return
+
+        self._csv = open(csv_path, mode="rb")
+        stat = os.fstat(self._csv.fileno())
+        if not self._current(index_path, stat):
+            self.errors = build_index(csv_path, index_path, id_format)
+        self._index = open(index_path, mode="rb")
+        self._index_map = mmap.mmap(self._index.fileno(), 0, access=mmap.ACCESS_READ)
+        _, _, _, _, rows, self.next_id, unread = HEADER.unpack_from(self._index_map)
+        view = memoryview(self._index_map)
+        start = HEADER.size
+        columns = []
+        for count in (rows, rows, unread, unread):
+            columns.append(view[start:start + 8 * count].cast("q"))
+            start += 8 * count
+        self.ids, self.offsets, self.unread, self.lengths = columns
+        view.release()
+        if stat.st_size:  # an empty file cannot be mapped
+            self._csv_map = mmap.mmap(self._csv.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @staticmethod
+    def _current(index_path, stat):
+        """Does index_path exist and describe this exact version of the CSV?"""
+        try:
+            with open(index_path, mode="rb") as file:
+                header = file.read(HEADER.size)
+                if len(header) < HEADER.size:
+                    return False
+                magic, version, size, mtime, rows, _, unread = HEADER.unpack(header)
+                file.seek(0, os.SEEK_END)
+                length = file.tell()
+        except (OSError, struct.error):
+            return False
+        return (magic == MAGIC and version == VERSION and size == stat.st_size
+                and mtime == stat.st_mtime_ns and length == HEADER.size + 16 * (rows + unread))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def offset(self, number):
+        """Byte offset of the row with this numeric id, or None"""
+        i = bisect_left(self.ids, number)
+        if i < len(self.ids) and self.ids[i] == number:
+            return self.offsets[i]
+        return None
+
+    def __contains__(self, number):
+        return self.offset(number) is not None
+
+    def _end(self, offset):
+        """Where the row starting at offset ends; quoted line breaks are inside it"""
+        end = offset
+        while True:
+            end = self._csv_map.find(b"\n", end)
+            if end < 0:
+                return len(self._csv_map)
+            end += 1
+            if self._csv_map[offset:end].count(b'"') % 2 == 0:
+                return end
+
+    def row_at(self, offset):
+        """(number, name, joining_date, salary) of the row starting at offset"""
+        return parse_row(self._csv_map[offset:self._end(offset)].decode("utf-8"), self.id_format)
+
+    def find(self, number):
+        offset = self.offset(number)
+        return None if offset is None else self.row_at(offset)
+
+    def rows(self):
+        """Every indexed row, in emp_id order"""
+        for offset in self.offsets:
+            yield self.row_at(offset)
+
+    def unread_rows(self):
+        """The raw bytes of every row the index left out, in file order"""
+        for offset, length in sorted(zip(self.unread, self.lengths)):
+            yield self._csv_map[offset:offset + length]
+
+    def acquire(self):
+        """Keep the index open for a reader that outlives the caller's lock"""
+        with self._lock:
+            self._readers += 1
+
+    def release(self):
+        with self._lock:
+            self._readers -= 1
+            idle = self._retired and not self._readers
+        if idle:
+            self.close()
+
+    def retire(self):
+        """Close the index now, or when its last acquired reader releases it"""
+        with self._lock:
+            self._retired = True
+            idle = not self._readers
+        if idle:
+            self.close()
+
+    def close(self):
+        for view in (self.ids, self.offsets, self.unread, self.lengths):
+            if isinstance(view, memoryview):
+                view.release()
+        for handle in (self._csv_map, self._index_map, self._csv, self._index):
+            if handle is not None:
+                handle.close()
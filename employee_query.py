@@ -0,0 +1,229 @@
+"""Composable employee filters, answered from an EmployeeStore's indexes.
+
+    query = (Query().between("salary", low=5000)
+                    .between("joining_ordinal", parse_date("01/01/2019"), parse_date("31/12/2021"))
+                    .equals("department", "Sales")
+                    .limit(20))
+    for record in query.run(employees):
+        ...
+
+Ranges are inclusive and either end may be left open; name equality
+ignores case, like EmployeeStore.find_by_name. A Query is immutable:
+every method returns a new one, so a base filter can be shared.
+
+run() plans before it reads. Each predicate on a field with a
+SortedIndex is counted with two bisects, name equality with the
+NameIndex, and the smallest candidate set drives the scan; the other
+predicates are checked record by record. Without any usable index the
+store is scanned. Records are produced lazily, a batch at a time, so a
+caller that stops early never pays for the rest.
+"""
+from contextlib import nullcontext
+from itertools import islice
+
+BATCH = 256       # index entries read per lock acquisition
+SORT_FACTOR = 4   # walk the order's index unless another one is this much narrower
+
+
+class Query:
+    """Range and equality predicates plus ordering, offset and limit"""
+
+    def __init__(self):
+        self.ranges = {}     # field -> (low, high), None for an open end
+        self.equal = {}      # field -> value
+        self.order = None    # (field, descending)
+        self.skip = 0
+        self.take = None
+        self.empty = False   # contradictory equalities: nothing can match
+
+    def _copy(self):
+        query = Query()
+        query.ranges = dict(self.ranges)
+        query.equal = dict(self.equal)
+        query.order = self.order
+        query.skip = self.skip
+        query.take = self.take
+        query.empty = self.empty
+        return query
+
+    def __repr__(self):
+        return (f"Query(ranges={self.ranges!r}, equal={self.equal!r}, order={self.order!r}, "
+                f"offset={self.skip}, limit={self.take})")
+
+    #------------------ Building ------------------
+
+    def between(self, field, low=None, high=None):
+        """low <= field <= high; a second range on a field narrows the first"""
+        query = self._copy()
+        old_low, old_high = query.ranges.get(field, (None, None))
+        if old_low is not None and (low is None or old_low > low):
+            low = old_low
+        if old_high is not None and (high is None or old_high < high):
+            high = old_high
+        query.ranges[field] = (low, high)
+        return query
+
+    def equals(self, field, value):
+        """field == value; two different values for one field match nothing"""
+        query = self._copy()
+        if field in query.equal and not self._same(field, query.equal[field], value):
+            query.empty = True
+        query.equal[field] = value
+        return query
+
+    def order_by(self, field, descending=False):
+        """Return records in field order (otherwise the order of the driving index)"""
+        query = self._copy()
+        query.order = (field, descending)
+        return query
+
+    def offset(self, count):
+        query = self._copy()
+        query.skip = max(0, int(count))
+        return query
+
+    def limit(self, count):
+        query = self._copy()
+        query.take = None if count is None else max(0, int(count))
+        return query
+
+    def fields(self):
+        """Every field the query reads"""
+        fields = set(self.ranges) | set(self.equal)
+        if self.order:
+            fields.add(self.order[0])
+        return fields
+
+    #------------------ Matching ------------------
+
+    @staticmethod
+    def _same(field, a, b):
+        if field == "name":
+            return a.casefold() == b.casefold()
+        return a == b
+
+    def bounds(self, field):
+        """(low, high) a record's field must lie in, merging equality into the range"""
+        low, high = self.ranges.get(field, (None, None))
+        if field in self.equal and field != "name":
+            value = self.equal[field]
+            low = value if low is None or low < value else low
+            high = value if high is None or high > value else high
+        return low, high
+
+    def matches(self, record, getter=getattr):
+        for field, (low, high) in self.ranges.items():
+            value = getter(record, field)
+            if (low is not None and value < low) or (high is not None and value > high):
+                return False
+        for field, value in self.equal.items():
+            if not self._same(field, getter(record, field), value):
+                return False
+        return True
+
+    def _page(self, records):
+        stop = None if self.take is None else self.skip + self.take
+        return islice(records, self.skip, stop)
+
+    def _sorted(self, records, getter):
+        field, descending = self.order
+        return sorted(records, key=lambda record: getter(record, field), reverse=descending)
+
+    def apply(self, records, getter=getattr):
+        """Filter, order and page records that did not come from an index"""
+        records = (record for record in records if self.matches(record, getter))
+        if self.order:
+            records = self._sorted(records, getter)
+        return self._page(records)
+
+    #------------------ Planning ------------------
+
+    def plan(self, store):
+        """(estimated rows, kind, field) of the cheapest access path.
+
+        kind is "range" (scan a SortedIndex between bounds), "name" (the
+        NameIndex bucket), "scan" (every record) or "none".
+        """
+        if self.empty or self.take == 0:
+            return 0, "none", None
+        best = (len(store), "scan", None)
+        for field in sorted(self.fields()):
+            if field == "name" and "name" in self.equal:
+                rows = len(store.find_by_name(self.equal["name"]))
+                kind = "name"
+            else:
+                index = store.sorted_index(field)
+                if index is None:
+                    continue
+                rows = index.count(*self.bounds(field))
+                kind = "range"
+            if rows < best[0]:
+                best = (rows, kind, field)
+        if self.order:
+            # Walking the order's index streams the results; any other
+            # path has to collect and sort them first
+            field = self.order[0]
+            index = store.sorted_index(field)
+            if index is not None:
+                rows = index.count(*self.bounds(field))
+                if rows <= best[0] * SORT_FACTOR:
+                    best = (rows, "range", field)
+        return best
+
+    def explain(self, store):
+        rows, kind, field = self.plan(store)
+        if kind == "range":
+            return f"range scan on {field} (~{rows} rows)"
+        if kind == "name":
+            return f"name lookup (~{rows} rows)"
+        if kind == "none":
+            return "no rows can match"
+        return f"full scan ({rows} rows)"
+
+    #------------------ Running ------------------
+
+    def run(self, store, lock=None, batch=BATCH):
+        """Yield the matching records of an EmployeeStore.
+
+        lock, if given, is called for a context manager guarding the
+        store (e.g. RWLock.read); it is held while a batch is read and
+        released before the batch is yielded, so a slow consumer never
+        blocks writers. A record changed between batches may be seen in
+        its old or its new place.
+        """
+        return self._page(self._records(store, lock or nullcontext, batch))
+
+    def _records(self, store, lock, batch):
+        with lock():
+            rows, kind, field = self.plan(store)
+        if kind == "none":
+            return
+        records = self._scan(store, lock, batch, kind, field)
+        if self.order and self.order[0] != field:
+            records = self._sorted(records, store.getter)
+        yield from records
+
+    def _scan(self, store, lock, batch, kind, field):
+        getter = store.getter
+        if kind != "range":
+            with lock():
+                records = store.find_by_name(self.equal["name"]) if kind == "name" else list(store)
+                records = [record for record in records if self.matches(record, getter)]
+            yield from records
+            return
+
+        # Keyset pagination: each batch resumes after the last entry seen,
+        # so changes made between batches cannot shift it
+        index = store.sorted_index(field)
+        low, high = self.bounds(field)
+        reverse = self.order is not None and self.order[0] == field and self.order[1]
+        after = None
+        while True:
+            with lock():
+                entries = index.scan(low, high, after, batch, reverse)
+                found = [store.find(emp_id) for _, emp_id in entries]
+                found = [record for record in found if record is not None and self.matches(record, getter)]
+            yield from found
+            if len(entries) < batch:
+                return
+            after = entries[-1]
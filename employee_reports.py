@@ -0,0 +1,142 @@
+"""Employee listings and reports: rendered once, written a page at a time.
+
+    reports = ReportCache(lambda: employees.generation)
+    lines = reports.get(("report", "text"), lambda: render(rows(), FIELDS, line=LINE, header=HEADER))
+    show(lines)                         # to the terminal, a page at a time
+    save("report.csv.gz", render(rows(), FIELDS, "csv"))
+
+render() turns rows into the lines of a text table, a CSV file or a JSON
+array. show() writes them with one write() per page instead of one
+print() per employee, which is where a large listing used to spend its
+time. save() writes them to a file atomically, compressed if the name
+ends in .gz, .bz2 or .xz (see employee_compression).
+
+ReportCache keeps rendered reports keyed on a generation counter that
+goes up on every change to the employees, so showing unchanged data
+again costs no rendering at all; the first change drops every report.
+"""
+import csv
+import io
+import json
+import os
+import shutil
+import sys
+from collections import OrderedDict
+
+from employee_compression import codec_for_name, write_text
+
+FORMATS = ("text", "csv", "json")
+SAVE_LINES = 4096  # lines joined per write() when saving
+
+
+#------------------ Rendering ------------------
+
+def render(rows, fields, format="text", line=None, header=(), footer=()):
+    """The lines of a report over rows, tuples of values in fields order.
+
+    text formats each row with line (a str.format template, the values
+    separated by commas by default) between the header and footer
+    lines; csv and json name the columns after fields instead.
+    """
+    if format == "text":
+        template = line or ", ".join("{}" for _ in fields)
+        lines = list(header)
+        lines.extend(template.format(*row) for row in rows)
+        lines.extend(footer)
+        return lines
+    if format == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(fields)
+        writer.writerows(rows)
+        return buffer.getvalue().split("\n")[:-1]
+    if format == "json":
+        lines = [json.dumps(dict(zip(fields, row)), ensure_ascii=False) + "," for row in rows]
+        if lines:
+            lines[-1] = lines[-1][:-1]
+        return ["["] + lines + ["]"]
+    raise ValueError(f"Unknown report format {format!r}, use one of {', '.join(FORMATS)}")
+
+
+def format_for(path):
+    """The report format a file name asks for: .csv, .json, anything else text"""
+    path = str(path).lower()
+    codec = codec_for_name(path)
+    if codec is not None:
+        path = path[:-len(next(ext for ext in codec.extensions if path.endswith(ext)))]
+    extension = os.path.splitext(path)[1]
+    return {".csv": "csv", ".json": "json"}.get(extension, "text")
+
+
+#------------------ Output ------------------
+
+def show(lines, out=None, page_size=None, ask=input):
+    """Write lines to out (stdout) a page at a time, one write() per page.
+
+    page_size None fits the pages to the terminal, or writes everything
+    at once when out is not a terminal; 0 never pages. Between pages
+    ask() prompts for Enter to go on or q to stop.
+    """
+    out = out or sys.stdout
+    if page_size is None:
+        page_size = shutil.get_terminal_size().lines - 1 if out.isatty() else 0
+    if not page_size or len(lines) <= page_size:
+        if lines:
+            out.write("\n".join(lines) + "\n")
+        return
+    for start in range(0, len(lines), page_size):
+        end = start + page_size
+        out.write("\n".join(lines[start:end]) + "\n")
+        if end < len(lines):
+            out.flush()
+            answer = ask(f"-- {end} of {len(lines)} lines: Enter for more, q to stop -- ")
+            if answer.strip().lower() == "q":
+                return
+
+
+def save(path, lines):
+    """Write lines to path atomically (compressed by extension); return the line count"""
+    with write_text(path) as file:
+        for start in range(0, len(lines), SAVE_LINES):
+            file.write("\n".join(lines[start:start + SAVE_LINES]) + "\n")
+    return len(lines)
+
+
+#------------------ Cache ------------------
+
+class ReportCache:
+    """Rendered reports, valid while generation() returns the same value.
+
+    generation is called on every lookup; when it changes (the employees
+    were changed) every cached report is dropped. At most size reports
+    are kept, the least recently used going first.
+    """
+
+    def __init__(self, generation, size=8):
+        self.generation = generation
+        self.size = size
+        self.hits = self.misses = 0
+        self._generation = None
+        self._reports = OrderedDict()
+
+    def get(self, key, render):
+        """The report cached under key, calling render() to build it if needed"""
+        # Read before rendering: a change made while rendering leaves the
+        # report filed under the old generation, and the next get drops it
+        generation = self.generation()
+        if generation != self._generation:
+            self._reports.clear()
+            self._generation = generation
+        if key in self._reports:
+            self.hits += 1
+            self._reports.move_to_end(key)
+            return self._reports[key]
+        self.misses += 1
+        report = self._reports[key] = render()
+        if len(self._reports) > self.size:
+            self._reports.popitem(last=False)
+        return report
+
+    def clear(self):
+        self._reports.clear()
+        self._generation = None
@@ -0,0 +1,169 @@
+import heapq
+import threading
+from collections import Counter
+
+# Each word is padded with START before it is cut into trigrams, so the
+# first trigrams of a word also answer prefix queries
+START = "\x02\x02"
+# A search term ending in PREFIX asks for words starting with the rest
+PREFIX = "*"
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def value_trigrams(value):
+    """Trigrams of a whole field value plus its START-padded words"""
+    grams = trigrams(value)
+    for word in value.split():
+        grams |= trigrams(START + word)
+    return grams
+
+
+def split_term(term):
+    """(text, is_prefix) of a search term; "jo*" asks for words starting with jo"""
+    if len(term) > 1 and term.endswith(PREFIX):
+        return term[:-1], True
+    return term, False
+
+
+def starts_word(value, query):
+    """Whether a word of value starts with query; both already folded"""
+    return (" " + query) in (" " + value)
+
+
+def matcher(term):
+    """A test of one folded value against a search term, as TrigramIndex.search does"""
+    query, is_prefix = split_term(term.casefold())
+    if is_prefix:
+        return lambda value: starts_word(value, query)
+    return lambda value: query in value
+
+
+class TrigramIndex:
+    """Inverted trigram index over case-folded names and emp_ids.
+
+    It is an EmployeeStore index (see EmployeeStore.add_index), so it is
+    kept in sync on every add, update and delete. Lookups only touch the
+    posting sets of the query's trigrams instead of every employee.
+    Records bulk-loaded with add_many are indexed on the first query, so
+    a large load does not pay for search until someone searches.
+    """
+
+    def __init__(self, getter=getattr, fields=("name", "emp_id")):
+        self.getter = getter
+        self.fields = fields
+        self._values = {}    # emp_id -> tuple of folded field values
+        self._grams = {}     # emp_id -> number of distinct trigrams
+        self._postings = {}  # trigram -> set of emp_ids
+        self._pending = {}   # emp_id -> record, bulk-loaded but not indexed yet
+        self._build_lock = threading.Lock()  # readers may trigger the build together
+
+    def _folded(self, record):
+        return tuple(str(self.getter(record, field)).casefold() for field in self.fields)
+
+    def add_many(self, items):
+        self._pending.update(items)
+
+    def _build(self):
+        if not self._pending:
+            return
+        with self._build_lock:
+            # _pending is emptied only once everything is indexed, so a
+            # concurrent reader never sees a half-built index
+            for emp_id, record in self._pending.items():
+                self._index(emp_id, record)
+            self._pending = {}
+
+    def add(self, emp_id, record):
+        if self._pending:
+            self._pending[emp_id] = record
+            return
+        self._index(emp_id, record)
+
+    def _index(self, emp_id, record):
+        values = self._folded(record)
+        grams = set()
+        for value in values:
+            grams |= value_trigrams(value)
+        self._values[emp_id] = values
+        self._grams[emp_id] = len(grams)
+        postings = self._postings
+        for gram in grams:
+            posting = postings.get(gram)
+            if posting is None:
+                postings[gram] = {emp_id}
+            else:
+                posting.add(emp_id)
+
+    def discard(self, emp_id, record):
+        if self._pending.pop(emp_id, None) is not None:
+            return
+        values = self._values.pop(emp_id, ())
+        self._grams.pop(emp_id, None)
+        grams = set()
+        for value in values:
+            grams |= value_trigrams(value)
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.discard(emp_id)
+                if not posting:
+                    del self._postings[gram]
+
+    def _candidates(self, grams):
+        """emp_ids that contain every trigram, smallest posting first"""
+        postings = sorted((self._postings.get(gram, set()) for gram in grams), key=len)
+        if not postings or not postings[0]:
+            return set()
+        result = set(postings[0])
+        for posting in postings[1:]:
+            result &= posting
+            if not result:
+                break
+        return result
+
+    #------------------ Queries ------------------
+
+    def substring(self, query):
+        """emp_ids whose name or emp_id contains query (case-insensitive)"""
+        self._build()
+        query = query.casefold()
+        if len(query) < 3:
+            # Too short to have a trigram: check the folded values directly
+            return {emp_id for emp_id, values in self._values.items()
+                    if any(query in value for value in values)}
+        return {emp_id for emp_id in self._candidates(trigrams(query))
+                if any(query in value for value in self._values[emp_id])}
+
+    def prefix(self, query):
+        """emp_ids with a word of the name or emp_id starting with query (case-insensitive)"""
+        self._build()
+        query = query.casefold()
+        return {emp_id for emp_id in self._candidates(trigrams(START + query))
+                if any(starts_word(value, query) for value in self._values[emp_id])}
+
+    def search(self, term):
+        """substring(term), or prefix() for a term ending in PREFIX ("jo*")"""
+        query, is_prefix = split_term(term)
+        return self.prefix(query) if is_prefix else self.substring(query)
+
+    def fuzzy(self, query, limit=5, min_score=0.4):
+        """Closest matches for a possibly misspelled query, best first.
+
+        Returns (emp_id, score) pairs where score is the share of the
+        query's trigrams found in the employee (1.0 = all of them). Ties go
+        to the employee with fewer trigrams, i.e. the tighter match.
+        """
+        self._build()
+        grams = value_trigrams(query.casefold())
+        if not grams:
+            return []
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._postings.get(gram, ()))
+        scored = ((count / len(grams), -self._grams[emp_id], emp_id)
+                  for emp_id, count in shared.items())
+        best = heapq.nlargest(limit, scored)
+        return [(emp_id, score) for score, _, emp_id in best if score >= min_score]
@@ -0,0 +1,345 @@
+"""Local HTTP/JSON API for the Employee class, built on asyncio streams.
+
+    GET    /employees?search=&sort_by=&descending=&page=&per_page=
+    GET    /employees/E001
+    POST   /employees           {"name": ..., "joining_date": ..., "salary": ...}
+    PATCH  /employees/E001      any of the same fields
+    DELETE /employees/E001
+    GET    /changes?since=&limit=   change events after a sequence number
+    GET    /metrics             Prometheus text (see employee_metrics)
+
+search matches emp_ids and names containing it, or with a word starting
+with it when it ends in * (search=jo*). Lists are paginated: {"items":
+[...], "page": 1, "per_page": 50, "next_page": 2 or null}; changes come
+as {"items": [...], "since": the seq to ask from next time}. Writes are
+coalesced: every create, update and delete that arrives while a batch is
+being saved waits for the next one, and a whole batch is saved with the
+bulk methods in one write (one journal fsync or one SQLite transaction).
+Reads and saves both run in the default thread pool, so neither holds up
+the event loop; the backends' reader-writer locks keep them consistent.
+"""
+import asyncio
+import json
+import signal
+from http import HTTPStatus
+from itertools import islice
+from urllib.parse import parse_qs, urlsplit
+
+from employee_ids import EMP_IDS
+from employee_locks import ConflictError
+from employee_metrics import metrics
+
+DEFAULT_PER_PAGE = 50
+MAX_PER_PAGE = 1000
+MAX_BODY = 1 << 20
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+#------------------ Write coalescing ------------------
+
+class WriteQueue:
+    """Collects write requests and saves them in batches.
+
+    Requests of the same kind that arrive together are saved with one
+    bulk call; the order between different kinds is kept.
+    """
+
+    def __init__(self, employee):
+        self.employee = employee
+        self._queue = asyncio.Queue()
+        self._task = None
+        self.batches = 0  # bulk saves so far
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Save every write queued so far, then end the task"""
+        if self._task is not None:
+            self._queue.put_nowait(None)  # the sentinel: _run returns once it is reached
+            await self._task
+            self._task = None
+
+    def submit(self, op, payload):
+        """Queue a write; the returned future gets its result or exception"""
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((op, payload, future))
+        return future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self._queue.get()]
+            while not self._queue.empty():
+                pending.append(self._queue.get_nowait())
+            stopping = None in pending
+            pending = [item for item in pending if item is not None]
+            for op, batch in self._runs(pending):
+                # The bulk call fsyncs, so it runs off the event loop
+                try:
+                    results = await loop.run_in_executor(None, self._save, op, batch)
+                except Exception as e:
+                    # Only this batch fails; the queue keeps serving the rest
+                    results = [e] * len(batch)
+                self.batches += 1
+                for (_, _, future), result in zip(batch, results):
+                    if future.done():
+                        continue
+                    if isinstance(result, Exception):
+                        future.set_exception(result)
+                    else:
+                        future.set_result(result)
+            if stopping:
+                return
+
+    @staticmethod
+    def _runs(pending):
+        """Split the queue into runs of one op, each emp_id at most once per run"""
+        runs = []
+        seen = set()
+        for item in pending:
+            op, payload, _ = item
+            key = payload.get("emp_id")
+            if not runs or runs[-1][0] != op or key in seen:
+                runs.append((op, []))
+                seen = set()
+            runs[-1][1].append(item)
+            if key is not None:
+                seen.add(key)
+        return runs
+
+    def _save(self, op, batch):
+        """Save one run; return a result or an exception per request"""
+        Employee = self.employee
+        payloads = [payload for _, payload, _ in batch]
+
+        if op == "create":
+            created, errors = Employee.bulk_create(payloads)
+            failed = {number - 1: HttpError(HTTPStatus.BAD_REQUEST, message) for number, message in errors}
+            created = iter(created)
+            return [failed.get(i) or next(created).to_dict() for i in range(len(batch))]
+
+        if op == "update":
+            changes = {payload["emp_id"]: payload["changes"] for payload in payloads}
+            updated, errors = Employee.bulk_update(changes)
+        else:
+            updated, errors = Employee.bulk_delete(payload["emp_id"] for payload in payloads)
+        done = {emp.emp_id: emp.to_dict() for emp in updated}
+        failed = {}
+        for emp_id, message in errors:
+            status = HTTPStatus.NOT_FOUND if message.startswith("No employee") else HTTPStatus.BAD_REQUEST
+            failed[emp_id] = HttpError(status, message)
+        return [done.get(payload["emp_id"]) or failed[payload["emp_id"]] for payload in payloads]
+
+
+#------------------ Request handling ------------------
+
+def _int_param(query, name, default, low, high):
+    values = query.get(name)
+    if not values:
+        return default
+    try:
+        value = int(values[0])
+    except ValueError:
+        raise HttpError(HTTPStatus.BAD_REQUEST, f"{name} must be a whole number")
+    if not low <= value <= high:
+        raise HttpError(HTTPStatus.BAD_REQUEST, f"{name} must be between {low} and {high}")
+    return value
+
+
+class EmployeeApi:
+    """Routes requests to the Employee class"""
+
+    def __init__(self, employee):
+        self.employee = employee
+        self.writes = WriteQueue(employee)
+        self.connections = set()  # writers of open client connections
+
+    async def handle(self, method, target, body):
+        """Return (status, JSON-serialisable result) for one request"""
+        url = urlsplit(target)
+        parts = [part for part in url.path.split("/") if part]
+        if parts == ["metrics"] and method == "GET":
+            return HTTPStatus.OK, metrics.to_prometheus()
+        if parts == ["changes"] and method == "GET":
+            return HTTPStatus.OK, await self._read(self.changes, parse_qs(url.query))
+        if not parts or parts[0] != "employees" or len(parts) > 2:
+            raise HttpError(HTTPStatus.NOT_FOUND, f"No such resource {url.path}")
+
+        if len(parts) == 1:
+            if method == "GET":
+                return HTTPStatus.OK, await self._read(self.list, parse_qs(url.query))
+            if method == "POST":
+                return HTTPStatus.CREATED, await self.writes.submit("create", self._json(body))
+            raise HttpError(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} is not allowed on /employees")
+
+        try:
+            # e1, E1 and E001 are the same employee, as on the command line
+            emp_id = EMP_IDS.normalize(parts[1])
+        except ValueError:
+            raise HttpError(HTTPStatus.NOT_FOUND, f"No employee found with emp_id {parts[1]}")
+        if method == "GET":
+            emp = await self._read(self.employee.find_by_emp_id, emp_id)
+            if emp is None:
+                raise HttpError(HTTPStatus.NOT_FOUND, f"No employee found with emp_id {emp_id}")
+            return HTTPStatus.OK, emp.to_dict()
+        if method in ("PATCH", "PUT"):
+            changes = self._json(body)
+            return HTTPStatus.OK, await self.writes.submit("update", {"emp_id": emp_id, "changes": changes})
+        if method == "DELETE":
+            return HTTPStatus.OK, await self.writes.submit("delete", {"emp_id": emp_id})
+        raise HttpError(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} is not allowed on /employees/{emp_id}")
+
+    @staticmethod
+    async def _read(function, *args):
+        """function(*args) in the thread pool: reads can scan or page in a large file"""
+        return await asyncio.get_running_loop().run_in_executor(None, function, *args)
+
+    @staticmethod
+    def _json(body):
+        try:
+            data = json.loads(body or b"{}")
+        except ValueError as e:
+            raise HttpError(HTTPStatus.BAD_REQUEST, f"invalid JSON: {e}")
+        if not isinstance(data, dict):
+            raise HttpError(HTTPStatus.BAD_REQUEST, "the body must be a JSON object")
+        return data
+
+    def changes(self, query):
+        since = _int_param(query, "since", 0, 0, 2**63 - 1)
+        limit = _int_param(query, "limit", MAX_PER_PAGE, 1, MAX_PER_PAGE)
+        items = list(self.employee.changes_since(since, limit))
+        return {"items": items, "since": items[-1]["seq"] if items else since}
+
+    def list(self, query):
+        sort_by = query.get("sort_by", [None])[0]
+        if sort_by not in (None, "emp_id", "name", "joining_date", "salary"):
+            raise HttpError(HTTPStatus.BAD_REQUEST, f"Cannot sort by {sort_by!r}")
+        search = query.get("search", [None])[0]
+        descending = query.get("descending", ["false"])[0].lower() in ("1", "true", "yes")
+        page = _int_param(query, "page", 1, 1, 10**9)
+        per_page = _int_param(query, "per_page", DEFAULT_PER_PAGE, 1, MAX_PER_PAGE)
+
+        # One row past the page tells whether there is a next page
+        start = (page - 1) * per_page
+        rows = list(islice(self.employee.query(search, sort_by, descending), start, start + per_page + 1))
+        return {
+            "items": [emp.to_dict() for emp in rows[:per_page]],
+            "page": page,
+            "per_page": per_page,
+            "next_page": page + 1 if len(rows) > per_page else None,
+        }
+
+
+#------------------ HTTP ------------------
+
+async def _read_request(reader):
+    """(method, target, keep_alive, body), or None when the client is done"""
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, target, version = line.decode("latin-1").split()
+    except ValueError:
+        raise HttpError(HTTPStatus.BAD_REQUEST, "malformed request line")
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    length = int(headers.get("content-length") or 0)
+    if length > MAX_BODY:
+        raise HttpError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "request body is too large")
+    body = await reader.readexactly(length) if length else b""
+    keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+    return method.upper(), target, keep_alive, body
+
+
+def _response(status, payload, keep_alive):
+    if isinstance(payload, str):
+        body, content_type = payload.encode("utf-8"), "text/plain; version=0.0.4"
+    else:
+        body, content_type = json.dumps(payload).encode("utf-8"), "application/json"
+    head = (f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode("latin-1") + body
+
+
+async def _serve_client(api, reader, writer):
+    api.connections.add(writer)
+    try:
+        while True:
+            keep_alive = False
+            try:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, target, keep_alive, body = request
+                status, payload = await api.handle(method, target, body)
+            except HttpError as e:
+                status, payload = e.status, {"error": str(e)}
+            except ConflictError as e:
+                status, payload = HTTPStatus.CONFLICT, {"error": str(e)}
+            except (LookupError, ValueError) as e:
+                status, payload = HTTPStatus.BAD_REQUEST, {"error": str(e)}
+            except Exception as e:
+                status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)}
+            writer.write(_response(status, payload, keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        api.connections.discard(writer)
+        writer.close()
+
+
+async def run_server(employee, host="127.0.0.1", port=8080, ready=None):
+    """Serve until SIGINT or SIGTERM, then finish the queued writes"""
+    api = EmployeeApi(employee)
+    api.writes.start()
+    server = await asyncio.start_server(lambda r, w: _serve_client(api, r, w), host, port)
+
+    stopped = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, stopped.set)
+        except (NotImplementedError, RuntimeError):  # Windows, or not the main thread
+            pass
+
+    if ready:
+        ready(server)
+    try:
+        await stopped.wait()
+    finally:
+        server.close()
+        # Idle keep-alive connections would otherwise hold wait_closed() open
+        for writer in list(api.connections):
+            writer.close()
+        await server.wait_closed()
+        await api.writes.stop()
+
+
+def serve(employee, host="127.0.0.1", port=8080):
+    """Serve until interrupted; the caller loads and closes the data"""
+    def ready(server):
+        address = server.sockets[0].getsockname()
+        print(f"Serving employees on http://{address[0]}:{address[1]}/employees (Ctrl+C to stop)", flush=True)
+
+    try:
+        asyncio.run(run_server(employee, host, port, ready))
+    except KeyboardInterrupt:
+        pass
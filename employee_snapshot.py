@@ -0,0 +1,166 @@
+"""Versioned binary snapshot of an EmployeeColumns table.
+
+Layout (little-endian, every column starts on an 8-byte boundary):
+
+    header    magic "EMPSNAP\\0", version (u16), id width (u16),
+              row count (u64), heap size (u64), id prefix (16 bytes, utf-8),
+              next id (u64, the id high-water mark; version 2 only)
+    ids       int64[rows]    numeric part of emp_id
+    salaries  float64[rows]
+    offsets   int64[rows+1]  start of each name in the heap
+    joining   int32[rows]    day ordinals, padded to 8 bytes
+    heap      utf-8 names separated by NUL bytes
+
+Loading is a handful of bulk array.frombytes calls and one split of the
+name heap; SnapshotView memory-maps the file instead and decodes rows on
+demand. Version 1 files, written before the high-water mark was kept,
+are still read: their next id is one past the highest stored id.
+"""
+import mmap
+import struct
+from array import array
+
+from employee_columns import EmployeeColumns
+from employee_journal import atomic_write
+from employee_metrics import instrument, metrics
+
+MAGIC = b"EMPSNAP\0"
+VERSION = 2
+HEADER = struct.Struct("<8sHHQQ16s4xQ")
+HEADER_V1 = struct.Struct("<8sHHQQ16s4x")
+
+
+class SnapshotError(ValueError):
+    pass
+
+
+def _pad(size):
+    return -size % 8
+
+
+def _layout(rows, heap_size, header_size=HEADER.size):
+    """Byte offset of every section for a file with this many rows"""
+    ids = header_size
+    salaries = ids + 8 * rows
+    offsets = salaries + 8 * rows
+    joining = offsets + 8 * (rows + 1)
+    heap = joining + 4 * rows + _pad(4 * rows)
+    return ids, salaries, offsets, joining, heap, heap + heap_size
+
+
+def _read_header(buffer):
+    """(prefix, width, rows, next id or None for version 1, layout)"""
+    if len(buffer) < HEADER_V1.size:
+        raise SnapshotError("File is too short to be an employee snapshot")
+    magic, version, width, rows, heap_size, prefix = HEADER_V1.unpack_from(buffer)
+    if magic != MAGIC:
+        raise SnapshotError("Not an employee snapshot")
+    if version == 1:
+        header, next_id = HEADER_V1, None
+    elif version == VERSION:
+        if len(buffer) < HEADER.size:
+            raise SnapshotError("Snapshot is truncated")
+        header, next_id = HEADER, HEADER.unpack_from(buffer)[-1]
+    else:
+        raise SnapshotError(f"Unsupported snapshot version {version}")
+    layout = _layout(rows, heap_size, header.size)
+    if len(buffer) < layout[-1]:
+        raise SnapshotError("Snapshot is truncated")
+    return prefix.rstrip(b"\0").decode("utf-8"), width, rows, next_id, layout
+
+
+#------------------ Write ------------------
+
+@instrument("write_snapshot")
+def write_snapshot(path, table):
+    """Write an EmployeeColumns table (and its next_id) to path atomically"""
+    if any("\0" in name for name in table.names):
+        raise SnapshotError("Employee names cannot contain NUL characters")
+
+    prefix = table.prefix.encode("utf-8")
+    if len(prefix) > 16:
+        raise SnapshotError("emp_id prefixes longer than 16 bytes are not supported")
+
+    encoded = [name.encode("utf-8") for name in table.names]
+    offsets = array("q", [0])
+    for name in encoded:
+        offsets.append(offsets[-1] + len(name) + 1)
+    heap = b"\0".join(encoded) + (b"\0" if encoded else b"")
+
+    rows = len(table)
+    joining = array("i", table.joining)
+    if joining.itemsize != 4 or offsets.itemsize != 8:
+        raise SnapshotError("This platform's array sizes do not match the snapshot format")
+
+    with atomic_write(path, mode="wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, table.width, rows, len(heap), prefix, table.next_id))
+        file.write(array("q", table.ids).tobytes())
+        file.write(array("d", table.salaries).tobytes())
+        file.write(offsets.tobytes())
+        file.write(joining.tobytes())
+        file.write(b"\0" * _pad(4 * rows))
+        file.write(heap)
+    metrics.add_rows(rows)
+
+
+#------------------ Read ------------------
+
+@instrument("read_snapshot", rows=len)
+def read_snapshot(path):
+    """Load a whole snapshot into an EmployeeColumns table"""
+    with open(path, mode="rb") as file:
+        data = file.read()
+    prefix, width, rows, next_id, (ids, salaries, offsets, joining, heap, end) = _read_header(data)
+
+    columns = array("q"), array("d"), array("i")
+    columns[0].frombytes(data[ids:salaries])
+    columns[1].frombytes(data[salaries:offsets])
+    columns[2].frombytes(data[joining:joining + 4 * rows])
+    names = data[heap:end].decode("utf-8").split("\0")[:rows]
+    table = EmployeeColumns.from_columns(columns[0], names, columns[2], columns[1], prefix, width)
+    if next_id is not None:
+        table.next_id = max(table.next_id, next_id)
+    return table
+
+
+class SnapshotView:
+    """Read-only, memory-mapped access to a snapshot without loading it"""
+
+    def __init__(self, path):
+        self._file = open(path, mode="rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.prefix, self.width, self.rows, next_id, layout = _read_header(self._map)
+        ids, salaries, offsets, joining, self._heap, _ = layout
+        self._buffer = memoryview(self._map)
+        self.ids = self._buffer[ids:salaries].cast("q")
+        self.salaries = self._buffer[salaries:offsets].cast("d")
+        self._offsets = self._buffer[offsets:joining].cast("q")
+        self.joining = self._buffer[joining:joining + 4 * self.rows].cast("i")
+        if next_id is None:
+            next_id = max(self.ids, default=0) + 1
+        self.next_id = next_id
+
+    def __len__(self):
+        return self.rows
+
+    def name(self, row):
+        start = self._heap + self._offsets[row]
+        end = self._heap + self._offsets[row + 1] - 1
+        return self._map[start:end].decode("utf-8")
+
+    def row(self, row):
+        """(emp_id, name, joining ordinal, salary) of one row"""
+        return (f"{self.prefix}{self.ids[row]:0{self.width}d}", self.name(row),
+                self.joining[row], self.salaries[row])
+
+    def close(self):
+        for view in (self.ids, self.salaries, self._offsets, self.joining, self._buffer):
+            view.release()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,252 @@
+import operator
+import threading
+from bisect import bisect_left, bisect_right, insort
+
+#------------------ Indexes ------------------
+
+# Every index kept by the store has the same two hooks:
+#   add(emp_id, record)      called after a record enters the store
+#   discard(emp_id, record)  called before a record leaves or changes
+
+
+class NameIndex:
+    """Case-folded name -> {emp_id: record}, duplicate names allowed"""
+
+    def __init__(self, getter):
+        self.getter = getter
+        self._names = {}
+
+    def add(self, emp_id, record):
+        key = self.getter(record, "name").casefold()
+        self._names.setdefault(key, {})[emp_id] = record
+
+    def discard(self, emp_id, record):
+        key = self.getter(record, "name").casefold()
+        bucket = self._names.get(key)
+        if bucket is None:
+            return
+        bucket.pop(emp_id, None)
+        if not bucket:
+            del self._names[key]
+
+    def find(self, name):
+        return list(self._names.get(name.casefold(), {}).values())
+
+
+class _Above:
+    """Sorts after every emp_id: (value, ABOVE) comes after all entries with value"""
+
+    def __lt__(self, other):
+        return False
+
+    def __gt__(self, other):
+        return True
+
+
+ABOVE = _Above()
+
+
+class SortedIndex:
+    """(value, emp_id) pairs kept sorted with bisect, updated one record at a time"""
+
+    def __init__(self, field, getter, key=None):
+        self.field = field
+        self.getter = getter
+        self.key = key  # optional transform of the field value before comparing
+        self._entries = []
+        self._unsorted = False  # bulk-loaded entries not sorted yet
+        self._sort_lock = threading.Lock()  # readers may trigger the sort together
+
+    def _entry(self, emp_id, record):
+        value = self.getter(record, self.field)
+        return (self.key(value) if self.key else value, emp_id)
+
+    def _sort(self):
+        if self._unsorted:
+            with self._sort_lock:
+                if self._unsorted:
+                    self._entries = sorted(self._entries)
+                    self._unsorted = False
+
+    def add(self, emp_id, record):
+        self._sort()
+        insort(self._entries, self._entry(emp_id, record))
+
+    def add_many(self, items):
+        """Bulk load: one sort, done the first time the index is used"""
+        self._entries.extend(self._entry(emp_id, record) for emp_id, record in items)
+        self._unsorted = True
+
+    def discard(self, emp_id, record):
+        self._sort()
+        entry = self._entry(emp_id, record)
+        i = bisect_left(self._entries, entry)
+        if i < len(self._entries) and self._entries[i] == entry:
+            del self._entries[i]
+
+    def emp_ids(self, reverse=False):
+        """emp_ids in field order, without sorting anything"""
+        self._sort()
+        entries = reversed(self._entries) if reverse else self._entries
+        return (emp_id for _, emp_id in entries)
+
+    def _span(self, low, high):
+        """Slice bounds of the entries with low <= value <= high (None = open)"""
+        self._sort()
+        entries = self._entries
+        start = 0 if low is None else bisect_left(entries, (self.key(low) if self.key else low,))
+        stop = len(entries) if high is None else bisect_right(entries, (self.key(high) if self.key else high, ABOVE))
+        return start, max(start, stop)
+
+    def count(self, low=None, high=None):
+        """How many records have low <= value <= high, in O(log n)"""
+        start, stop = self._span(low, high)
+        return stop - start
+
+    def scan(self, low=None, high=None, after=None, limit=None, reverse=False):
+        """Up to limit (value, emp_id) entries in [low, high], ascending
+        unless reverse.
+
+        after is the last entry of the previous call: scanning resumes
+        behind it even if the index changed in between.
+        """
+        start, stop = self._span(low, high)
+        if reverse:
+            if after is not None:
+                stop = min(stop, bisect_left(self._entries, after))
+            if limit is not None:
+                start = max(start, stop - limit)
+            return self._entries[start:stop][::-1]
+        if after is not None:
+            start = max(start, bisect_right(self._entries, after))
+        if limit is not None:
+            stop = min(stop, start + limit)
+        return self._entries[start:stop]
+
+
+#------------------ Employee Store ------------------
+
+class EmployeeStore:
+    """Employees keyed by emp_id with secondary indexes kept in sync.
+
+    getter/setter say how to read and write a field of a record, so the
+    same store works for dict records (operator.getitem/setitem) and for
+    objects (getattr/setattr). Each field in sorted_fields gets a
+    SortedIndex so listings in that order need no sort.
+    """
+
+    def __init__(self, getter=getattr, setter=setattr, sorted_fields=()):
+        self.getter = getter
+        self.setter = setter
+        self._by_id = {}
+        self.names = NameIndex(getter)
+        self._indexes = [self.names]
+        self._sorted = {}
+        self.generation = 0  # goes up on every change, so caches can tell stale results
+        for field in sorted_fields:
+            self.add_sorted_index(field)
+
+    @classmethod
+    def for_dicts(cls):
+        return cls(operator.getitem, operator.setitem)
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __iter__(self):
+        return iter(list(self._by_id.values()))
+
+    def __contains__(self, emp_id):
+        return emp_id in self._by_id
+
+    def add_index(self, index):
+        """Register another index and fill it with the current records"""
+        for emp_id, record in self._by_id.items():
+            index.add(emp_id, record)
+        self._indexes.append(index)
+        return index
+
+    def add_sorted_index(self, field, key=None):
+        self._sorted[field] = self.add_index(SortedIndex(field, self.getter, key))
+        return self._sorted[field]
+
+    def sorted_index(self, field):
+        """The SortedIndex kept on field, or None"""
+        return self._sorted.get(field)
+
+    def sorted_by(self, field, reverse=False):
+        """Yield records ordered by field, ascending unless reverse"""
+        index = self._sorted.get(field)
+        if index is None:
+            yield from sorted(self, key=lambda record: self.getter(record, field), reverse=reverse)
+            return
+        for emp_id in index.emp_ids(reverse):
+            yield self._by_id[emp_id]
+
+    def add(self, record):
+        emp_id = self.getter(record, "emp_id")
+        if emp_id in self._by_id:
+            raise KeyError(f"Duplicate emp_id {emp_id}")
+        self._by_id[emp_id] = record
+        self.generation += 1
+        for index in self._indexes:
+            index.add(emp_id, record)
+        return record
+
+    def add_many(self, records):
+        """Add a batch of records, letting indexes that can bulk-load do so"""
+        items = [(self.getter(record, "emp_id"), record) for record in records]
+        for emp_id, _ in items:
+            if emp_id in self._by_id:
+                raise KeyError(f"Duplicate emp_id {emp_id}")
+        if len({emp_id for emp_id, _ in items}) != len(items):
+            raise KeyError("Duplicate emp_id in batch")
+
+        self._by_id.update(items)
+        self.generation += 1
+        for index in self._indexes:
+            if hasattr(index, "add_many"):
+                index.add_many(items)
+            else:
+                for emp_id, record in items:
+                    index.add(emp_id, record)
+        return [record for _, record in items]
+
+    def find(self, emp_id):
+        return self._by_id.get(emp_id)
+
+    def find_by_name(self, name):
+        return self.names.find(name)
+
+    def remove(self, emp_id):
+        record = self._by_id.pop(emp_id, None)
+        if record is None:
+            return None
+        self.generation += 1
+        for index in self._indexes:
+            index.discard(emp_id, record)
+        return record
+
+    def update(self, emp_id, changes):
+        """Apply a dict of field changes and re-index the record"""
+        record = self._by_id.get(emp_id)
+        if record is None:
+            return None
+
+        self.generation += 1
+        for index in self._indexes:
+            index.discard(emp_id, record)
+        for key, value in changes.items():
+            self.setter(record, key, value)
+
+        new_id = self.getter(record, "emp_id")
+        if new_id != emp_id:
+            del self._by_id[emp_id]
+            self._by_id[new_id] = record
+        for index in self._indexes:
+            index.add(new_id, record)
+        return record
+
+    def clear(self):
+        for record in list(self._by_id.values()):
+            self.remove(self.getter(record, "emp_id"))
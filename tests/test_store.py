@@ -0,0 +1,57 @@
+"""Sorted indexes must stay exact through removals, whatever the values.
+
+    python -m unittest discover tests
+"""
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from employee_ingest import parse_bytes
+from employee_offsets import parse_row
+from employee_store import EmployeeStore
+
+EXTREMES = (0.0, -0.0, 5e-324, 1e308, 1.7976931348623157e308, float("inf"), float("-inf"), 2.0**53 + 1)
+
+
+class SortedIndexTest(unittest.TestCase):
+    def test_removing_extreme_values_empties_the_index(self):
+        store = EmployeeStore(sorted_fields=("salary",))
+        for number in range(200):
+            salary = EXTREMES[number % len(EXTREMES)]
+            store.add(SimpleNamespace(emp_id=f"E{number:03d}", name=f"N{number}", salary=salary))
+        index = store.sorted_index("salary")
+        salaries = [emp.salary for emp in store.sorted_by("salary")]
+        self.assertEqual(salaries, sorted(salaries))
+
+        for number in range(0, 200, 2):
+            store.remove(f"E{number:03d}")
+        self.assertEqual(index.count(), 100)
+        for number in range(1, 200, 2):
+            store.remove(f"E{number:03d}")
+        self.assertEqual(index.count(), 0)
+        self.assertEqual(list(store.sorted_by("salary")), [])
+
+    def test_bulk_loaded_extremes_are_removed(self):
+        store = EmployeeStore(sorted_fields=("salary",))
+        store.add_many(SimpleNamespace(emp_id=f"E{number:03d}", name="N", salary=value)
+                       for number, value in enumerate(EXTREMES))
+        for number in range(len(EXTREMES)):
+            store.remove(f"E{number:03d}")
+        self.assertEqual(store.sorted_index("salary").count(), 0)
+
+
+class NonFiniteSalaryTest(unittest.TestCase):
+    def test_csv_rows_with_nan_or_inf_salaries_are_rejected(self):
+        for salary in ("nan", "inf", "-Infinity"):
+            with self.assertRaises(ValueError):
+                parse_row(f"E001,Ali,01/02/2020,{salary}\n")
+            ids, *_, errors, _ = parse_bytes(f"E001,Ali,01/02/2020,{salary}\nE002,Ola,01/02/2020,10\n".encode())
+            self.assertEqual(list(ids), [2])
+            self.assertEqual(len(errors), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()